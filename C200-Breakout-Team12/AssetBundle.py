@@ -0,0 +1,141 @@
+# a pre-built copy of every image the game loads, so it can start without decoding any PNGs
+# Loading the assets means decoding every PNG, converting it to the display's pixel format, and
+# tinting the brick fragments (see Assets). The first time the game starts (or after any asset
+# changes), the images are recorded as they are loaded, and saved to BUNDLE_PATH just as they are
+# in memory, with an index. After that, the bundle is mapped into memory and each image is a
+# Surface made straight from its pixels in the file (pages are only read when they're used).
+# The bundle is remade when the hash of the asset files, Assets.py (which makes the tinted
+# fragments) or this file changes, or when the display's pixel format isn't the one it was made for.
+# To build it without starting the game:
+#   python AssetBundle.py
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional
+
+from GameConstants import *
+
+BUNDLE_PATH: str = "assets.bundle"
+BUNDLE_MAGIC: bytes = b"BRKB"
+BUNDLE_VERSION: int = 1
+HEADER: struct.Struct = struct.Struct("<4sII")  # magic, version, length of the JSON index after it
+ALIGNMENT: int = 64  # each image's pixels start at a multiple of this
+
+bundle: 'AssetBundle' = None  # open bundle that li() takes images from
+recorded: Dict[str, pygame.Surface] = {}  # images loaded while there was no bundle, for saveBundle()
+
+
+def getImageKey(file: str, hasAlpha: bool, flipX: bool, flipY: bool) -> str:
+	# li()'s arguments, as the name of the image in the bundle
+	return "{0}:{1:d}{2:d}{3:d}".format(file, hasAlpha, flipX, flipY)
+
+
+def getImage(key: str) -> Optional[pygame.Surface]:
+	# the image from the open bundle, if there is one
+	return bundle.getImage(key) if bundle is not None else None
+
+
+def record(key: str, image: pygame.Surface) -> None:
+	# called with every image that was loaded or made instead of taken from the bundle
+	recorded[key] = image
+
+
+def getSourceHash() -> str:
+	sha = hashlib.sha1()
+	files = [os.path.join(directory, name) for directory, directories, names in os.walk("assets") for name in names]
+	for file in sorted(files) + ["Assets.py", "AssetBundle.py"]:
+		sha.update(file.replace(os.sep, "/").encode())
+		with open(file, "rb") as f:
+			sha.update(f.read())
+	return sha.hexdigest()
+
+
+def getPixelFormat() -> List:
+	# what convert() and convert_alpha() make on this display
+	import Graphics
+	image = pygame.Surface((1, 1), pygame.SRCALPHA)
+	return [list(image.convert(Graphics.gameSurface).get_masks()),
+			list(image.convert_alpha(Graphics.gameSurface).get_masks())]
+
+
+def openBundle(path: str = BUNDLE_PATH) -> Optional['AssetBundle']:
+	# the bundle, or None if there isn't one or it is out of date
+	try:
+		with open(path, "rb") as f:
+			magic, version, indexLength = HEADER.unpack(f.read(HEADER.size))
+			if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+				return None
+			index = json.loads(f.read(indexLength).decode())
+			if index["source"] != getSourceHash() or index["format"] != getPixelFormat():
+				return None
+			# copy on write, so an image drawn on doesn't change the file
+			return AssetBundle(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY), index["images"], index["format"])
+	except (OSError, ValueError, KeyError, struct.error):
+		return None
+
+
+def saveBundle(path: str = BUNDLE_PATH) -> None:
+	# writes the recorded images (written to a temporary file first, so a bundle is never half written)
+	images = {}
+	offset = 0
+	for key, image in recorded.items():
+		images[key] = [offset, image.get_width(), image.get_height(), image.get_pitch(),
+					   bool(image.get_flags() & pygame.SRCALPHA)]
+		offset += (image.get_pitch() * image.get_height() + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+	index = json.dumps({"source": getSourceHash(), "format": getPixelFormat(), "images": images}).encode()
+	dataOffset = (HEADER.size + len(index) + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+	index += b" " * (dataOffset - HEADER.size - len(index))
+
+	with open(path + ".tmp", "wb") as f:
+		f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index)))
+		f.write(index)
+		for key, image in recorded.items():
+			f.seek(dataOffset + images[key][0])
+			f.write(image.get_view("0").raw)
+	os.replace(path + ".tmp", path)
+	recorded.clear()
+
+
+class AssetBundle:
+
+	def __init__(self, pixels: mmap.mmap, images: Dict[str, List], pixelFormat: List):
+		self.pixels: mmap.mmap = pixels
+		self.images: Dict[str, List] = images  # key -> [offset, width, height, pitch, hasAlpha]
+		self.dataOffset: int = HEADER.size + HEADER.unpack(pixels[:HEADER.size])[2]
+		# whether convert_alpha()'s pixels are stored in memory as pygame's "BGRA" format
+		self.isBGRA: bool = sys.byteorder == "little" and pixelFormat[1] == [0xFF0000, 0xFF00, 0xFF, 0xFF000000]
+
+	def getImage(self, key: str) -> Optional[pygame.Surface]:
+		entry = self.images.get(key)
+		if entry is None:
+			return None
+		offset, width, height, pitch, hasAlpha = entry
+		begin = self.dataOffset + offset
+		pixels = memoryview(self.pixels)[begin:begin + pitch * height]
+		if hasAlpha and self.isBGRA and pitch == width * 4:
+			# the same layout as convert_alpha()'s images, so the Surface can use the bundle's memory
+			return pygame.image.frombuffer(pixels, (width, height), "BGRA")
+		# pygame can't make a Surface without alpha from a buffer, so these are copied into one
+		# (a Surface made with gameSurface's format is what convert() makes)
+		import Graphics
+		image = pygame.Surface((width, height), 0, Graphics.gameSurface)
+		if hasAlpha:
+			image = image.convert_alpha(Graphics.gameSurface)
+		if image.get_pitch() != pitch:
+			return None
+		memoryview(image.get_view("0")).cast("B")[:] = pixels
+		return image
+
+
+if __name__ == "__main__":
+	# load the assets the usual way, recording them, and save them
+	pygame.display.init()
+	pygame.display.set_mode((1, 1), pygame.HIDDEN)
+	# noinspection PyUnresolvedReferences
+	from Assets import Assets, AssetLoaderHelper
+	import AssetBundle  # this file is running as __main__, and Assets recorded the images in the AssetBundle module
+
+	AssetBundle.saveBundle()
+	print("saved " + BUNDLE_PATH)
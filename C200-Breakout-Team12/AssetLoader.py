@@ -0,0 +1,110 @@
+# loads the assets a bit at a time, so LoadingScreen can draw a progress bar while they load
+# Normally li() loads and converts its image when it is called, so importing Assets loads
+# everything at once. While a loader is set as AssetLoader.loader, li() only adds the image to
+# the loader's manifest and returns its ImageTask in place of the image:
+# - the PNGs are decoded by a pool of threads (pygame lets go of the GIL while SDL_image decodes)
+# - convert()/convert_alpha() need the display, so they are done on the main thread, a few at
+#   a time, by step(), which LoadingScreen calls once per update
+# - once every image is converted, the ImageTasks in Assets (and in its Animations' lists of
+#   images) are replaced by their images
+# - then the other tasks (like AssetLoaderHelper's fragment tinting) are run, in the order
+#   they were added, also by step()
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from time import perf_counter
+from typing import Callable, List
+
+import AssetBundle
+from GameConstants import *
+
+loader: 'AssetLoader' = None  # while set, li() adds images to it instead of loading them
+
+
+class ImageTask:
+	__slots__ = ('key', 'path', 'hasAlpha', 'flipX', 'flipY', 'decoded', 'image')
+
+	def __init__(self, key: str, path: str, hasAlpha: bool, flipX: bool, flipY: bool, decoded: Future):
+		self.key: str = key  # name in the AssetBundle
+		self.path: str = path
+		self.hasAlpha: bool = hasAlpha
+		self.flipX: bool = flipX
+		self.flipY: bool = flipY
+		self.decoded: Future = decoded  # the loaded, unconverted image
+		self.image: pygame.Surface = None  # the converted image, once step() gets to it
+
+
+def addTask(task: Callable[[], None]) -> None:
+	# run task after the images are loaded, or now if there is no loader
+	if loader is None:
+		task()
+	else:
+		loader.tasks.append(task)
+
+
+class AssetLoader:
+
+	def __init__(self, numThreads: int = GC_LOADER_THREADS):
+		self.pool: ThreadPoolExecutor = ThreadPoolExecutor(numThreads)
+		self.imageTasks: List[ImageTask] = []
+		self.tasks: List[Callable[[], None]] = []
+		self.numImagesDone: int = 0
+		self.numTasksDone: int = 0
+		self.resolved: bool = False  # the ImageTasks in Assets have been replaced with their images
+
+	def addImage(self, key: str, path: str, hasAlpha: bool, flipX: bool, flipY: bool) -> ImageTask:
+		task = ImageTask(key, path, hasAlpha, flipX, flipY, self.pool.submit(pygame.image.load, path))
+		self.imageTasks.append(task)
+		return task
+
+	def getProgress(self) -> float:
+		# 0 to 1; the other tasks count as much as an image each
+		total = len(self.imageTasks) + len(self.tasks)
+		return (self.numImagesDone + self.numTasksDone) / total if total else 1
+
+	def isDone(self) -> bool:
+		return self.resolved and self.numTasksDone == len(self.tasks)
+
+	def step(self, seconds: float = GC_LOADING_STEP_TIME) -> bool:
+		# do the main thread's part of loading for about this long; returns whether everything is loaded
+		endTime = perf_counter() + seconds
+		while self.numImagesDone < len(self.imageTasks):
+			task = self.imageTasks[self.numImagesDone]
+			timeLeft = endTime - perf_counter()
+			if timeLeft <= 0:
+				return False
+			try:
+				image = task.decoded.result(timeLeft)
+			except TimeoutError:
+				return False
+			from Assets import convertImage
+			task.image = convertImage(image, task.hasAlpha, task.flipX, task.flipY)
+			AssetBundle.record(task.key, task.image)
+			task.decoded = None
+			self.numImagesDone += 1
+
+		if not self.resolved:
+			self.pool.shutdown()
+			self.resolve()
+			self.resolved = True
+
+		while self.numTasksDone < len(self.tasks):
+			if perf_counter() >= endTime:
+				return False
+			self.tasks[self.numTasksDone]()
+			self.numTasksDone += 1
+		return True
+
+	@staticmethod
+	def resolve() -> None:
+		# put the images where their ImageTasks are in Assets
+		from Assets import Assets
+		from game.gameClasses.Animation import Animation
+		for name, value in list(vars(Assets).items()):
+			if isinstance(value, ImageTask):
+				setattr(Assets, name, value.image)
+			elif isinstance(value, Animation):
+				value.images[:] = [image.image if isinstance(image, ImageTask) else image for image in value.images]
+
+	def loadAll(self) -> None:
+		# finish loading without giving up the main thread
+		while not self.step(1):
+			pass
@@ -2,22 +2,40 @@
 
 # images are prepended with I_, sounds with S_, music with M_
 
+from functools import partial
 from os import listdir
 
 import pygame
 from pygame import Surface
 
+import AssetBundle
+import AssetLoader
 import Graphics
 from game.gameClasses.Animation import Animation
 
 
 # shortcut for pygame.image.load; adds assets/ and .png to given path and does convert_alpha()
+# while AssetLoader.loader is set, returns an ImageTask that is replaced by the image once it is loaded
+# if there is an up to date AssetBundle, the image is taken from it instead
 def li(path: str, hasAlpha: bool = True, flipX: bool = False, flipY: bool = False) -> Surface:
+	file = "assets/" + path + ".png"
+	key = AssetBundle.getImageKey(file, hasAlpha, flipX, flipY)
+	image = AssetBundle.getImage(key)
+	if image is not None:
+		return image
+	if AssetLoader.loader is not None:
+		return AssetLoader.loader.addImage(key, file, hasAlpha, flipX, flipY)
+	image = convertImage(pygame.image.load(file), hasAlpha, flipX, flipY)
+	AssetBundle.record(key, image)
+	return image
+
+
+def convertImage(image: Surface, hasAlpha: bool, flipX: bool, flipY: bool) -> Surface:
 	# use convert() instead of convert_alpha() for performance improvements
 	if hasAlpha:
-		image = pygame.image.load("assets/" + path + ".png").convert_alpha(Graphics.surface)
+		image = image.convert_alpha(Graphics.gameSurface)
 	else:
-		image = pygame.image.load("assets/" + path + ".png").convert(Graphics.surface)
+		image = image.convert(Graphics.gameSurface)
 	return pygame.transform.flip(image, flipX, flipY)
 
 
@@ -172,6 +190,22 @@ def getColorFromBrickType(brickType: str):
 	if brickType == 'C':
 		return 255, 0, 255
 
+def makeFragmentAnimation(fragType: int, brickType: str) -> None:
+	name = "A_BRICK_FRAG_" + str(fragType) + brickType
+	oldAnim: Animation = getattr(Assets, "A_BRICK_FRAG_" + str(fragType))
+	newAnim: Animation = Animation([], oldAnim.frameTime, 0, oldAnim.next)
+	color: tuple = getColorFromBrickType(brickType)
+	for a in [255, 204, 153, 102, 51]: # alpha values, so animation fades out
+		key = name + ":" + str(a)
+		image: Surface = AssetBundle.getImage(key)
+		if image is None:
+			innerColor = color + (a,)
+			image = oldAnim.images[0].copy()
+			image.fill(innerColor, None, pygame.BLEND_RGBA_MULT)
+			AssetBundle.record(key, image)
+		newAnim.images.append(image)
+	setattr(Assets, name, newAnim)
+
 class AssetLoaderHelper:
 	# Initializes values in Assets using setattr and loops.
 	# setattr cant be used in assets because it would
@@ -192,14 +226,7 @@ class AssetLoaderHelper:
 	# (1, 2, 3). Save these as A_BRICK_FRAG_1A, where 1 is the frag type (1-3),
 	# and A is the brick code (so A_BRICK_FRAG_32 for frag type 3 and brick
 	# type 2 = red 2 HP brick).
+	# The template images might not be loaded yet, so this is done by a task (see AssetLoader).
 	for fragType in range(1, Assets.NUM_BRICK_FRAG_TYPES + 1):
 		for i in "1234AC":
-			oldAnim: Animation = getattr(Assets, "A_BRICK_FRAG_" + str(fragType))
-			newAnim: Animation = Animation([], oldAnim.frameTime, 0, oldAnim.next)
-			color: tuple = getColorFromBrickType(i)
-			for a in [255, 204, 153, 102, 51]: # alpha values, so animation fades out
-				innerColor = color + (a,)
-				oldImage: Surface = oldAnim.images[0].copy()
-				oldImage.fill(innerColor, None, pygame.BLEND_RGBA_MULT)
-				newAnim.images.append(oldImage)
-			setattr(Assets, "A_BRICK_FRAG_" + str(fragType) + str(i), newAnim)
+			AssetLoader.addTask(partial(makeFragmentAnimation, fragType, i))
@@ -0,0 +1,733 @@
+# Benchmarks for the performance-sensitive parts of the game.
+# Run from this directory (the same one the game is run from, so assets/ can be found):
+#   python Benchmarks.py            runs all benchmarks
+#   python Benchmarks.py headless   runs just the one named benchmark
+# The benchmarks don't open a window; ones that need pygame's display use the dummy
+# video driver, so they also work on machines with no screen.
+import os
+import sys
+import time
+
+
+def followBall(state):
+	# simple bot: keep the paddle under the first ball, and start the game whenever it is paused
+	from game.gameClasses.PaddleAction import PaddleAction
+	from GameConstants import GC_PADDLE_WIDTH
+	return PaddleAction(0, state.balls[0].circle.x - GC_PADDLE_WIDTH / 2, True)
+
+
+def report(name: str, seconds: float, count: int, unit: str = "frames") -> None:
+	print("{0}: {1} {2} in {3:.3f} s ({4:.0f} {2}/s)".format(name, count, unit, seconds, count / seconds))
+
+
+def benchmarkHeadless(frames: int = 20000) -> None:
+	# steps the simulation without pygame.init() or a display
+	# large steps (dt > 1) use swept collision, so they cover more game time per step
+	from game.GameSimulation import GameSimulation
+	from game.LevelTools import makeState
+
+	for dt in (1, 4, 10):
+		state = makeState(1, 0, 3)
+		simulation = GameSimulation(state)
+		played = 0
+		beginTime = time.perf_counter()
+		for i in range(frames // dt):
+			simulation.step(followBall(state), dt)
+			if state.won:
+				played += 1
+				state = makeState(1, 0, 3)
+				simulation = GameSimulation(state)
+		report("headless simulation, dt = {0}".format(dt), time.perf_counter() - beginTime, frames, "game frames")
+		print("  {0} games finished".format(played))
+
+
+def benchmarkLargeLevel(frames: int = 5000, rows: int = 300, columns: int = 400, density: float = 0.2) -> None:
+	# making and playing a level of rows x columns cells, density of them with a brick,
+	# next to level 1; the time per frame should only depend on the bricks near the balls
+	# (the large level is made up here, and stands in for the last level, instead of being read from a file)
+	import random
+	from array import array
+	from game import LevelTools
+	from game.GameSimulation import GameSimulation
+	from GameConstants import GC_NUM_LEVELS
+	largeLevel = GC_NUM_LEVELS
+	generator = random.Random(1)
+	cells = array('L', sorted(generator.sample(range(rows * columns), int(rows * columns * density))))
+	LevelTools.levels[largeLevel] = LevelTools.CompiledLevel(rows, columns, cells,
+															 bytes(generator.randint(1, 4) for cell in cells),
+															 bytes(len(cells)))
+
+	for level in (1, largeLevel):
+		beginTime = time.perf_counter()
+		state = LevelTools.makeState(level, 0, 3)
+		makeTime = time.perf_counter() - beginTime
+		simulation = GameSimulation(state)
+		beginTime = time.perf_counter()
+		for i in range(frames):
+			simulation.step(followBall(state))
+			if state.won:
+				state = LevelTools.makeState(level, 0, 3)
+				simulation = GameSimulation(state)
+		report("level {0}, {1} bricks".format(level, len(state.bricks)), time.perf_counter() - beginTime, frames,
+			   "game frames")
+		print("  made in {0:.1f} ms".format(makeTime * 1000))
+	del LevelTools.levels[largeLevel]  # read the real one next time
+
+
+def benchmarkScrolling(dt: int = 4) -> None:
+	# playing scrolling levels of 100 to 10000 rows (made up here, and standing in for the last level)
+	# from the bottom row to the top: besides the bricks the ball breaks, the lowest row left is
+	# cleared whenever the level has stopped scrolling, so the whole level streams through the world.
+	# The time a frame takes, and the memory and the number of bricks in use, shouldn't depend on
+	# the height; the frame times are given for the first and last tenths of each run to show it.
+	# Memory is measured with tracemalloc, on a second run, as tracing slows everything down.
+	import random
+	import tracemalloc
+	from array import array
+	from game import LevelTools
+	from game.GameSimulation import GameSimulation
+	from game.gameClasses.PaddleAction import PaddleAction
+	from GameConstants import GC_BRICK_COLUMNS, GC_NUM_LEVELS, GC_PADDLE_WIDTH
+	level = GC_NUM_LEVELS
+
+	def playThrough(stepTimes: list = None):
+		# returns the state at the end and the most bricks there were at once; adds the time of
+		# each step to stepTimes, if given
+		state = LevelTools.makeState(level, 0, 1000000)  # lives to spare, so the level is never restarted
+		simulation = GameSimulation(state)
+		scrolling = state.scrollingLevel
+		grid = state.brickGrid
+		mostBricks = 0
+		i = 0
+		while not (scrolling.isOpen() or state.won):
+			beginTime = time.perf_counter()
+			# hit the ball with different parts of the paddle, so it doesn't settle into a loop
+			offset = (i // 10 % 7 - 3) * GC_PADDLE_WIDTH / 8
+			simulation.step(PaddleAction(0, state.balls[0].circle.x - GC_PADDLE_WIDTH / 2 + offset, True), dt)
+			if scrolling.getTargetY() == grid.firstCell.y:
+				for row in range(scrolling.endRow - 1, scrolling.firstRow - 1, -1):
+					bricks = list(grid.getRow(scrolling.getRowTop(row)))
+					if bricks:
+						simulation.scoreBricks(bricks)
+						break
+			if stepTimes is not None:
+				stepTimes.append(time.perf_counter() - beginTime)
+			mostBricks = max(mostBricks, len(state.bricks))
+			i += 1
+		return state, mostBricks
+
+	for rows in (100, 1000, 10000):
+		generator = random.Random(1)
+		cells = array('L', range(0, rows * GC_BRICK_COLUMNS, 4))  # every fourth cell
+		LevelTools.levels[level] = LevelTools.CompiledLevel(rows, GC_BRICK_COLUMNS, cells,
+															bytes(generator.randint(1, 3) for cell in cells),
+															bytes(len(cells)))
+		beginTime = time.perf_counter()
+		LevelTools.makeState(level, 0, 3)
+		makeTime = time.perf_counter() - beginTime
+
+		stepTimes = []
+		state, mostBricks = playThrough(stepTimes)
+		report("scrolling level, {0} rows".format(rows), sum(stepTimes), len(stepTimes) * dt, "game frames")
+		tenth = max(1, len(stepTimes) // 10)
+		firstTimes, lastTimes = sorted(stepTimes[:tenth]), sorted(stepTimes[-tenth:])
+		print("  made in {0:.1f} ms, {1} rows scrolled, at most {2} bricks at once".format(
+			makeTime * 1000, rows - state.scrollingLevel.endRow, mostBricks))
+		print("  step of {0} frames: median {1:.0f} us, 99th percentile {2:.0f} us in the first tenth; "
+			  "median {3:.0f} us, 99th percentile {4:.0f} us in the last".format(
+			dt, firstTimes[len(firstTimes) // 2] * 1e6, firstTimes[len(firstTimes) * 99 // 100] * 1e6,
+			lastTimes[len(lastTimes) // 2] * 1e6, lastTimes[len(lastTimes) * 99 // 100] * 1e6))
+
+		tracemalloc.start()
+		playThrough()
+		current, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		print("  memory: {0:.0f} KB at most during the run (besides the compiled level)".format(peak / 1024))
+	del LevelTools.levels[level]  # read the real one next time
+
+
+def benchmarkFastForward(frames: int = 20000) -> None:
+	# jumps from impact to impact instead of stepping every frame, against step() on the same level
+	# with the same bot (which fastForward() only asks for a new paddle position at each impact)
+	# Only the simulation is timed, not making a new state whenever a game ends.
+	from game.GameSimulation import GameSimulation
+	from game.LevelTools import makeState
+
+	seconds = {}
+	for mode in ("step", "fast forward"):
+		state = makeState(1, 0, 3, 1)
+		simulation = GameSimulation(state)
+		played = 0
+		steps = 0
+		elapsed = 0
+		seconds[mode] = 0
+		while elapsed < frames:
+			action = followBall(state)
+			beginTime = time.perf_counter()
+			if mode == "step":
+				simulation.step(action)
+				elapsed += 1
+			else:
+				elapsed += simulation.fastForward(action, frames - elapsed)
+			seconds[mode] += time.perf_counter() - beginTime
+			steps += 1
+			if state.won or state.numLives == 0:
+				played += 1
+				state = makeState(1, 0, 3, played + 1)
+				simulation = GameSimulation(state)
+		report(mode, seconds[mode], frames, "game frames")
+		print("  {0} steps, {1} games finished".format(steps, played))
+	print("fast forward is {0:.1f} times as fast as step()".format(seconds["step"] / seconds["fast forward"]))
+
+
+def benchmarkParticles(frames: int = 2000, bricksPerFrame: int = 4) -> None:
+	# a cascade of breaking bricks: each frame, bricksPerFrame bricks each throw out the most
+	# fragments they can, and every particle is moved and its sprite found
+	import random
+	import pygame
+	from game.ParticleSystem import ParticleSystem
+	from game.gameClasses.Animation import Animation
+	from GameConstants import GC_GRAVITY_ACCEL, GC_NUM_BRICK_FRAGMENTS
+
+	anim = Animation([pygame.Surface((8, 8))], 7, 0)
+	particles = ParticleSystem()
+	spawned = 0
+	beginTime = time.perf_counter()
+	for frame in range(frames):
+		particles.update(frame)
+		for i in range(bricksPerFrame * GC_NUM_BRICK_FRAGMENTS[1]):
+			particles.spawn(960, 540, random.uniform(-6, 6), random.uniform(-6, 6), 0, GC_GRAVITY_ACCEL, anim,
+							frame, random.randint(0, 359), random.randint(20, 80), random.randint(0, 10))
+			spawned += 1
+		for sprite in particles.getSprites(frame):
+			pass
+	report("particles ({0} spawned, {1} slots)".format(spawned, particles.capacity),
+		   time.perf_counter() - beginTime, frames)
+
+
+def benchmarkRotation(frames: int = 2000, numParticles: int = 100) -> None:
+	# rotating brick fragments, with and without the rotation cache
+	import random
+	import pygame
+	from GameConstants import GC_FRAME_TIME_SECONDS
+	from RotationCache import RotationCache
+
+	images = [pygame.Surface((30, 20), pygame.SRCALPHA) for i in range(15)]
+	particles = [(random.choice(images), random.randint(0, 359), random.randint(20, 80), random.randint(0, 10))
+				 for i in range(numParticles)]
+
+	def angles():
+		for frame in range(frames):
+			t = GC_FRAME_TIME_SECONDS * frame
+			for image, a, da, dda in particles:
+				yield image, a + da * t + dda * t * t
+
+	beginTime = time.perf_counter()
+	for image, angle in angles():
+		pygame.transform.rotate(image, angle)
+	report("rotation, pygame.transform.rotate", time.perf_counter() - beginTime, frames * numParticles, "sprites")
+
+	cache = RotationCache()
+	beginTime = time.perf_counter()
+	cache.prewarm(images)
+	report("rotation cache prewarm", time.perf_counter() - beginTime, len(cache.images), "sprites")
+	beginTime = time.perf_counter()
+	for image, angle in angles():
+		cache.rotate(image, angle)
+	report("rotation, RotationCache", time.perf_counter() - beginTime, frames * numParticles, "sprites")
+	print("  {0} hits, {1} misses, {2} cached ({3} KiB)".format(cache.hits, cache.misses, len(cache.images),
+																  cache.bytes // 1024))
+
+
+def benchmarkRender(frames: int = 2000) -> None:
+	# GameRenderer.render() for a game being played (the game updates aren't timed)
+	import pygame
+	pygame.init()
+	import Graphics
+	Graphics.goWindowed()
+	from Assets import Assets
+	from game.GameController import GameController
+	from game.GameRenderer import GameRenderer
+	from game.LevelTools import makeState
+	from GameConstants import GC_PADDLE_WIDTH
+	import DrawList
+
+	state = makeState(1, 0, 3)
+	state.paused = False
+	controller = GameController(state, False)
+	DrawList.resetStats()
+	renderTime = 0
+	for frame in range(frames):
+		if state.won:
+			state = makeState(1, 0, 3)
+			state.paused = False
+			controller = GameController(state, False)
+		state.paddle.rect.x = state.balls[0].circle.x - GC_PADDLE_WIDTH / 2
+		controller.update(frame)
+		Graphics.hardClear()
+		beginTime = time.perf_counter()
+		GameRenderer.render(state, frame, 0.5, controller.previousPositions)
+		renderTime += time.perf_counter() - beginTime
+	report("render", renderTime, frames)
+	print("  layers per frame: " + DrawList.getStats())
+
+
+def benchmarkFlip(frames: int = 200) -> None:
+	# Graphics.flip() with each scaling policy, for a few window sizes; "uncached" is how flip()
+	# used to work (clear the window, work out the layout and scale into a new surface every frame)
+	import pygame
+	pygame.init()
+	import Graphics
+
+	def uncachedFlip():
+		Graphics.windowSurface.fill((0, 0, 0))
+		size, pos = Graphics.getFitScaling(*Graphics.windowSurface.get_size())
+		Graphics.windowSurface.blit(pygame.transform.scale(Graphics.gameSurface, size), pos)
+		pygame.display.flip()
+
+	for windowSize in ((1920, 1080), (3840, 2160), (960, 540)):
+		Graphics.resizeWindow(windowSize)
+		for policy in ("uncached", Graphics.SCALE_NEAREST, Graphics.SCALE_INTEGER, Graphics.SCALE_SMOOTH,
+					   Graphics.SCALE_NONE):
+			flip = uncachedFlip if policy == "uncached" else Graphics.flip
+			if policy != "uncached":
+				Graphics.setScaling(policy)
+			beginTime = time.perf_counter()
+			for frame in range(frames):
+				flip()
+			report("flip {0}x{1}, {2}".format(*windowSize, policy), time.perf_counter() - beginTime, frames)
+	Graphics.setScaling(Graphics.GC_SCALING)
+
+
+def benchmarkWindow(frames: int = 1000) -> None:
+	# whole game frames (motion blur, GameRenderer.render() and flip()) in windows smaller than the game,
+	# drawn at 1920x1080 and scaled down, and drawn straight at the window's size (GC_DRAW_AT_WINDOW_SIZE)
+	import pygame
+	pygame.init()
+	import Graphics
+	Graphics.goWindowed()
+	from Assets import Assets
+	from game.GameController import GameController
+	from game.GameRenderer import GameRenderer
+	from game.LevelTools import makeState
+	from GameConstants import GC_DRAW_AT_WINDOW_SIZE, GC_PADDLE_WIDTH
+
+	for windowSize in ((960, 540), (1280, 720)):
+		Graphics.resizeWindow(windowSize)
+		for drawAtWindowSize in (False, True):
+			Graphics.GC_DRAW_AT_WINDOW_SIZE = drawAtWindowSize
+			Graphics.resetLayout()
+			Graphics.flip()
+			state = makeState(1, 0, 3)
+			state.paused = False
+			controller = GameController(state, False)
+			drawTime = 0
+			for frame in range(frames):
+				if state.won:
+					state = makeState(1, 0, 3)
+					state.paused = False
+					controller = GameController(state, False)
+				state.paddle.rect.x = state.balls[0].circle.x - GC_PADDLE_WIDTH / 2
+				controller.update(frame)
+				beginTime = time.perf_counter()
+				Graphics.blur()
+				GameRenderer.render(state, frame, 0.5, controller.previousPositions)
+				Graphics.flip()
+				drawTime += time.perf_counter() - beginTime
+			report("window {0}x{1}, {2}".format(*windowSize, "drawn at window size" if drawAtWindowSize else "scaled"),
+				   drawTime, frames)
+	Graphics.GC_DRAW_AT_WINDOW_SIZE = GC_DRAW_AT_WINDOW_SIZE
+	Graphics.resetLayout()
+
+
+def benchmarkBlur(frames: int = 200) -> None:
+	# ways of fading out the last frame for motion blur, at the game's size and the default window's size:
+	# the motion blur quality levels, and alternatives to blitting I_BLUR (a multiplying fill and NumPy)
+	import numpy as np
+	import pygame
+	pygame.init()
+	import Graphics
+	Graphics.goWindowed()
+	from Assets import Assets
+	from GameConstants import GC_MOTION_BLUR
+
+	for frameSize in ((1920, 1080), (960, 540)):
+		frameSurface = pygame.Surface(frameSize, 0, Graphics.gameSurface)
+		blurImage = pygame.transform.scale(Assets.I_BLUR, frameSize)
+		# blending 46/255 black over the frame leaves 209/255 of it
+		fade = 255 - blurImage.get_at((0, 0)).a
+
+		def multiplyFill():
+			frameSurface.fill((fade, fade, fade), None, pygame.BLEND_RGB_MULT)
+
+		def numpyFade():
+			pixels = pygame.surfarray.pixels3d(frameSurface)
+			np.multiply(pixels, fade / 255, out=pixels, casting="unsafe")
+			del pixels
+
+		candidates = [("blit", lambda: frameSurface.blit(blurImage, (0, 0))), ("BLEND_RGB_MULT fill", multiplyFill),
+					  ("NumPy", numpyFade)]
+		for level in (Graphics.BLUR_FULL, Graphics.BLUR_HALF, Graphics.BLUR_OFF):
+			candidates.append(("clear(), " + level, Graphics.clear))
+		Graphics.surface = Graphics.frameSurface = frameSurface
+		for name, fadeFrame in candidates:
+			if name.startswith("clear()"):
+				Graphics.motionBlur = name[len("clear(), "):]
+			frameSurface.fill((255, 255, 255))
+			beginTime = time.perf_counter()
+			for frame in range(frames):
+				fadeFrame()
+			report("blur {0}x{1}, {2}".format(*frameSize, name), time.perf_counter() - beginTime, frames)
+	Graphics.motionBlur = GC_MOTION_BLUR
+	Graphics.surface = Graphics.frameSurface = Graphics.gameSurface
+	Graphics.resetLayout()
+
+
+def benchmarkLoading() -> None:
+	# loading the assets with an AssetLoader, like LoadingScreen does: the longest the main thread
+	# goes without drawing a frame is what the player sees as the game freezing
+	# (this has to be run before any other benchmark loads the assets; it uses the asset bundle
+	# if it is up to date, so delete it to time loading the PNGs)
+	if "Assets" in sys.modules:
+		print("loading: skipped, the assets are already loaded")
+		return
+	import pygame
+	pygame.init()
+	import Graphics
+	Graphics.goWindowed()
+	import AssetBundle
+	import AssetLoader
+	from GameConstants import GC_ASSET_BUNDLE
+
+	beginTime = time.perf_counter()
+	if GC_ASSET_BUNDLE:
+		AssetBundle.bundle = AssetBundle.openBundle()
+	loader = AssetLoader.loader = AssetLoader.AssetLoader()
+	from Assets import Assets, AssetLoaderHelper
+	AssetLoader.loader = None
+	longestStep = time.perf_counter() - beginTime
+	steps = 1
+	done = False
+	while not done:
+		stepTime = time.perf_counter()
+		done = loader.step()
+		longestStep = max(longestStep, time.perf_counter() - stepTime)
+		steps += 1
+	report("loading, " + ("from " + AssetBundle.BUNDLE_PATH if AssetBundle.bundle else "from the PNGs"),
+		   time.perf_counter() - beginTime, steps, "steps")
+	print("  longest step {0:.1f} ms".format(longestStep * 1000))
+
+
+def timeStartup(launchTime: float) -> None:
+	# run in a new process by benchmarkStartup(): starts the game like C200_Breakout_Team12.py, and
+	# prints how long after launchTime (in ms) the first frame and the first main menu frame were shown
+	import pygame
+	displayFlip = pygame.display.flip
+	frameTimes = []
+
+	def flip():
+		displayFlip()
+		frameTimes.append((time.time() - launchTime) * 1000)
+		if type(sys.modules["ScreenManager"].currentScreen).__name__ == "MainMenuScreen":
+			print(frameTimes[0], frameTimes[-1], len(frameTimes))
+			sys.stdout.flush()
+			os._exit(0)
+
+	pygame.display.flip = flip
+	# noinspection PyUnresolvedReferences
+	import C200_Breakout_Team12
+
+
+def benchmarkStartup(runs: int = 5) -> None:
+	# starts the game in a new process, and times how long it takes to show its first frame (the loading
+	# screen) and the main menu, and how long importing each of its modules took (python -X importtime)
+	# the first run may also build the asset bundle (see AssetBundle), so it isn't counted
+	import subprocess
+	results = []
+	importTimes = {}
+	for run in range(runs + 1):
+		launchTime = time.time()
+		process = subprocess.run([sys.executable, "-X", "importtime", "-c",
+								  "import Benchmarks; Benchmarks.timeStartup({0!r})".format(launchTime)],
+								 capture_output=True, text=True)
+		if run == 0:
+			continue
+		results.append([float(value) for value in process.stdout.split()[-3:]])
+		# lines are "import time: self [us] | cumulative | imported package"
+		for line in process.stderr.splitlines():
+			if not line.startswith("import time:") or line.endswith("imported package"):
+				continue
+			self, cumulative, name = line[len("import time:"):].split("|")
+			name = name.strip()
+			if name.split(".")[0] in ("pygame", "numpy") and "." in name:
+				continue
+			importTimes[name] = importTimes.get(name, 0) + int(cumulative) / 1000 / runs
+	results.sort()
+	firstFrame, mainMenu, frames = results[len(results) // 2]
+	print("startup (median of {0} runs): first frame after {1:.0f} ms, main menu after {2:.0f} ms ({3:.0f} frames)"
+		  .format(runs, firstFrame, mainMenu, frames))
+	print("  slowest imports (cumulative, including the modules they import):")
+	for name, ms in sorted(importTimes.items(), key=lambda item: -item[1])[:15]:
+		print("  {0:7.1f} ms {1}".format(ms, name))
+
+
+def benchmarkText(frames: int = 5000) -> None:
+	# drawing a score that changes about once a second, a glyph at a time and with TextRenderer
+	import pygame
+	pygame.init()
+	import Graphics
+	Graphics.goWindowed()
+	from Assets import Assets
+	from GameConstants import GC_FPS, GC_IMGFONT_SIZE
+
+	beginTime = time.perf_counter()
+	for frame in range(frames):
+		x = 0
+		for character in str(100000 + frame // GC_FPS):
+			Graphics.surface.blit(getattr(Assets, "I_TXT_" + character), (x, 0))
+			x += GC_IMGFONT_SIZE
+	report("text, one glyph at a time", time.perf_counter() - beginTime, frames)
+
+	beginTime = time.perf_counter()
+	for frame in range(frames):
+		Graphics.text.draw(Graphics.surface, str(100000 + frame // GC_FPS), (0, 0))
+	report("text, TextRenderer", time.perf_counter() - beginTime, frames)
+	print("  {0} hits, {1} misses".format(Graphics.text.hits, Graphics.text.misses))
+
+
+def benchmarkAllocations(frames: int = 5000) -> None:
+	# objects made by GameController.update() that are still around after it returns; these are
+	# what make the garbage collector run, so frames with nothing to show (no bounces) should make none
+	import gc
+	import pygame
+	pygame.init()
+	import Graphics
+	Graphics.goWindowed()
+	from Assets import Assets
+	from game.GameController import GameController
+	from game.LevelTools import makeState
+	from GameConstants import GC_PADDLE_WIDTH
+
+	def newGame():
+		state = makeState(99, 0, 2)  # the main menu game
+		state.paused = False
+		return state, GameController(state, False)
+
+	state, controller = newGame()
+	quietFrames = quietObjects = eventFrames = eventObjects = 0
+	gc.disable()
+	gc.collect()
+	beginTime = time.perf_counter()
+	for frame in range(frames):
+		if state.won:
+			state, controller = newGame()
+		# move the paddle like the main menu does, so the update makes no PaddleAction
+		state.paddle.rect.x = state.balls[0].circle.x - GC_PADDLE_WIDTH / 2
+		gc.collect(0)
+		controller.update(frame)
+		numObjects = len(gc.get_objects(0))
+		if state.events:
+			eventFrames += 1
+			eventObjects += numObjects
+		else:
+			quietFrames += 1
+			quietObjects += numObjects
+	gc.enable()
+	report("allocations", time.perf_counter() - beginTime, frames)
+	print("  {0} frames without events: {1:.2f} new objects per frame".format(quietFrames,
+																				quietObjects / max(1, quietFrames)))
+	print("  {0} frames with events: {1:.2f} new objects per frame".format(eventFrames,
+																			 eventObjects / max(1, eventFrames)))
+
+
+def benchmarkBatch(numGames: int = 4096, frames: int = 1000) -> None:
+	# steps many games at once with NumPy, restarting finished ones
+	import numpy as np
+	from game.BatchSimulation import BatchSimulation
+	from GameConstants import GC_PADDLE_WIDTH
+
+	batch = BatchSimulation(numGames, 1, seed=0)
+	moveDir = np.zeros(numGames)
+	begin = np.ones(numGames, dtype=bool)
+	beginTime = time.perf_counter()
+	for i in range(frames):
+		# same bot as followBall(): paddle under the first live ball
+		firstBall = batch.ballAlive.argmax(axis=1)
+		targetX = batch.ballX[np.arange(numGames), firstBall] - GC_PADDLE_WIDTH / 2
+		batch.step(moveDir, targetX, begin)
+		batch.reset(batch.won != 0)
+	report("batch simulation ({0} games)".format(numGames), time.perf_counter() - beginTime, numGames * frames)
+
+
+def benchmarkLevels(runs: int = 200) -> None:
+	# making a level's GameState: compiling the level file, making it from the compiled level,
+	# and taking it after preloadState() made it in the background
+	from game import LevelTools
+	from GameConstants import GC_NUM_LEVELS
+	levels = list(range(1, GC_NUM_LEVELS + 1)) + [99]
+
+	beginTime = time.perf_counter()
+	for run in range(runs):
+		LevelTools.levels.clear()
+		for level in levels:
+			LevelTools.getLevel(level)
+	report("levels, compiling", time.perf_counter() - beginTime, runs * len(levels), "levels")
+
+	beginTime = time.perf_counter()
+	for run in range(runs):
+		for level in levels:
+			LevelTools.makeState(level, 0, 3)
+	report("levels, making states", time.perf_counter() - beginTime, runs * len(levels), "states")
+
+	takeTime = 0
+	for run in range(runs):
+		for level in levels:
+			LevelTools.preloadState(level)
+		LevelTools.preloaded[levels[-1]].result()  # wait for them all to be made
+		beginTime = time.perf_counter()
+		for level in levels:
+			LevelTools.makeState(level, 0, 3)
+		takeTime += time.perf_counter() - beginTime
+	report("levels, taking preloaded states", takeTime, runs * len(levels), "states")
+
+
+def benchmarkHighscores(runs: int = 1000000, lookups: int = 100000) -> None:
+	# a bot farm's runs going into a new highscore database (in a temporary directory): adding
+	# them, waiting for the writer thread, checking scores, and reading the top-K tables back
+	import random
+	import tempfile
+	from game.Highscores import Highscores
+	from GameConstants import GC_NUM_LEVELS
+
+	random.seed(0)
+	directory = tempfile.TemporaryDirectory()
+	Highscores.path = os.path.join(directory.name, "highscores.db")
+	scores = [(random.randrange(100000), random.randint(1, GC_NUM_LEVELS)) for i in range(runs)]
+
+	beginTime = time.perf_counter()
+	for score, level in scores:
+		Highscores.add(score, "bot", level, "bot")
+	report("highscores, adding runs", time.perf_counter() - beginTime, runs, "runs")
+	Highscores.flush()
+	report("highscores, adding and writing runs", time.perf_counter() - beginTime, runs, "runs")
+
+	beginTime = time.perf_counter()
+	for score, level in scores[:lookups]:
+		Highscores.isHighScore(score, level, "bot")
+	report("highscores, isHighScore", time.perf_counter() - beginTime, lookups, "lookups")
+
+	beginTime = time.perf_counter()
+	Highscores.tables.clear()
+	for level in range(1, GC_NUM_LEVELS + 1):
+		Highscores.getTable(level, "bot")
+	report("highscores, reading top-K tables", time.perf_counter() - beginTime, GC_NUM_LEVELS, "tables")
+	Highscores.connection.close()
+	directory.cleanup()
+
+
+def benchmarkReplay(frames: int = 20000, seeks: int = 200) -> None:
+	# playing back recorded games without graphics, and seeking in them: the replays saved in
+	# GC_REPLAY_DIRECTORY if there are any, otherwise a game of each level recorded from followBall()
+	import glob
+	import random
+	from game.GameSimulation import GameSimulation
+	from game.LevelTools import makeState
+	from game.Replay import Replay, ReplayPlayer
+	from GameConstants import GC_NUM_LEVELS, GC_REPLAY_DIRECTORY
+
+	replays = [Replay.load(path) for path in sorted(glob.glob(os.path.join(GC_REPLAY_DIRECTORY, "*.replay")))]
+	if not replays:
+		random.seed(0)
+		for level in range(1, GC_NUM_LEVELS + 1):
+			state = makeState(level, 0, 3)
+			replay = Replay.forState(state)
+			simulation = GameSimulation(state)
+			offset = 0
+			for i in range(frames):
+				if i % 120 == 0:
+					offset = random.randint(-100, 100)  # so the bot doesn't repeat the same bounce forever
+				action = followBall(state)
+				action.targetX += offset
+				replay.record(action, state)
+				simulation.step(action)
+				if state.won:
+					break
+			replay.finish(state)
+			replays.append(replay)
+	numFrames = sum(replay.numFrames for replay in replays)
+
+	beginTime = time.perf_counter()
+	players = [ReplayPlayer(replay) for replay in replays]
+	numVerified = sum(player.verify() for player in players)
+	report("replay, playing back ({0} of {1} games verified)".format(numVerified, len(replays)),
+		   time.perf_counter() - beginTime, numFrames)
+
+	random.seed(0)
+	targets = [(player, random.randrange(player.replay.numFrames + 1)) for player in random.choices(players, k=seeks)]
+	beginTime = time.perf_counter()
+	for player, frame in targets:
+		player.seek(frame)
+	report("replay, seeking", time.perf_counter() - beginTime, seeks, "seeks")
+
+
+def benchmarkSnapshot(runs: int = 2000) -> None:
+	# copying a game part way through level 1: as a snapshot, with clone(), and with deepcopy() for comparison
+	import copy
+	import random
+	from game.GameSimulation import GameSimulation
+	from game.LevelTools import makeState
+	from game.Snapshot import restoreSnapshot, takeSnapshot
+
+	random.seed(0)
+	state = makeState(1, 0, 3)
+	simulation = GameSimulation(state)
+	for i in range(600):
+		simulation.step(followBall(state))
+	print("snapshot: {0} bricks, {1} balls, {2} bytes".format(len(state.bricks), len(state.balls),
+															 len(takeSnapshot(state))))
+
+	beginTime = time.perf_counter()
+	for i in range(runs):
+		data = takeSnapshot(state)
+	report("snapshot, taking", time.perf_counter() - beginTime, runs, "snapshots")
+	beginTime = time.perf_counter()
+	for i in range(runs):
+		restoreSnapshot(data)
+	report("snapshot, restoring", time.perf_counter() - beginTime, runs, "snapshots")
+	beginTime = time.perf_counter()
+	for i in range(runs):
+		state.clone()
+	report("snapshot, clone()", time.perf_counter() - beginTime, runs, "copies")
+	beginTime = time.perf_counter()
+	for i in range(runs // 20):
+		copy.deepcopy(state)
+	report("snapshot, copy.deepcopy()", time.perf_counter() - beginTime, runs // 20, "copies")
+
+
+BENCHMARKS = {
+	"startup": benchmarkStartup,
+	"headless": benchmarkHeadless,
+	"fastforward": benchmarkFastForward,
+	"largelevel": benchmarkLargeLevel,
+	"scrolling": benchmarkScrolling,
+	"particles": benchmarkParticles,
+	"rotation": benchmarkRotation,
+	"loading": benchmarkLoading,
+	"flip": benchmarkFlip,
+	"window": benchmarkWindow,
+	"blur": benchmarkBlur,
+	"text": benchmarkText,
+	"allocations": benchmarkAllocations,
+	"levels": benchmarkLevels,
+	"render": benchmarkRender,
+	"batch": benchmarkBatch,
+	"highscores": benchmarkHighscores,
+	"replay": benchmarkReplay,
+	"snapshot": benchmarkSnapshot,
+}
+
+if __name__ == "__main__":
+	os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+	os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+	for benchmarkName in (sys.argv[1:] or BENCHMARKS.keys()):
+		BENCHMARKS[benchmarkName]()
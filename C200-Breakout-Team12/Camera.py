@@ -14,6 +14,8 @@ class Camera:
 		self.radius: float = 0
 		self.offset: Tuple[float] = (0, 0)
 		self.angle: int = -1  # -1 means no shake yet
+		# its own generator, so screenshake doesn't change the random numbers anything else gets
+		self.random: random.Random = random.Random()
 
 	def reset(self):
 		self.radius = 0
@@ -35,13 +37,13 @@ class Camera:
 		# https://gamedev.stackexchange.com/a/47565
 		# generate new angle
 		if self.angle == -1:
-			newAngle = random.randint(0, 360)
+			newAngle = self.random.randint(0, 360)
 		else:
-			newAngle = random.randint(self.angle - GC_SCREENSHAKE_ANGLE_VARIATION,
+			newAngle = self.random.randint(self.angle - GC_SCREENSHAKE_ANGLE_VARIATION,
 									  self.angle + GC_SCREENSHAKE_ANGLE_VARIATION)
 
 		# generate new distance
-		newRadius = random.uniform(self.radius * GC_SCREENSHAKE_MAX_DISTANCE_REDUCTION,
+		newRadius = self.random.uniform(self.radius * GC_SCREENSHAKE_MAX_DISTANCE_REDUCTION,
 								   self.radius * GC_SCREENSHAKE_MIN_DISTANCE_REDUCTION)
 
 		# find x, y
@@ -0,0 +1,83 @@
+# a surface the game draws on in world coordinates, that is really drawn at another resolution
+# Normally the game is drawn at 1920x1080 and the whole frame is scaled to the window in
+# Graphics.flip(). In a window smaller than that (like the default 960x540), that is a
+# full-size composite and a downscale every frame. A Canvas is drawn at the window's
+# resolution instead: positions are scaled when something is drawn, and each image is
+# scaled once, the first time it is drawn, and kept until the image itself is gone (the
+# cache holds weak references, so rotations and strings dropped from their caches and
+# the layers of finished games are let go). Images that are drawn on after they have been
+# drawn on the canvas (the Compositor's layers) have to be passed to changed().
+# Only blit(), blits(), fill() and the size getters are supported, which is all the game uses.
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from GameConstants import *
+
+
+class Canvas:
+
+	def __init__(self, target: pygame.Surface, smooth: bool = False):
+		self.target: pygame.Surface = target
+		self.smooth: bool = smooth  # filter images when scaling them, instead of nearest neighbour
+		self.scaleX: float = target.get_width() / GC_WORLD_WIDTH
+		self.scaleY: float = target.get_height() / GC_WORLD_HEIGHT
+		self.images: WeakKeyDictionary = WeakKeyDictionary()
+		self.hits: int = 0
+		self.misses: int = 0
+
+	def get_width(self) -> int:
+		return GC_WORLD_WIDTH
+
+	def get_height(self) -> int:
+		return GC_WORLD_HEIGHT
+
+	def get_size(self) -> Tuple[int, int]:
+		return GC_WORLD_SIZE
+
+	def getImage(self, image: pygame.Surface) -> pygame.Surface:
+		# image scaled to the canvas' resolution
+		scaled = self.images.get(image)
+		if scaled is not None:
+			self.hits += 1
+			return scaled
+		self.misses += 1
+		scaled = self.images[image] = self.scaleImage(image)
+		return scaled
+
+	def scaleImage(self, image: pygame.Surface) -> pygame.Surface:
+		# rounded up, so images that are next to each other in the world still touch after scaling
+		width, height = image.get_size()
+		size = math.ceil(width * self.scaleX - 1e-6), math.ceil(height * self.scaleY - 1e-6)
+		colorkey = image.get_colorkey()
+		if colorkey is not None:
+			# filtering would blend the colorkey into the edges, so these are always scaled without it
+			scaled = pygame.transform.scale(image, size)
+			scaled.set_colorkey(colorkey, image.get_flags() & pygame.RLEACCEL)
+		elif self.smooth and image.get_bitsize() >= 24:
+			scaled = pygame.transform.smoothscale(image, size)
+		else:
+			scaled = pygame.transform.scale(image, size)
+		return scaled
+
+	def changed(self, image: pygame.Surface) -> None:
+		# image was drawn on, so it has to be scaled again
+		self.images.pop(image, None)
+
+	def blit(self, image: pygame.Surface, pos, area: Optional[pygame.Rect] = None, special_flags: int = 0) -> None:
+		if area is not None:
+			area = pygame.Rect(int(area[0] * self.scaleX), int(area[1] * self.scaleY),
+							   math.ceil(area[2] * self.scaleX), math.ceil(area[3] * self.scaleY))
+		self.target.blit(self.getImage(image), (int(pos[0] * self.scaleX), int(pos[1] * self.scaleY)), area,
+						 special_flags)
+
+	def blits(self, commands, doreturn: bool = True):
+		# (image, position) pairs only
+		scaleX, scaleY = self.scaleX, self.scaleY
+		return self.target.blits([(self.getImage(image), (int(x * scaleX), int(y * scaleY)))
+								  for image, (x, y) in commands], doreturn)
+
+	def fill(self, color, rect: Optional[pygame.Rect] = None) -> None:
+		if rect is not None:
+			rect = pygame.Rect(int(rect[0] * self.scaleX), int(rect[1] * self.scaleY),
+							   math.ceil(rect[2] * self.scaleX), math.ceil(rect[3] * self.scaleY))
+		self.target.fill(color, rect)
@@ -0,0 +1,59 @@
+# a layer of images to draw, collected over a frame and drawn all at once with Surface.blits()
+# Drawing a frame used to be one surface.blit() call per image, each paying for a Python call
+# and its arguments. Instead, each layer (the bricks, the balls, the particles, the buttons...)
+# adds its (image, position) pairs to its DrawList, which draws them with one blits() call,
+# in the order they were added (layers are drawn in the order their draw() is called).
+# Each DrawList also counts the images it drew and the time from begin() to the end of draw()
+# (making the list and drawing it); getStats() sums these up for GC_PRINT_FPS and GC_PROFILE.
+import time
+from typing import List
+
+from GameConstants import *
+
+drawLists: List['DrawList'] = []  # every DrawList, for getStats()
+
+
+class DrawList:
+
+	def __init__(self, name: str):
+		self.name: str = name
+		self.commands: List[Tuple[pygame.Surface, Tuple[float, float]]] = []
+		self.beginTime: float = None
+		# since the last resetStats()
+		self.draws: int = 0
+		self.numCommands: int = 0
+		self.time: float = 0
+		drawLists.append(self)
+
+	def begin(self) -> None:
+		# start timing the layer, if it is made in more than just add() calls
+		self.beginTime = time.perf_counter()
+
+	def add(self, image: pygame.Surface, pos: Tuple[float, float]) -> None:
+		self.commands.append((image, pos))
+
+	def draw(self, surface: pygame.Surface) -> None:
+		if self.beginTime is None:
+			self.beginTime = time.perf_counter()
+		if self.commands:
+			surface.blits(self.commands, False)
+		self.draws += 1
+		self.numCommands += len(self.commands)
+		self.time += time.perf_counter() - self.beginTime
+		self.beginTime = None
+		self.commands.clear()
+
+	def resetStats(self) -> None:
+		self.draws = self.numCommands = 0
+		self.time = 0
+
+
+def getStats() -> str:
+	# images per draw and milliseconds per draw of each layer drawn since the last resetStats()
+	return ", ".join("{0} {1:.0f} images {2:.2f} ms".format(d.name, d.numCommands / d.draws, d.time * 1000 / d.draws)
+					 for d in drawLists if d.draws)
+
+
+def resetStats() -> None:
+	for drawList in drawLists:
+		drawList.resetStats()
@@ -25,9 +25,11 @@ GC_FULLSCREEN: bool =	((not DEVELOPMENT)		or False)			and True
 
 ###   PERFORMANCE ENHANCEMENTS   ##############################################
 #	  VALUE			 =	  AUTOMATIC		T = FORCE ENABLE	F = FORCE DISABLE
-GC_MOTION_BLUR: bool =  ((not LOW_PERF)		or False)			and True
+GC_MOTION_BLUR: str =   "off" if LOW_PERF else "full" # motion blur quality: "full", "half" (moving things only, at half resolution) or "off" (see Graphics)
 GC_BRICK_FRAGS: bool =  ((not LOW_PERF)		or False)			and True
 GC_SCREENSHAKE: bool = True # shouldn't affect performance at all
+GC_SCALING: str = "nearest" # how the game is scaled to the window: "nearest", "integer", "smooth" or "none" (see Graphics)
+GC_DRAW_AT_WINDOW_SIZE: bool = True # draw windows smaller than the game at their own size, instead of scaling each frame down
 
 ###   PERFORMANCE MEASUREMENT   ###############################################
 GC_PRINT_FPS: bool = False
@@ -40,6 +42,17 @@ GC_PROFILE: bool = False
 GC_BRICK_GEN_MODE: str	= "manual"		# "empty", "random", "filled", "manual"
 GC_STOP_MAINMENU_GAME	= False			# don't have game in main menu screen
 GC_STOP_MAINMENU_PADDLE	= False			# don't move paddle in main menu screen
+# Off, a ball is checked against the bricks only where it is at the end of each frame, so a fast ball
+# can pass through a brick's corner between frames. That is left on purpose: it is the original
+# game's collision, which BatchSimulation follows too, and steps of dt != 1 are always swept anyway.
+GC_SWEPT_COLLISION		= False			# find exact times of impact instead of checking overlap once per frame (always for dt != 1)
+GC_PRELOAD_LEVELS		= True			# make the next level's game state in the background (see LevelTools)
+GC_SCROLLING_LEVELS		= True			# levels too tall for the screen scroll down as they're cleared (see ScrollingLevel)
+GC_SCROLL_SPEED: int	= 4				# pixels per frame
+GC_RECORD_REPLAYS		= False			# save each level played to GC_REPLAY_DIRECTORY (see Replay)
+GC_REPLAY_DIRECTORY: str = "replays"
+GC_MAX_REPLAYS: int = 100				# the oldest replays are deleted when there are more than this
+GC_REPLAY_KEYFRAME_INTERVAL: int = 600	# frames between the states a replay can be seeked to
 
 GC_RESET_HIGHSCORES = False				# enable this, start the game and quit, then disable it
 
@@ -49,9 +62,9 @@ GC_RESET_HIGHSCORES = False				# enable this, start the game and quit, then disa
 import math
 import pygame
 from typing import Tuple, List
-from game.Highscores import Highscores
 
 if GC_RESET_HIGHSCORES:
+	from game.Highscores import Highscores
 	Highscores.reset()
 
 ###############################################################################
@@ -64,6 +77,8 @@ if GC_RESET_HIGHSCORES:
 GC_FPS: int = 60
 GC_FRAME_TIME_SECONDS: float = 1 / GC_FPS
 GC_FRAME_TIME_MILLISECONDS: float = GC_FRAME_TIME_SECONDS * 1000
+GC_RENDER_FPS: int = 0  # how often to draw; e.g. 120 or 144, or 0 for the display's refresh rate
+GC_MAX_UPDATES_PER_DRAW: int = 5  # when drawing falls behind, game updates to run to catch up before the next draw
 
 GC_WORLD_SIZE: Tuple[int, int] = (1920, 1080)  # size of game screen in world coordinates
 GC_WORLD_WIDTH: int = GC_WORLD_SIZE[0]  # dimensions of above must be even
@@ -80,6 +95,16 @@ GC_KEY_BEGIN = pygame.K_SPACE  # for various begin functions: begin from main me
 GC_IMGFONT_SIZE = 75
 GC_SMALL_BUTTON_SIZE = 65
 GC_NUM_BRICK_FRAGMENTS: Tuple[int] = (2, 5) # number to be randomly selected for each brick
+###   ROTATION CACHE   ########################################################
+GC_ROTATION_STEPS = 72 # rotated sprites are cached at this many angles (360 / 72 = every 5 degrees)
+GC_ROTATION_CACHE_BYTES = 32 * 1024 * 1024 # least recently used rotations are dropped past this size
+GC_ROTATION_CACHE_PREWARM = True # rotate the brick fragments at every angle while loading
+###   ASSET LOADING   #########################################################
+GC_LOADER_THREADS = 4 # threads that decode the asset PNGs while the loading screen is up
+GC_ASSET_BUNDLE = True # keep the loaded images in assets.bundle, to start faster next time (see AssetBundle)
+GC_LOADING_STEP_TIME = 0.01 # seconds per update the loading screen spends converting images (the rest draws it)
+###   TEXT CACHE   ############################################################
+GC_TEXT_CACHE_SIZE = 64 # number of rendered strings kept; least recently used ones are dropped past this
 ###   SCREENSHAKE   ###########################################################
 GC_SCREENSHAKE_MIN_RADIUS = 2 # once radius is smaller than this, set screenshake to 0
 GC_SCREENSHAKE_ANGLE_VARIATION = 30 # each tick, new angle = previous angle += variation
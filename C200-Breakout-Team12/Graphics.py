@@ -2,7 +2,10 @@
 # Stores pygame surface, manages windowed/fullscreen and display scaling / abstraction
 
 from Camera import Camera
+from Canvas import Canvas
 from GameConstants import *
+from RotationCache import RotationCache
+from TextRenderer import TextRenderer
 
 DEFAULT_WINDOW_RESOLUTION: Tuple[int, int] = (GC_WORLD_WIDTH // 2, GC_WORLD_HEIGHT // 2)
 MODE_WINDOWED: int = 1
@@ -10,22 +13,112 @@ MODE_FULLSCREEN: int = 2
 
 GAME_ASPECT_RATIO: float = GC_WORLD_WIDTH / GC_WORLD_HEIGHT
 
-surface: pygame.Surface = pygame.Surface(GC_WORLD_SIZE)  # surface that the game draws on; in world coordinates
+# scaling policies: how the game surface is scaled to the window in flip()
+SCALE_NEAREST: str = "nearest"  # as large as fits, keeping the aspect ratio, without filtering
+SCALE_SMOOTH: str = "smooth"  # as large as fits, filtered (looks better when scaled down, but is slower)
+SCALE_INTEGER: str = "integer"  # the largest whole multiple of the game's size that fits (2x at 4K), unfiltered
+SCALE_NONE: str = "none"  # not scaled, in the middle of the window (for 1920x1080 fullscreen)
+
+# motion blur quality levels (GC_MOTION_BLUR): how clear() fades out the last frame
+# Blending a constant over the frame with an alpha blit (blur()) costs about 2.5 ms at 1920x1080; a
+# BLEND_RGB_MULT fill or NumPy do the same thing about ten times slower, so they aren't used
+# (see the "blur" benchmark).
+# I_BLUR is how much the last frame is faded in one update (GC_FRAME_TIME_SECONDS). The frame is
+# drawn more or less often than that, so it is faded by as much as it would be in the time since
+# the last frame was drawn (see getFadeAlpha()), and trails last as long at 144 Hz as at 60 Hz.
+BLUR_FULL: str = "full"  # at the frame's resolution
+BLUR_HALF: str = "half"  # only the moving things, at half the frame's resolution (see halfBlur())
+BLUR_OFF: str = "off"  # no motion blur: the frame is cleared to black
+
+gameSurface: pygame.Surface = pygame.Surface(GC_WORLD_SIZE)  # the game at 1920x1080; also the pixel format images use
+surface: pygame.Surface = gameSurface  # surface that the game draws on; in world coordinates (gameSurface or a Canvas)
+frameSurface: pygame.Surface = gameSurface  # the surface the frame is really drawn on (a Canvas' target)
 windowSurface: pygame.Surface = None  # surface that appears on the screen
 currentMode: int = None
 camera: Camera = Camera()
-
-
-def blur() -> None:
+rotationCache: RotationCache = RotationCache()
+text: TextRenderer = TextRenderer()
+scaling: str = GC_SCALING
+motionBlur: str = GC_MOTION_BLUR
+
+# Where the game goes in the window (see getARScaling()) only changes when the window is resized
+# or the scaling policy changes, so it is worked out once, with the surfaces flip() scales into:
+# scaledSurface, which is blitted to the window, or windowArea, the part of the window covered
+# by the game, which the game can be scaled into directly when the camera isn't shaking.
+layoutWindowSize: Tuple[int, int] = None  # window size the layout is for; None when it needs working out
+scaledSize: Tuple[int, int] = None
+scaledPos: Tuple[int, int] = None
+scaledSurface: pygame.Surface = None
+windowArea: pygame.Surface = None
+drawnRect: pygame.Rect = None  # where the game was drawn in the window last frame; None to clear the window
+frameInterval: float = GC_FRAME_TIME_SECONDS  # time since the last frame was drawn, see setFrameInterval()
+fadeSurface: pygame.Surface = None  # black at the fade's alpha, the size of the frame, for blur()
+trail: Canvas = None  # the moving things of the last frames at half resolution, for halfBlur()
+trailFade: pygame.Surface = None  # fadeSurface at half resolution
+# With GC_DRAW_AT_WINDOW_SIZE, a window smaller than the game is drawn on straight at its own size, through a
+# Canvas (see Canvas.py), so flip() only has to copy the frame. A larger window is still drawn at 1920x1080
+# and scaled up, because drawing every image (and the motion blur) at a larger size costs more than that.
+
+
+def setFrameInterval(seconds: float) -> None:
+	# called by the main loop before each frame is drawn
+	global frameInterval
+	frameInterval = seconds
+
+
+def getFadeAlpha() -> int:
 	# Importing Assets in this module causes issues with assets being
 	# loaded before this Graphics module is fully initialized.
 	# However, we know that clear()/blur() will never be called before
 	# assets are loaded, so use getattr and sys.modules to load the
 	# blur image without actually importing it here.
-
 	assetsClass = getattr(sys.modules['Assets'], 'Assets')  # get Assets class from module Assets
 	img: pygame.Surface = getattr(assetsClass, "I_BLUR")  # get I_BLUR from class Assets
-	surface.blit(img, (0, 0))
+	# I_BLUR leaves 1 - alpha of the frame after one update, so (1 - alpha) ^ updates after frameInterval
+	remaining = (1 - img.get_at((0, 0)).a / 255) ** (frameInterval / GC_FRAME_TIME_SECONDS)
+	return round((1 - remaining) * 255)
+
+
+def makeFade(fade: pygame.Surface, size: Tuple[int, int]) -> pygame.Surface:
+	# fade (or a new surface, if it isn't this size) filled with black at the fade's alpha, like
+	# I_BLUR; it is only filled again when the alpha changes, which it doesn't while the frame
+	# rate is steady (per pixel alpha blits faster than a surface's alpha)
+	if fade is None or fade.get_size() != size:
+		fade = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+	alpha = getFadeAlpha()
+	if fade.get_at((0, 0)).a != alpha:
+		fade.fill((0, 0, 0, alpha))
+	return fade
+
+
+def blur() -> None:
+	# onto the frame surface, not a Canvas, which would scale the fade
+	global fadeSurface
+	fadeSurface = makeFade(fadeSurface, frameSurface.get_size())
+	frameSurface.blit(fadeSurface, (0, 0))
+
+
+def halfBlur() -> None:
+	# Only the trail is faded: the things that move (see addToTrail()), drawn over the last frames
+	# at half the frame's resolution. It is then scaled up over the whole frame, which clears it
+	# too; everything else is drawn again every frame anyway, so it doesn't need fading. Fading a
+	# quarter of the pixels and scaling them up takes about 60% of the time blur() does (see the
+	# "blur" benchmark), and trails look much the same, just softer.
+	global trail, trailFade
+	frameWidth, frameHeight = frameSurface.get_size()
+	trailSize = frameWidth // 2, frameHeight // 2
+	if trail is None or trail.target.get_size() != trailSize:
+		trail = Canvas(pygame.Surface(trailSize, 0, frameSurface))
+	trailFade = makeFade(trailFade, trailSize)
+	trail.target.blit(trailFade, (0, 0))
+	pygame.transform.scale(trail.target, (frameWidth, frameHeight), frameSurface)
+
+
+def addToTrail(commands: List[Tuple[pygame.Surface, Tuple[float, float]]]) -> None:
+	# draws (image, position) pairs onto the trail as well, with half resolution motion blur
+	# (call before drawing them onto surface)
+	if trail is not None:
+		trail.blits(commands, False)
 
 
 def hardClear():
@@ -34,24 +127,49 @@ def hardClear():
 
 
 def clear() -> None:
-	# Performs blur() or hardClear() depending on flag in game constants.
-	blur() if GC_MOTION_BLUR else hardClear()
+	# Fades out the last frame (motion blur) or clears it, depending on motionBlur (GC_MOTION_BLUR).
+	global trail
+	if motionBlur == BLUR_HALF:
+		halfBlur()
+		return
+	trail = None
+	if motionBlur == BLUR_FULL:
+		blur()
+	else:
+		hardClear()
+
+
+def changed(image: pygame.Surface) -> None:
+	# call after drawing on an image that might have been drawn on surface before
+	if surface is not gameSurface:
+		surface.changed(image)
 
 
 def resizeWindow(size) -> None:
-	pygame.display.set_mode(size, pygame.RESIZABLE)
+	global windowSurface
+	windowSurface = pygame.display.set_mode(size, pygame.RESIZABLE)
+	resetLayout()
 
 
-def getARScaling() -> List[Tuple]:
+def setScaling(policy: str) -> None:
+	global scaling
+	scaling = policy
+	resetLayout()
+
+
+def resetLayout() -> None:
+	# call when the window surface or scaling changes
+	global layoutWindowSize
+	layoutWindowSize = None
+
+
+def getFitScaling(windowWidth: int, windowHeight: int) -> List[Tuple]:
 	# The window aspect ratio is not always the same as the game's aspect ratio, so
 	# calculate the size at which to draw the game onto the screen (leaving black bars
 	# at the top/bottom, if necessary). Also calculate the offset (so that there are
 	# black bars on both sides, instead of there being one large one at the bottom or
 	# right).
 
-	windowWidth = windowSurface.get_width()
-	windowHeight = windowSurface.get_height()
-
 	windowAR = windowWidth / windowHeight
 	if windowAR > GAME_ASPECT_RATIO:
 		# window wider than game
@@ -71,19 +189,99 @@ def getARScaling() -> List[Tuple]:
 		return [(scaledWidth, scaledHeight), (0, heightDiff // 2)]
 
 
-def flip() -> None:
-	# scale the game surface to match the window surface
-	# then copy it over and display it on the screen
+def getARScaling() -> List[Tuple]:
+	# size and position of the game in the window, for the current scaling policy
+	updateLayout()
+	return [scaledSize, scaledPos]
+
+
+def updateLayout() -> None:
+	global layoutWindowSize, scaledSize, scaledPos, scaledSurface, windowArea, drawnRect, surface, frameSurface
+	windowWidth, windowHeight = windowSurface.get_size()
+	if layoutWindowSize == (windowWidth, windowHeight):
+		return
+	layoutWindowSize = windowWidth, windowHeight
+
+	factor = min(windowWidth // GC_WORLD_WIDTH, windowHeight // GC_WORLD_HEIGHT)
+	if scaling == SCALE_NONE or (scaling == SCALE_INTEGER and factor >= 1):
+		# a window smaller than the game only shows the middle of it with SCALE_NONE, but
+		# SCALE_INTEGER falls back to scaling down to fit
+		factor = 1 if scaling == SCALE_NONE else factor
+		scaledSize = GC_WORLD_WIDTH * factor, GC_WORLD_HEIGHT * factor
+		scaledPos = (windowWidth - scaledSize[0]) // 2, (windowHeight - scaledSize[1]) // 2
+	else:
+		scaledSize, scaledPos = getFitScaling(windowWidth, windowHeight)
+
+	scaledSurface = pygame.Surface(scaledSize, 0, gameSurface) if scaledSize != GC_WORLD_SIZE else None
+	rect = pygame.Rect(scaledPos, scaledSize)
+	windowArea = windowSurface.subsurface(rect) if windowSurface.get_rect().contains(rect) else None
+	drawnRect = None
+
+	if GC_DRAW_AT_WINDOW_SIZE and scaledSize[0] < GC_WORLD_WIDTH:
+		surface = Canvas(pygame.Surface(scaledSize, 0, gameSurface), scaling == SCALE_SMOOTH)
+		frameSurface = surface.target
+	elif surface is not gameSurface:
+		# gameSurface hasn't been drawn on since the window was last this big
+		gameSurface.fill((0, 0, 0))
+		surface = frameSurface = gameSurface
+
+
+def scaleInto(source: pygame.Surface, dest: pygame.Surface) -> None:
+	# scale source (the frame) into dest, which is scaledSize
+	# (into an existing surface, instead of having pygame.transform make a new one every frame)
+	if source.get_size() == scaledSize:
+		dest.blit(source, (0, 0))
+	elif scaling == SCALE_SMOOTH:
+		pygame.transform.smoothscale(source, scaledSize, dest)
+	else:
+		pygame.transform.scale(source, scaledSize, dest)
 
-	windowSurface.fill((0, 0, 0))  # leave black bars on borders in case of aspect ratio mismatch
 
-	arScaling = getARScaling()  # list of two tuples, first is size, 2nd is pos
+def clearOutside(rect: pygame.Rect, newRect: pygame.Rect) -> None:
+	# black out the parts of rect that aren't in newRect
+	inside = rect.clip(newRect)
+	if inside.width == 0 or inside.height == 0:
+		windowSurface.fill((0, 0, 0), rect)
+		return
+	for part in (pygame.Rect(rect.left, rect.top, rect.width, inside.top - rect.top),
+				 pygame.Rect(rect.left, inside.bottom, rect.width, rect.bottom - inside.bottom),
+				 pygame.Rect(rect.left, inside.top, inside.left - rect.left, inside.height),
+				 pygame.Rect(inside.right, inside.top, rect.right - inside.right, inside.height)):
+		if part.width > 0 and part.height > 0:
+			windowSurface.fill((0, 0, 0), part)
 
-	# add screenshake offset (from camera) to arScaling's window offset
-	camera.update()
-	windowOffset = int(arScaling[1][0] + camera.offset[0]), int(arScaling[1][1] + camera.offset[1])
 
-	windowSurface.blit(pygame.transform.scale(surface, arScaling[0]), windowOffset)
+def flip() -> None:
+	# scale the game surface to match the window surface
+	# then copy it over and display it on the screen
+	global drawnRect
+	frame = frameSurface  # updateLayout() may switch to another surface for the next frame
+	updateLayout()
+
+	# add screenshake offset (from camera) to the game's position in the window
+	# (the camera is updated once per game update by ScreenManager, not here once per draw)
+	windowOffset = int(scaledPos[0] + camera.offset[0]), int(scaledPos[1] + camera.offset[1])
+	rect = pygame.Rect(windowOffset, scaledSize)
+
+	# the black bars on the borders (in case of aspect ratio mismatch) stay black from frame to frame,
+	# unless the layout changed or screenshake moved the game over them last frame
+	if rect != drawnRect:
+		if drawnRect is None:
+			windowSurface.fill((0, 0, 0))
+		else:
+			clearOutside(drawnRect, rect)
+		drawnRect = rect
+
+	if windowOffset == scaledPos and windowArea is not None:
+		scaleInto(frame, windowArea)
+	elif frame.get_size() == scaledSize:
+		windowSurface.blit(frame, windowOffset)
+	elif scaledSurface is None:
+		# the first frame after switching from a Canvas back to gameSurface (drawn at the old size)
+		windowSurface.blit(pygame.transform.scale(frame, scaledSize), windowOffset)
+	else:
+		scaleInto(frame, scaledSurface)
+		windowSurface.blit(scaledSurface, windowOffset)
 	pygame.display.flip()
 
 
@@ -91,12 +289,14 @@ def goFullscreen() -> None:
 	global windowSurface, currentMode
 	windowSurface = pygame.display.set_mode(pygame.display.list_modes()[0], pygame.FULLSCREEN)
 	currentMode = MODE_FULLSCREEN
+	resetLayout()
 
 
 def goWindowed() -> None:
 	global windowSurface, currentMode
 	windowSurface = pygame.display.set_mode(DEFAULT_WINDOW_RESOLUTION, pygame.RESIZABLE)
 	currentMode = MODE_WINDOWED
+	resetLayout()
 
 
 def isFullscreen():
@@ -111,11 +311,9 @@ def unproject(pos):
 	x = pos[0]
 	y = pos[1]
 
-	widthDiffHalf, heightDiffHalf = getARScaling()[1]
-	startX = widthDiffHalf
-	endX = windowSurface.get_width() - widthDiffHalf
-	startY = heightDiffHalf
-	endY = windowSurface.get_height() - heightDiffHalf
+	(scaledWidth, scaledHeight), (startX, startY) = getARScaling()
+	endX = startX + scaledWidth
+	endY = startY + scaledHeight
 	# if the mouse is in the black border bars (when window AR doesn't match game AR), return -1 so it is ignored
 	if x < startX or x > endX:
 		returnX = -1
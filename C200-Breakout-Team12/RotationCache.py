@@ -0,0 +1,61 @@
+# cache of rotated images, used to draw rotating particles (brick fragments)
+# pygame.transform.rotate() makes a new Surface every time it is called, and every fragment
+# is rotated every frame. But there are only a few fragment images, so angles are rounded
+# to one of GC_ROTATION_STEPS angles, and each (image, angle) is only rotated once.
+# The least recently used rotations are dropped when the cache gets bigger than
+# GC_ROTATION_CACHE_BYTES.
+from collections import OrderedDict
+from typing import Iterable, Tuple
+
+from GameConstants import *
+
+
+class RotationCache:
+
+	def __init__(self, steps: int = GC_ROTATION_STEPS, maxBytes: int = GC_ROTATION_CACHE_BYTES):
+		self.steps: int = steps
+		self.maxBytes: int = maxBytes
+		self.images: OrderedDict[Tuple[pygame.Surface, int], pygame.Surface] = OrderedDict()
+		self.bytes: int = 0
+		self.hits: int = 0
+		self.misses: int = 0
+
+	def getStep(self, angle: float) -> int:
+		return round(angle * self.steps / 360) % self.steps
+
+	def rotate(self, image: pygame.Surface, angle: float) -> pygame.Surface:
+		# image rotated by angle degrees (counterclockwise, like pygame.transform.rotate), rounded to the nearest step
+		step = self.getStep(angle)
+		if step == 0:
+			return image
+		key = (image, step)
+		rotated = self.images.get(key)
+		if rotated is not None:
+			self.hits += 1
+			self.images.move_to_end(key)
+			return rotated
+		self.misses += 1
+		return self.add(key)
+
+	def add(self, key: Tuple[pygame.Surface, int]) -> pygame.Surface:
+		image, step = key
+		rotated = pygame.transform.rotate(image, step * 360 / self.steps)
+		self.images[key] = rotated
+		self.bytes += self.getSize(rotated)
+		while self.bytes > self.maxBytes and len(self.images) > 1:
+			oldKey, oldImage = self.images.popitem(last=False)
+			self.bytes -= self.getSize(oldImage)
+		return rotated
+
+	@staticmethod
+	def getSize(image: pygame.Surface) -> int:
+		return image.get_width() * image.get_height() * image.get_bytesize()
+
+	def prewarm(self, images: Iterable[pygame.Surface]) -> None:
+		# rotate the images at every step ahead of time, as far as the memory budget allows
+		for image in images:
+			for step in range(1, self.steps):
+				if (image, step) not in self.images:
+					self.add((image, step))
+				if self.bytes >= self.maxBytes:
+					return
@@ -8,10 +8,14 @@
 # same concept applies to some other modules in this project
 
 import sys
+import time
 
 import pygame
 
-from GameConstants import GC_FRAME_TIME_MILLISECONDS, GC_PRINT_FPS
+import DrawList
+import Graphics
+from GameConstants import GC_FPS, GC_FRAME_TIME_SECONDS, GC_MAX_UPDATES_PER_DRAW, GC_PRINT_FPS, GC_PROFILE, \
+	GC_RENDER_FPS
 from screens import Screen
 
 currentScreen: Screen = None
@@ -24,30 +28,69 @@ def setScreen(newScreen: Screen):
 
 # noinspection PyShadowingBuiltins
 def exit():
+	if GC_PROFILE:
+		# cProfile's table has the time spent drawing; this is what was drawn
+		print("layers per frame: " + DrawList.getStats())
 	pygame.quit()
 	sys.exit()
 
 
-lastBeginTime = 0
+def getRenderFPS() -> float:
+	# GC_RENDER_FPS, or the display's refresh rate if that is 0
+	if GC_RENDER_FPS:
+		return GC_RENDER_FPS
+	# noinspection PyUnresolvedReferences
+	refreshRates = pygame.display.get_desktop_refresh_rates() if hasattr(pygame.display,
+																		   "get_desktop_refresh_rates") else []
+	return refreshRates[0] if refreshRates and refreshRates[0] > 0 else GC_FPS
 
 
 def start():  # start the game - called from C200_Breakout_Team12.py
+	# Fixed timestep: the screens are updated (game logic, input, animations) exactly GC_FPS
+	# times per second of real time, no matter how fast they can be drawn. After each round of
+	# updates, the screen is drawn once, and told how far it is between the last update and the
+	# next one, so it can interpolate positions and move smoothly at 120/144 Hz.
+	# If drawing falls behind, up to GC_MAX_UPDATES_PER_DRAW updates are run before the next draw
+	# to catch up, so game time doesn't slow down when a few frames are dropped. Past that,
+	# the extra time is dropped (the game slows down instead of never drawing again).
+	renderFrameTime = 1 / getRenderFPS()
+	lastTime = time.perf_counter()
+	accumulator = 0
+	lastPrintTime = lastTime
+	numDraws = 0
+	numUpdates = 0
 	while True:
-		beginTime = pygame.time.get_ticks()
-		currentScreen.update()
-		endTime = pygame.time.get_ticks()
-
-		timeConsumed = endTime - beginTime
-
-		# time consumed can be longer than 16.7 ms, for example on the loading screen
-		# so don't delay() for a negative value
-		if timeConsumed < GC_FRAME_TIME_MILLISECONDS:
-			pygame.time.delay(int(GC_FRAME_TIME_MILLISECONDS - timeConsumed))
+		beginTime = time.perf_counter()
+		accumulator += beginTime - lastTime
+		Graphics.setFrameInterval(beginTime - lastTime)  # so motion blur fades by the time that has passed
+		lastTime = beginTime
+
+		updates = 0
+		while accumulator >= GC_FRAME_TIME_SECONDS:
+			if updates == GC_MAX_UPDATES_PER_DRAW:
+				# too far behind to catch up, drop the rest
+				accumulator = 0
+				break
+			Graphics.camera.update()
+			currentScreen.update()
+			accumulator -= GC_FRAME_TIME_SECONDS
+			updates += 1
+		currentScreen.draw(accumulator / GC_FRAME_TIME_SECONDS)
+
+		# wait until the next frame should be drawn, unless that time has already passed
+		timeConsumed = time.perf_counter() - beginTime
+		if timeConsumed < renderFrameTime:
+			pygame.time.delay(int((renderFrameTime - timeConsumed) * 1000))
 
 		# debug print
 		if GC_PRINT_FPS:
-			global lastBeginTime
-			fps = 1000 / (beginTime - lastBeginTime)
-			delayTime = int(GC_FRAME_TIME_MILLISECONDS - timeConsumed)
-			print("FPS = {0:.2f} frame time = {1} ms; delaying for {2} ms".format(fps, timeConsumed, delayTime))
-			lastBeginTime = beginTime
+			numDraws += 1
+			numUpdates += updates
+			if beginTime - lastPrintTime >= 1:
+				print("FPS = {0:.2f} updates/s = {1:.2f} frame time = {2:.1f} ms".format(
+					numDraws / (beginTime - lastPrintTime), numUpdates / (beginTime - lastPrintTime),
+					timeConsumed * 1000))
+				print("  layers per frame: " + DrawList.getStats())
+				DrawList.resetStats()
+				lastPrintTime = beginTime
+				numDraws = numUpdates = 0
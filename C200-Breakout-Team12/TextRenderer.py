@@ -0,0 +1,57 @@
+# draws strings with the imgFont glyphs (Assets.I_TXT_0-9 and I_TXT_A-Z)
+# Numbers and names used to be drawn a glyph at a time, every frame, even though they only
+# change once in a while (the time, once a second). Instead, each string is drawn onto one
+# surface, horizontally (left to right) or vertically (top to bottom, like the stats on the
+# walls), and kept, so drawing it again is a single blit. The least recently used strings
+# are dropped once there are more than GC_TEXT_CACHE_SIZE of them.
+from collections import OrderedDict
+from typing import Tuple
+
+from GameConstants import *
+
+HORIZONTAL: str = 'horizontal'
+VERTICAL: str = 'vertical'
+
+
+class TextRenderer:
+
+	def __init__(self, maxSize: int = GC_TEXT_CACHE_SIZE):
+		self.maxSize: int = maxSize
+		self.images: OrderedDict[Tuple[str, str, int], pygame.Surface] = OrderedDict()
+		self.hits: int = 0
+		self.misses: int = 0
+
+	def render(self, string: str, orientation: str = HORIZONTAL, padding: int = 0) -> pygame.Surface:
+		# string drawn with one glyph every GC_IMGFONT_SIZE pixels; it is padded with leading zeroes
+		# to at least padding characters (so levels are drawn as '01' '02' etc. instead of just '1' '2')
+		key = (string, orientation, padding)
+		image = self.images.get(key)
+		if image is not None:
+			self.hits += 1
+			self.images.move_to_end(key)
+			return image
+		self.misses += 1
+		image = self.images[key] = self.renderString(string.rjust(padding, '0'), orientation)
+		if len(self.images) > self.maxSize:
+			self.images.popitem(last=False)
+		return image
+
+	@staticmethod
+	def renderString(string: str, orientation: str) -> pygame.Surface:
+		# same trick as in Graphics' blur(): get the Assets class without importing it
+		assetsClass = getattr(sys.modules['Assets'], 'Assets')
+		length = len(string) * GC_IMGFONT_SIZE
+		size = (length, GC_IMGFONT_SIZE) if orientation == HORIZONTAL else (GC_IMGFONT_SIZE, length)
+		image = pygame.Surface(size, pygame.SRCALPHA)
+		image.fill((0, 0, 0, 0))
+		for i, character in enumerate(string):
+			glyph: pygame.Surface = getattr(assetsClass, "I_TXT_" + character.upper())
+			pos = (i * GC_IMGFONT_SIZE, 0) if orientation == HORIZONTAL else (0, i * GC_IMGFONT_SIZE)
+			# copy the glyph's pixels as they are; blending them onto the transparent surface would
+			# darken their edges, and the glyphs don't overlap
+			image.blit(glyph, pos, special_flags=pygame.BLEND_RGBA_MAX)
+		return image
+
+	def draw(self, surface: pygame.Surface, string: str, pos: Tuple[int, int], orientation: str = HORIZONTAL,
+			 padding: int = 0) -> None:
+		surface.blit(self.render(string, orientation, padding), pos)
@@ -0,0 +1,322 @@
+# Steps many independent games at once, stored as NumPy arrays (struct of arrays)
+# instead of one GameState object graph per game.
+# The rules are the same as in GameSimulation's frame based collision (updateBall,
+# collideBrickBall and collidePaddleBall, used when GC_SWEPT_COLLISION is off),
+# done for every game in one pass. Used for bots, training and
+# evaluation, where stepping GameStates one at a time in Python is too slow.
+# Like GameSimulation, this never touches pygame, Graphics or Assets.
+#
+# Differences from GameSimulation, which only matter when things happen at the same time:
+#  - each game has at most maxBalls balls; extra ball power-ups are ignored when all slots are used
+#  - a ball checks the 3x3 brick cells around it, in the same top-left to bottom-right order
+#    that GameSimulation checks the brick list, but two balls hitting the same brick in the
+#    same frame both bounce off it
+#  - when several balls fall out of the world in the same frame, a life is lost only once
+import random
+from typing import Tuple
+
+import numpy as np
+
+from GameConstants import *
+
+# power up codes in brickPowerUp
+POWERUP_NONE = 0
+POWERUP_EXTRA_BALL = 1
+POWERUP_CLEAR_ROW = 2
+
+# score of a destroyed brick, by max HP (index 0 is the boss brick, which can't be destroyed)
+BRICK_SCORE_BY_MAX_HP = np.array([GC_BRICK_SCORES[3]] + GC_BRICK_SCORES[0:3], dtype=np.int64)
+
+
+def levelGrid(level: int, seed: int = None) -> Tuple[np.ndarray, np.ndarray]:
+	# returns the (GC_BRICK_LAYERS, GC_BRICK_COLUMNS) HP and power up grids of a level
+	# 0 HP is an empty cell, -1 is a boss brick
+	# seed is for the brick generation modes that place bricks randomly, like LevelTools.newState()
+	from game.LevelTools import getFirstCell, makeBricks
+	firstCell = getFirstCell(level)
+	if (firstCell.x, firstCell.y, firstCell.width, firstCell.height) != (GC_WALL_SIZE, GC_BRICK_TOP_HEIGHT,
+																		 GC_BRICK_WIDTH, GC_BRICK_HEIGHT):
+		raise ValueError("level {0} isn't on the usual {1} x {2} brick grid".format(level, GC_BRICK_LAYERS, GC_BRICK_COLUMNS))
+	hp = np.zeros((GC_BRICK_LAYERS, GC_BRICK_COLUMNS), dtype=np.int32)
+	powerUp = np.zeros((GC_BRICK_LAYERS, GC_BRICK_COLUMNS), dtype=np.int8)
+	for brick in makeBricks(level, random.Random(seed)):
+		row = int(brick.rect.y - GC_BRICK_TOP_HEIGHT) // GC_BRICK_HEIGHT
+		column = int(brick.rect.x - GC_WALL_SIZE) // GC_BRICK_WIDTH
+		hp[row, column] = brick.maxHP
+		if brick.powerUp == 'extraBall':
+			powerUp[row, column] = POWERUP_EXTRA_BALL
+		elif brick.powerUp == 'clearRow':
+			powerUp[row, column] = POWERUP_CLEAR_ROW
+	return hp, powerUp
+
+
+class BatchSimulation:
+	def __init__(self, numGames: int, level: int, numLives: int = GC_DEFAULT_LIVES, maxBalls: int = 4,
+				 seed: int = None):
+		self.numGames: int = numGames
+		self.level: int = level
+		self.numLivesAtStart: int = numLives
+		self.maxBalls: int = maxBalls
+		self.random: np.random.Generator = np.random.default_rng(seed)
+
+		self.levelHP, self.levelPowerUp = levelGrid(level, seed)
+
+		n, b = numGames, maxBalls
+		# balls, shape (numGames, maxBalls)
+		self.ballX: np.ndarray = np.zeros((n, b))
+		self.ballY: np.ndarray = np.zeros((n, b))
+		self.ballDx: np.ndarray = np.zeros((n, b))
+		self.ballDy: np.ndarray = np.zeros((n, b))
+		self.ballAlive: np.ndarray = np.zeros((n, b), dtype=bool)
+		self.lastBallX: np.ndarray = np.zeros((n, b))
+		self.lastBallY: np.ndarray = np.zeros((n, b))
+		# paddle left edge, shape (numGames,)
+		self.paddleX: np.ndarray = np.zeros(n)
+		# bricks, shape (numGames, GC_BRICK_LAYERS, GC_BRICK_COLUMNS)
+		self.brickHP: np.ndarray = np.zeros((n, GC_BRICK_LAYERS, GC_BRICK_COLUMNS), dtype=np.int32)
+		self.brickMaxHP: np.ndarray = np.zeros((n, GC_BRICK_LAYERS, GC_BRICK_COLUMNS), dtype=np.int32)
+		self.brickPowerUp: np.ndarray = np.zeros((n, GC_BRICK_LAYERS, GC_BRICK_COLUMNS), dtype=np.int8)
+		# per game values, shape (numGames,)
+		self.numLives: np.ndarray = np.zeros(n, dtype=np.int32)
+		self.time: np.ndarray = np.zeros(n)
+		self.paused: np.ndarray = np.zeros(n, dtype=bool)
+		self.won: np.ndarray = np.zeros(n, dtype=np.int8)  # 1 = won, -1 = lost, same as GameState
+		self.score: np.ndarray = np.zeros(n, dtype=np.int64)
+		self.collidedLastFrame: np.ndarray = np.zeros(n, dtype=bool)
+		self.totalBrickScore: np.ndarray = np.zeros(n, dtype=np.int64)
+		self.totalBricksDestroyedScore: np.ndarray = np.zeros(n, dtype=np.int64)
+
+		self.reset()
+
+	def reset(self, games: np.ndarray = None) -> None:
+		# start the given games (bool mask or indices; all games if None) over from the beginning of the level
+		if games is None:
+			games = np.arange(self.numGames)
+		elif games.dtype == bool:
+			games = np.flatnonzero(games)
+		if len(games) == 0:
+			return
+
+		self.ballAlive[games] = False
+		self.makeBalls(games)
+		self.paddleX[games] = GC_WORLD_WIDTH / 2 - GC_PADDLE_WIDTH // 2
+		self.brickHP[games] = self.levelHP
+		self.brickMaxHP[games] = self.levelHP
+		self.brickPowerUp[games] = self.levelPowerUp
+		self.numLives[games] = self.numLivesAtStart
+		self.time[games] = 0
+		self.paused[games] = True
+		self.won[games] = 0
+		self.score[games] = 0
+		self.collidedLastFrame[games] = False
+		liveBricks = self.levelHP != 0
+		self.totalBrickScore[games] = BRICK_SCORE_BY_MAX_HP[np.maximum(self.levelHP, 0)][liveBricks].sum()
+		self.totalBricksDestroyedScore[games] = 0
+
+	def makeBalls(self, games: np.ndarray) -> None:
+		# same as LevelTools.makeBall(), put into ball slot 0 of each game
+		angle = np.radians(self.random.integers(90 - GC_BALL_INITIAL_ANGLE_VARIATION,
+												90 + GC_BALL_INITIAL_ANGLE_VARIATION, len(games), endpoint=True))
+		self.ballX[games, 0] = GC_WORLD_WIDTH / 2
+		self.ballY[games, 0] = GC_PADDLE_TOP_HEIGHT - 150
+		self.ballDx[games, 0] = np.cos(angle) * GC_BALL_INITIAL_VELOCITY
+		self.ballDy[games, 0] = np.sin(angle) * GC_BALL_INITIAL_VELOCITY
+		self.ballAlive[games, 0] = True
+
+	def step(self, moveDir: np.ndarray, targetX: np.ndarray = None, begin: np.ndarray = None) -> None:
+		# Advance every game that isn't over by one frame.
+		# The arguments are the fields of PaddleAction, one entry per game: moveDir is -1/0/1,
+		# targetX is the paddle left edge to jump to (NaN to not jump), begin unpauses paused games.
+		# Games that are over (won != 0) are left as they are until reset().
+		active = self.won == 0
+		paused = active & self.paused
+		running = active & ~self.paused
+
+		self.collidedLastFrame[active] = False
+		self.movePaddle(active, moveDir, targetX)
+		if begin is not None:
+			self.paused[paused & begin] = False
+
+		self.time[running] += GC_FRAME_TIME_SECONDS
+		self.updateBall(running)
+		self.collideBrickBall(running)
+		self.collidePaddleBall(running)
+		self.updateScore(running)
+
+	def movePaddle(self, active: np.ndarray, moveDir: np.ndarray, targetX: np.ndarray) -> None:
+		# GameSimulation moves the paddle after moving the balls, but nothing in between uses it
+		if targetX is not None:
+			jump = active & ~np.isnan(targetX)
+			self.paddleX[jump] = targetX[jump]
+		self.paddleX[active] += moveDir[active] * GC_PADDLE_SPEED
+		# collidePaddleWall
+		np.clip(self.paddleX, GC_WALL_SIZE, GC_WORLD_WIDTH - GC_WALL_SIZE - GC_PADDLE_WIDTH, out=self.paddleX)
+
+	def updateBall(self, running: np.ndarray) -> None:
+		moving = self.ballAlive & running[:, None]
+		self.lastBallX[:] = self.ballX
+		self.lastBallY[:] = self.ballY
+
+		# move; update velocity before position
+		halfAccel = np.where(moving, GC_GRAVITY_ACCEL / 2, 0)
+		self.ballDy += halfAccel
+		self.ballX += np.where(moving, self.ballDx, 0)
+		self.ballY += np.where(moving, self.ballDy, 0)
+		self.ballDy += halfAccel
+
+		# collide with walls
+		left = moving & (self.ballX - GC_BALL_RADIUS < GC_WALL_SIZE)
+		right = moving & (self.ballX + GC_BALL_RADIUS > GC_WORLD_WIDTH - GC_WALL_SIZE)
+		self.ballX[left] = GC_WALL_SIZE + GC_BALL_RADIUS
+		self.ballX[right] = GC_WORLD_WIDTH - GC_WALL_SIZE - GC_BALL_RADIUS
+		self.ballDx[left | right] *= -1
+		self.collidedLastFrame |= (left | right).any(axis=1)
+
+		# set 'won'
+		self.won[(moving & (self.ballY - GC_BALL_RADIUS < 0)).any(axis=1)] = 1
+
+		# remove balls that fell out of the world, and lose a life if it was the last one
+		fell = moving & (self.ballY + GC_BALL_RADIUS > GC_WORLD_HEIGHT)
+		if not fell.any():
+			return
+		self.ballAlive &= ~fell
+		lastBall = fell.any(axis=1) & ~self.ballAlive.any(axis=1)
+		lost = lastBall & (self.numLives == 1)
+		self.won[lost] = -1
+		respawn = np.flatnonzero(lastBall & ~lost)
+		self.paused[respawn] = True
+		self.numLives[respawn] -= 1
+		self.makeBalls(respawn)
+
+	def collideBrickBall(self, running: np.ndarray) -> None:
+		# only the cells around the ball can be hit; a ball is smaller than a brick, so the 3x3
+		# cells around the one containing its center are enough
+		for rowOffset in (-1, 0, 1):
+			for columnOffset in (-1, 0, 1):
+				self.collideBrickCell(running, rowOffset, columnOffset)
+
+	def collideBrickCell(self, running: np.ndarray, rowOffset: int, columnOffset: int) -> None:
+		games, balls = np.nonzero(self.ballAlive & running[:, None])
+		if len(games) == 0:
+			return
+		x = self.ballX[games, balls]
+		y = self.ballY[games, balls]
+		row = np.floor((y - GC_BRICK_TOP_HEIGHT) / GC_BRICK_HEIGHT).astype(np.int64) + rowOffset
+		column = np.floor((x - GC_WALL_SIZE) / GC_BRICK_WIDTH).astype(np.int64) + columnOffset
+		inGrid = (row >= 0) & (row < GC_BRICK_LAYERS) & (column >= 0) & (column < GC_BRICK_COLUMNS)
+		games, balls, x, y, row, column = (a[inGrid] for a in (games, balls, x, y, row, column))
+
+		# PosRect.intersectsCircle
+		brickX = column * GC_BRICK_WIDTH + GC_WALL_SIZE
+		brickY = row * GC_BRICK_HEIGHT + GC_BRICK_TOP_HEIGHT
+		nearestX = np.clip(x, brickX, brickX + GC_BRICK_WIDTH)
+		nearestY = np.clip(y, brickY, brickY + GC_BRICK_HEIGHT)
+		hit = ((x - nearestX) ** 2 + (y - nearestY) ** 2 < GC_BALL_RADIUS ** 2) & (
+				self.brickHP[games, row, column] != 0)
+		if not hit.any():
+			return
+		games, balls, x, y, row, column, brickX, brickY = (
+			a[hit] for a in (games, balls, x, y, row, column, brickX, brickY))
+
+		self.collidedLastFrame[games] = True
+		np.subtract.at(self.brickHP, (games, row, column), 1)
+		hp = self.brickHP[games, row, column]
+
+		# bounce off bricks that are still alive
+		bounce = hp != 0
+		angle = np.degrees(np.arctan2(y - (brickY + GC_BRICK_HEIGHT // 2), x - (brickX + GC_BRICK_WIDTH // 2)))
+		angle = np.where(angle > 0, angle, 360 + angle)
+		side = bounce & ((angle >= GC_BRICK_UR_ANGLE) | (angle < GC_BRICK_BR_ANGLE) |
+						 ((GC_BRICK_BL_ANGLE <= angle) & (angle < GC_BRICK_UL_ANGLE)))
+		top = bounce & ~side
+		self.ballDx[games[side], balls[side]] *= -1
+		self.ballX[games[side], balls[side]] = np.where(x[side] > brickX[side] + .5 * GC_BRICK_WIDTH,
+														brickX[side] + GC_BRICK_WIDTH + GC_BALL_RADIUS,
+														brickX[side] - GC_BALL_RADIUS)
+		self.ballDy[games[top], balls[top]] *= -1
+		self.ballY[games[top], balls[top]] = np.where(y[top] > brickY[top] + GC_BRICK_HEIGHT,
+													  brickY[top] + GC_BRICK_HEIGHT + GC_BALL_RADIUS,
+													  brickY[top] - GC_BALL_RADIUS)
+
+		# destroyed bricks: add their score, apply power ups
+		destroyed = hp == 0
+		if not destroyed.any():
+			return
+		games, row, column = games[destroyed], row[destroyed], column[destroyed]
+		powerUp = self.brickPowerUp[games, row, column]
+
+		# like GameSimulation, bricks removed by clear row (including the power up brick) don't add score
+		clearRow = powerUp == POWERUP_CLEAR_ROW
+		scored = ~clearRow
+		np.add.at(self.totalBricksDestroyedScore, games[scored],
+				  BRICK_SCORE_BY_MAX_HP[self.brickMaxHP[games[scored], row[scored], column[scored]]])
+		self.brickHP[games[clearRow], row[clearRow], :] = 0
+
+		extraBall = np.flatnonzero(powerUp == POWERUP_EXTRA_BALL)
+		for i in extraBall:
+			self.addBall(games[i], column[i] * GC_BRICK_WIDTH + GC_WALL_SIZE + GC_BRICK_WIDTH / 2,
+						 row[i] * GC_BRICK_HEIGHT + GC_BRICK_TOP_HEIGHT + GC_BRICK_HEIGHT / 2)
+
+	def addBall(self, game: int, x: float, y: float) -> None:
+		freeSlots = np.flatnonzero(~self.ballAlive[game])
+		if len(freeSlots) == 0:
+			return
+		slot = freeSlots[0]
+		angle = math.radians(self.random.integers(0, 360, endpoint=True))
+		self.ballX[game, slot] = x
+		self.ballY[game, slot] = y
+		self.ballDx[game, slot] = math.cos(angle) * GC_BALL_INITIAL_VELOCITY
+		self.ballDy[game, slot] = math.sin(angle) * GC_BALL_INITIAL_VELOCITY
+		# so collidePaddleBall doesn't use the position of the ball that used to be in this slot
+		self.lastBallX[game, slot] = x
+		self.lastBallY[game, slot] = y
+		self.ballAlive[game, slot] = True
+
+	def collidePaddleBall(self, running: np.ndarray) -> None:
+		moving = self.ballAlive & running[:, None]
+		x, y = self.ballX, self.ballY
+		paddleX = self.paddleX[:, None]
+
+		# PosRect.intersectsCircle
+		nearestX = np.clip(x, paddleX, paddleX + GC_PADDLE_WIDTH)
+		nearestY = np.clip(y, GC_PADDLE_TOP_HEIGHT, GC_PADDLE_TOP_HEIGHT + GC_PADDLE_HEIGHT)
+		hit = moving & ((x - nearestX) ** 2 + (y - nearestY) ** 2 < GC_BALL_RADIUS ** 2)
+		if not hit.any():
+			return
+		games, balls = np.nonzero(hit)
+		self.collidedLastFrame[games] = True
+
+		# find where the ball would have hit the top of the paddle, not where it is now
+		lastX, lastY = self.lastBallX[games, balls], self.lastBallY[games, balls]
+		largeY = y[games, balls] - lastY
+		largeX = x[games, balls] - lastX
+		smallY = GC_PADDLE_TOP_HEIGHT - lastY
+		scale = np.divide(smallY, largeY, out=np.zeros_like(smallY), where=largeY != 0)
+		intersectX = scale * largeX + lastX
+
+		paddleCenterX = self.paddleX[games] + GC_PADDLE_WIDTH // 2
+		angle = np.degrees(np.arctan2(GC_PADDLE_TOP_HEIGHT - (GC_PADDLE_TOP_HEIGHT + GC_PADDLE_HEIGHT // 2),
+									  intersectX - paddleCenterX))
+		angle = np.where(angle > 0, angle, 360 + angle)
+		side = (angle < GC_PADDLE_UL_ANGLE) | (angle > GC_PADDLE_UR_ANGLE)
+		top = ~side
+
+		self.ballDx[games[side], balls[side]] *= -1
+
+		games, balls = games[top], balls[top]
+		dx, dy = self.ballDx[games, balls], self.ballDy[games, balls]
+		velocityMagnitude = (dx ** 2 + dy ** 2) ** 0.5
+		xDiff = (intersectX[top] - paddleCenterX[top]) / (GC_PADDLE_WIDTH // 2)
+		reflectAngle = np.radians(270 + xDiff * GC_MAX_BOUNCE_ANGLE)
+		self.ballDx[games, balls] = np.cos(reflectAngle) * velocityMagnitude
+		self.ballDy[games, balls] = np.sin(reflectAngle) * velocityMagnitude
+
+	def updateScore(self, running: np.ndarray) -> None:
+		# same as GameSimulation.score()
+		if self.level == 99:  # main menu screen embedded level has no par time
+			return
+		percentBricksDestroyed = np.divide(self.totalBricksDestroyedScore, self.totalBrickScore,
+										   out=np.zeros(self.numGames), where=self.totalBrickScore != 0)
+		score = GC_PAR_TIME[self.level - 1] / np.where(running, self.time, 1)
+		score *= (1 - percentBricksDestroyed) + 100
+		self.score[running] = score.astype(np.int64)[running]
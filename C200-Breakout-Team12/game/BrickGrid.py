@@ -0,0 +1,223 @@
+# uniform grid index of the bricks, for finding the bricks a ball might hit
+# Bricks from LevelTools.makeBricks sit on a lattice of cells the size of the level's bricks
+# (GC_BRICK_WIDTH x GC_BRICK_HEIGHT, unless the level is too large for them), starting at the
+# level's first cell, so each brick is stored in the cell it occupies, and a ball only has
+# to be tested against the bricks in the few cells that its bounding box overlaps, instead
+# of every brick in the level. Only cells with bricks in them are stored, so a large level
+# that is mostly empty costs no more than its bricks.
+# Bricks that aren't on the lattice (GC_BRICK_GEN_MODE "random") are stored in every
+# cell they overlap.
+# This is also where the live bricks are kept: GameState.bricks is a view of them, in the
+# order they were added, and they are indexed by row for the clear row power up. Adding or
+# removing a brick only touches its own cells and row, never the whole level.
+# Bricks that were hit or removed are also collected in changed, so the renderer can redraw
+# just those (see Compositor). Only once a renderer has set trackChanges, though: otherwise
+# nothing would ever take them, and a headless game of a scrolling level would keep every
+# brick it ever made.
+# A scrolling level moves the whole grid (see move()); cells and rows are counted from the
+# first cell, so they stay the same when it moves.
+# copy() doesn't copy the bricks: the two grids share them until one of them changes a brick,
+# which it copies first (see own()), so copying a grid only costs its cells and rows, and each
+# frame after it only costs the bricks hit in it.
+from typing import Dict, KeysView, List, Optional, Set, Tuple
+
+from GameConstants import *
+from game.gameClasses.Brick import Brick
+from game.gameClasses.PosCircle import PosCircle
+from game.gameClasses.PosRect import PosRect
+
+
+class BrickGrid:
+	def __init__(self, bricks: List[Brick], firstCell: PosRect = None):
+		if firstCell is None:
+			firstCell = PosRect(GC_WALL_SIZE, GC_BRICK_TOP_HEIGHT, GC_BRICK_WIDTH, GC_BRICK_HEIGHT)
+		self.firstCell: PosRect = firstCell
+		self.cells: Dict[Tuple[int, int], List[Brick]] = {}  # (row, column) -> bricks in that cell
+		# order the bricks were added in, so bricks are always tested in the order of the brick list
+		self.order: Dict[Brick, int] = {}
+		# top edge (below the first cell's) -> bricks with that top edge, in order
+		self.rows: Dict[float, Dict[Brick, None]] = {}
+		self.numInRow: Dict[int, int] = {}  # row -> number of bricks in its cells, for rows with bricks
+		self.numAdded: int = 0
+		self.changed: Set[Brick] = set()  # bricks hit or removed since the renderer last took them
+		self.trackChanges: bool = False
+		# bricks no other grid has, which this one can change in place
+		self.owned: Set[Brick] = set()
+		self.addAll(bricks)
+
+	def getCellRange(self, x: float, y: float, width: float, height: float) -> Tuple[int, int, int, int]:
+		# first row, last row, first column, last column of the cells overlapping the given box
+		cell = self.firstCell
+		firstColumn = math.floor((x - cell.x) / cell.width)
+		lastColumn = math.ceil((x + width - cell.x) / cell.width) - 1
+		firstRow = math.floor((y - cell.y) / cell.height)
+		lastRow = math.ceil((y + height - cell.y) / cell.height) - 1
+		return firstRow, max(firstRow, lastRow), firstColumn, max(firstColumn, lastColumn)
+
+	@property
+	def bricks(self) -> KeysView[Brick]:
+		return self.order.keys()
+
+	def addAll(self, bricks: List[Brick]) -> None:
+		# add() for every brick, with the lattice case done here, for making a whole level's grid
+		cell = self.firstCell
+		cellX, cellY, cellWidth, cellHeight = cell.x, cell.y, cell.width, cell.height
+		order, cells, rows, numInRow = self.order, self.cells, self.rows, self.numInRow
+		for brick in bricks:
+			rect = brick.rect
+			top = rect.y - cellY
+			row, rowOffset = divmod(top, cellHeight)
+			column, columnOffset = divmod(rect.x - cellX, cellWidth)
+			if rowOffset or columnOffset or rect.width != cellWidth or rect.height != cellHeight:
+				self.add(brick)
+				continue
+			order[brick] = self.numAdded
+			self.numAdded += 1
+			rowBricks = rows.get(top)
+			if rowBricks is None:
+				rowBricks = rows[top] = {}
+			rowBricks[brick] = None
+			numInRow[row] = numInRow.get(row, 0) + 1
+			cellBricks = cells.get((row, column))
+			if cellBricks is None:
+				cells[(row, column)] = [brick]
+			else:
+				cellBricks.append(brick)
+		self.owned.update(bricks)
+
+	def add(self, brick: Brick) -> None:
+		self.owned.add(brick)
+		self.order[brick] = self.numAdded
+		self.numAdded += 1
+		rect, cell = brick.rect, self.firstCell
+		self.rows.setdefault(rect.y - cell.y, {})[brick] = None
+		if rect.width == cell.width and rect.height == cell.height:
+			row, rowOffset = divmod(rect.y - cell.y, cell.height)
+			column, columnOffset = divmod(rect.x - cell.x, cell.width)
+			if not rowOffset and not columnOffset:
+				# on the lattice (all bricks made from level files are), so in just one cell
+				self.numInRow[row] = self.numInRow.get(row, 0) + 1
+				self.cells.setdefault((row, column), []).append(brick)
+				return
+		firstRow, lastRow, firstColumn, lastColumn = self.getCellRange(brick.rect.x, brick.rect.y,
+																		 brick.rect.width, brick.rect.height)
+		for row in range(firstRow, lastRow + 1):
+			self.numInRow[row] = self.numInRow.get(row, 0) + 1
+			for column in range(firstColumn, lastColumn + 1):
+				self.cells.setdefault((row, column), []).append(brick)
+
+	def remove(self, brick: Brick) -> None:
+		if brick not in self.order:
+			return
+		del self.order[brick]
+		self.owned.discard(brick)
+		if self.trackChanges:
+			self.changed.add(brick)
+		row = self.rows[brick.rect.y - self.firstCell.y]
+		del row[brick]
+		if not row:
+			del self.rows[brick.rect.y - self.firstCell.y]
+		firstRow, lastRow, firstColumn, lastColumn = self.getCellRange(brick.rect.x, brick.rect.y,
+																		 brick.rect.width, brick.rect.height)
+		for row in range(firstRow, lastRow + 1):
+			self.numInRow[row] -= 1
+			if not self.numInRow[row]:
+				del self.numInRow[row]
+			for column in range(firstColumn, lastColumn + 1):
+				cell = self.cells[(row, column)]
+				cell.remove(brick)
+				if not cell:
+					del self.cells[(row, column)]
+
+	def markChanged(self, brick: Brick) -> None:
+		# call when a brick's HP changes, so it is redrawn
+		if self.trackChanges:
+			self.changed.add(brick)
+
+	def contains(self, brick: Brick) -> bool:
+		return brick in self.order
+
+	def query(self, circle: PosCircle) -> List[Brick]:
+		# bricks in the cells overlapped by the circle's bounding box, in brick list order
+		return self.queryBox(circle.x - circle.radius, circle.y - circle.radius, circle.radius * 2, circle.radius * 2)
+
+	def queryBox(self, x: float, y: float, width: float, height: float) -> List[Brick]:
+		# bricks in the cells overlapped by the given box, in brick list order
+		firstRow, lastRow, firstColumn, lastColumn = self.getCellRange(x, y, width, height)
+		found = {}  # bricks that aren't on the lattice are in more than one cell
+		for row in range(firstRow, lastRow + 1):
+			if row in self.numInRow:
+				for column in range(firstColumn, lastColumn + 1):
+					cell = self.cells.get((row, column))
+					if cell:
+						for brick in cell:
+							found[brick] = None
+		found = list(found)
+		if len(found) > 1:
+			found.sort(key=self.order.__getitem__)
+		return found
+
+	def getRowsRange(self) -> Optional[Tuple[float, float]]:
+		# top and bottom of the rows that have bricks in them, or None if there are no bricks
+		if not self.numInRow:
+			return None
+		cell = self.firstCell
+		return cell.y + min(self.numInRow) * cell.height, cell.y + (max(self.numInRow) + 1) * cell.height
+
+	def getRow(self, y: float) -> List[Brick]:
+		# bricks whose top edge is at the given height (the bricks that a clear row power up removes)
+		return list(self.rows.get(y - self.firstCell.y, ()))
+
+	def own(self, brick: Brick) -> Brick:
+		# the brick, to be changed: if another grid shares it (see copy()), it is replaced by a
+		# copy of it first, in the same place in the order, its row and its cells
+		if brick in self.owned:
+			return brick
+		copy = brick.copy()
+		if brick not in self.order:
+			return copy  # already removed (by a clear row power up earlier in the frame)
+		self.owned.add(copy)
+		self.order = {copy if other is brick else other: n for other, n in self.order.items()}
+		top = brick.rect.y - self.firstCell.y
+		self.rows[top] = {copy if other is brick else other: None for other in self.rows[top]}
+		firstRow, lastRow, firstColumn, lastColumn = self.getCellRange(brick.rect.x, brick.rect.y,
+																		 brick.rect.width, brick.rect.height)
+		for row in range(firstRow, lastRow + 1):
+			for column in range(firstColumn, lastColumn + 1):
+				cell = self.cells[(row, column)]
+				cell[cell.index(brick)] = copy
+		return copy
+
+	def ownAll(self) -> None:
+		# own() for every brick at once, remapping the cells and rows in bulk
+		if len(self.owned) == len(self.order):
+			return
+		owned = self.owned
+		copies = {brick: brick if brick in owned else brick.copy() for brick in self.order}
+		getCopy = copies.__getitem__
+		self.order = dict(zip(copies.values(), self.order.values()))
+		self.cells = {key: list(map(getCopy, bricks)) for key, bricks in self.cells.items()}
+		self.rows = {key: dict.fromkeys(map(getCopy, row)) for key, row in self.rows.items()}
+		self.owned = set(copies.values())
+
+	def copy(self) -> 'BrickGrid':
+		# a grid with the same bricks, made from this one's cells and rows instead of adding the
+		# bricks again; neither grid owns the bricks any more (changed starts empty and untracked:
+		# a new state gets a new Compositor, which draws every brick)
+		cell = self.firstCell
+		grid = BrickGrid([], PosRect(cell.x, cell.y, cell.width, cell.height))
+		grid.order = self.order.copy()
+		grid.cells = {key: bricks.copy() for key, bricks in self.cells.items()}
+		grid.rows = {key: row.copy() for key, row in self.rows.items()}
+		grid.numInRow = self.numInRow.copy()
+		grid.numAdded = self.numAdded
+		self.owned = set()
+		return grid
+
+	def move(self, dy: int) -> None:
+		# move the grid and all its bricks down by dy (whole pixels, so the top edges below the
+		# first cell's stay exactly the same)
+		self.ownAll()
+		self.firstCell.y += dy
+		for brick in self.order:
+			brick.rect.y += dy
@@ -0,0 +1,163 @@
+# the parts of a rendered GameState that rarely change, kept between frames
+# GameRenderer used to blit both walls, every label, digit and life icon, and every brick
+# (looking up each brick's image from its HP) every frame, even though most frames change
+# none of them. Instead, these are drawn onto layers once and only redrawn when they change:
+# - the wall columns: the walls with their SCORE/TIME and LEVEL labels are composed once,
+#   and the score, time, level and lives are drawn on a copy whenever their values change
+# - the bricks: drawn onto bands one brick row high, and only the bricks that BrickGrid
+#   says were hit or removed are redrawn (bands whose bricks are all gone are dropped)
+# so each frame is a few large blits, plus the paddle, balls and particles.
+# The walls and bricks are opaque, so drawing them onto a layer and blitting the layer gives
+# exactly the same picture as blitting them one at a time.
+from typing import Dict
+
+import Graphics
+from Assets import Assets
+from DrawList import DrawList
+from GameConstants import *
+from TextRenderer import VERTICAL
+from game.GameState import GameState
+from game.gameClasses.Brick import Brick
+from game.gameClasses.PosRect import PosRect
+
+# the parts of the brick bands with no brick in them are this color, which isn't in any brick image
+# (they are drawn in a few flat colors, including black and magenta)
+BRICK_COLORKEY: Tuple[int, int, int] = (1, 2, 3)
+BRICK_LAYER_X: int = GC_WALL_SIZE
+BRICK_LAYER_WIDTH: int = GC_WORLD_WIDTH - 2 * GC_WALL_SIZE
+
+
+class Compositor:
+	def __init__(self, state: GameState):
+		self.state: GameState = state
+
+		# walls with their labels, which never change
+		self.leftWall: pygame.Surface = Assets.I_WALL.copy()
+		self.leftWall.blit(Assets.I_TXT_SCORE, (0, 0))
+		self.leftWall.blit(Assets.I_TXT_TIME, (0, GC_WORLD_HEIGHT - Assets.I_TXT_TIME.get_height()))
+		self.rightWall: pygame.Surface = Assets.I_WALL.copy()
+		self.rightWall.blit(Assets.I_TXT_LEVEL, (0, 0))
+		# the walls with the stats drawn on them, and the stats they were drawn with
+		self.leftColumn: pygame.Surface = self.leftWall.copy()
+		self.rightColumn: pygame.Surface = self.rightWall.copy()
+		self.leftStats: Tuple[int, int] = None
+		self.rightStats: Tuple[int, int] = None
+
+		# row (counted like BrickGrid's rows) -> band of the brick layer
+		self.brickBands: Dict[int, pygame.Surface] = {}
+		# the same bands, run-length encoded: most of a band is either brick or empty, so these blit
+		# much faster, but SDL can't draw onto them correctly, so they are copied from brickBands
+		# whenever a brick in them changes
+		self.encodedBands: Dict[int, pygame.Surface] = {}
+		for brick in state.bricks:
+			self.drawBrick(brick)
+		for row in self.brickBands:
+			self.encodeBand(row)
+		state.brickGrid.changed.clear()
+		state.brickGrid.trackChanges = True
+
+	def drawWalls(self, layer: DrawList) -> None:
+		# the walls, with the score, time, level and lives
+		state = self.state
+		leftStats = (state.score + state.oldScore, int(state.time))
+		if leftStats != self.leftStats:
+			self.leftStats = leftStats
+			self.leftColumn.blit(self.leftWall, (0, 0))
+			self.drawLeftStats(self.leftColumn, *leftStats)
+			Graphics.changed(self.leftColumn)
+		rightStats = (state.level, state.numLives)
+		if rightStats != self.rightStats:
+			self.rightStats = rightStats
+			self.rightColumn.blit(self.rightWall, (0, 0))
+			self.drawRightStats(self.rightColumn, *rightStats)
+			Graphics.changed(self.rightColumn)
+		layer.add(self.leftColumn, (0, 0))
+		layer.add(self.rightColumn, (GC_WORLD_WIDTH - GC_WALL_SIZE, 0))
+
+	@staticmethod
+	def drawLeftStats(column: pygame.Surface, score: int, time: int) -> None:
+		# the following images use GC_WALL_SIZE was their width instead of GC_IMGFONT_SIZE:
+		# 'SCORE', 'TIME', and 'LEVEL' labels; life icons
+		# heart icons also have GC_WALL_SIZE as their height
+		wall_font_offset = GC_WALL_SIZE // 2 - GC_IMGFONT_SIZE // 2
+
+		# score, down from the label
+		Graphics.text.draw(column, str(score), (wall_font_offset, Assets.I_TXT_SCORE.get_height()), VERTICAL)
+
+		# time, up from the label, with leading zeroes to three digits
+		# this may or may not work properly past 999 seconds
+		image = Graphics.text.render(str(time), VERTICAL, 3)
+		column.blit(image, (wall_font_offset, GC_WORLD_HEIGHT - Assets.I_TXT_TIME.get_height() - image.get_height()))
+
+	@staticmethod
+	def drawRightStats(column: pygame.Surface, level: int, numLives: int) -> None:
+		wall_font_offset = GC_WALL_SIZE // 2 - GC_IMGFONT_SIZE // 2
+
+		# level, drawn as '01' '02' etc. instead of just '1' '2'
+		Graphics.text.draw(column, str(level), (wall_font_offset, Assets.I_TXT_LEVEL.get_height()), VERTICAL, 2)
+
+		# lives
+		height = GC_WORLD_HEIGHT - GC_WALL_SIZE
+		for i in range(numLives):
+			column.blit(Assets.I_TXT_LIFE, (0, height))
+			height -= GC_WALL_SIZE
+
+	def drawBricks(self, layer: DrawList) -> None:
+		# redraws the bricks that changed, then adds the bands to layer
+		grid = self.state.brickGrid
+		if grid.changed:
+			changedRows = set()
+			for brick in grid.changed:
+				self.redrawArea(brick.rect)
+				changedRows.update(self.getBandRows(brick.rect))
+			grid.changed.clear()
+			for row in changedRows:
+				if row in grid.numInRow:
+					self.encodeBand(row)
+				else:
+					# (a band made for bricks that were added and removed since the last frame was never encoded)
+					del self.brickBands[row]
+					self.encodedBands.pop(row, None)
+		for row, band in self.encodedBands.items():
+			layer.add(band, (BRICK_LAYER_X, self.getBandTop(row)))
+
+	def getBandTop(self, row: int) -> int:
+		firstCell = self.state.brickGrid.firstCell
+		return firstCell.y + row * firstCell.height
+
+	def getBand(self, row: int) -> pygame.Surface:
+		band = self.brickBands.get(row)
+		if band is None:
+			band = pygame.Surface((BRICK_LAYER_WIDTH, self.state.brickGrid.firstCell.height)).convert(Graphics.gameSurface)
+			band.fill(BRICK_COLORKEY)
+			band.set_colorkey(BRICK_COLORKEY)
+			self.brickBands[row] = band
+		return band
+
+	def encodeBand(self, row: int) -> None:
+		encodedBand = self.brickBands[row].copy()
+		encodedBand.set_colorkey(BRICK_COLORKEY, pygame.RLEACCEL)
+		self.encodedBands[row] = encodedBand
+
+	def getBandRows(self, rect: PosRect) -> range:
+		firstRow, lastRow, firstColumn, lastColumn = self.state.brickGrid.getCellRange(rect.x, rect.y, rect.width,
+																						rect.height)
+		return range(firstRow, lastRow + 1)
+
+	def drawBrick(self, brick: Brick) -> None:
+		# a brick that isn't on the lattice (GC_BRICK_GEN_MODE "random") is drawn into every band it overlaps
+		image = brick.getImage(0)
+		for row in self.getBandRows(brick.rect):
+			self.getBand(row).blit(image, (brick.rect.x - BRICK_LAYER_X, brick.rect.y - self.getBandTop(row)))
+
+	def redrawArea(self, rect: PosRect) -> None:
+		# clear the area and draw the bricks that are there now (bricks can overlap in "random"
+		# mode, so this redraws every brick in the area, clipped to it, in brick list order)
+		for row in self.getBandRows(rect):
+			band = self.getBand(row)
+			area = pygame.Rect(rect.x - BRICK_LAYER_X, rect.y - self.getBandTop(row), rect.width, rect.height)
+			band.fill(BRICK_COLORKEY, area)
+			band.set_clip(area)
+			for brick in self.state.brickGrid.queryBox(rect.x, rect.y, rect.width, rect.height):
+				band.blit(brick.getImage(0), (brick.rect.x - BRICK_LAYER_X, brick.rect.y - self.getBandTop(row)))
+			band.set_clip(None)
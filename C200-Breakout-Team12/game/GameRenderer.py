@@ -1,89 +1,90 @@
 # renders a GameState
 
+from typing import Dict
+
 import Graphics
 from Assets import Assets
+from DrawList import DrawList
 from GameConstants import *
+from game.Compositor import Compositor
 from game.GameState import GameState
+from game.gameClasses.PosPoint import PosPoint
 
 
 class GameRenderer:
+	compositor: Compositor = None  # layers of the last state rendered
+	# what is drawn, layer by layer, in this order
+	flashLayer: DrawList = DrawList("flash")
+	wallLayer: DrawList = DrawList("walls")
+	paddleLayer: DrawList = DrawList("paddle")
+	brickLayer: DrawList = DrawList("bricks")
+	ballLayer: DrawList = DrawList("balls")
+	particleLayer: DrawList = DrawList("particles")
+
+	@staticmethod
+	def interpolate(previousPositions: Dict[object, PosPoint], obj, x: float, y: float,
+					alpha: float) -> Tuple[float, float]:
+		# position alpha of the way from where obj was before the last update to (x, y)
+		# objects that didn't exist before the last update are drawn where they are
+		previous = previousPositions.get(obj)
+		if previous is None:
+			return x, y
+		return previous.x + (x - previous.x) * alpha, previous.y + (y - previous.y) * alpha
+
 	@staticmethod
-	def render(state: GameState, frame: int) -> None:
+	def render(state: GameState, frame: int, alpha: float = 1,
+			   previousPositions: Dict[object, PosPoint] = None) -> None:
+		# previousPositions maps the balls and paddle to their positions before the last update;
+		# if given, they are drawn alpha of the way from there to where they are now
 		surface: pygame.Surface = Graphics.surface
+		if previousPositions is None:
+			previousPositions = {}
 
 		# don't change this render order
 
 		###   BG FLASH   ######################################################
 		if state.collidedLastFrame:
-			surface.blit(Assets.I_BG_FLASH, (0, 0))
-
-		###   WALL   ##########################################################
-		surface.blit(Assets.I_WALL, (0, 0))
-		surface.blit(Assets.I_WALL, (GC_WORLD_WIDTH - GC_WALL_SIZE, 0))
-
-		### STATS  ############################################################
-		# the following images use GC_WALL_SIZE was their width instead of GC_IMGFONT_SIZE:
-		# 'SCORE', 'TIME', and 'LEVEL' labels; life icons
-		# heart icons also have GC_WALL_SIZE as their height
-
-		wall_font_offset = GC_WALL_SIZE // 2 - GC_IMGFONT_SIZE // 2
-
-		# score
-		Graphics.surface.blit(Assets.I_TXT_SCORE, (0, 0))
-		height = Assets.I_TXT_SCORE.get_height()
-		for i in str(state.score + state.oldScore):
-			# get image (stored as I_TXT_N, where N is an integer 0-9) from the number in the string
-			image: pygame.Surface = getattr(Assets, "I_TXT_" + str(i))
-			Graphics.surface.blit(image, (wall_font_offset, height))
-			height += GC_IMGFONT_SIZE
-
-		# level
-		Graphics.surface.blit(Assets.I_TXT_LEVEL, (GC_WORLD_WIDTH - GC_WALL_SIZE, 0))
-		height = Assets.I_TXT_LEVEL.get_height()
-		# draw levels as '01' '02' etc. instead of just '1' '2'
-		if state.level < 10:
-			Graphics.surface.blit(Assets.I_TXT_0, (GC_WORLD_WIDTH - GC_WALL_SIZE + wall_font_offset, height))
-			height += GC_IMGFONT_SIZE
-		for i in str(state.level):
-			image: pygame.Surface = getattr(Assets, "I_TXT_" + str(i))
-			Graphics.surface.blit(image, (GC_WORLD_WIDTH - GC_WALL_SIZE + wall_font_offset, height))
-			height += GC_IMGFONT_SIZE
-
-		# lives
-		height = GC_WORLD_HEIGHT - GC_WALL_SIZE
-		for i in range(state.numLives):
-			Graphics.surface.blit(Assets.I_TXT_LIFE, (GC_WORLD_WIDTH - GC_WALL_SIZE, height))
-			height -= GC_WALL_SIZE
-
-		# time
-		# this may or may not work properly past 999 seconds
-		height = GC_WORLD_HEIGHT - Assets.I_TXT_TIME.get_height()
-		Graphics.surface.blit(Assets.I_TXT_TIME, (0, height))
-		height -= GC_IMGFONT_SIZE
-		for i in reversed(str(int(state.time))):
-			image: pygame.Surface = getattr(Assets, "I_TXT_" + str(i))
-			Graphics.surface.blit(image, (wall_font_offset, height))
-			height -= GC_IMGFONT_SIZE
-		# like level, draw leading zeroes (trailing in this case)
-		if int(state.time) < 100:
-			Graphics.surface.blit(Assets.I_TXT_0, (wall_font_offset, height))
-			height -= GC_IMGFONT_SIZE
-		if int(state.time) < 10:
-			Graphics.surface.blit(Assets.I_TXT_0, (wall_font_offset, height))
+			GameRenderer.flashLayer.add(Assets.I_BG_FLASH, (0, 0))
+			Graphics.addToTrail(GameRenderer.flashLayer.commands)
+			GameRenderer.flashLayer.draw(surface)
+
+		###   WALLS AND STATS   ###############################################
+		layer = GameRenderer.wallLayer
+		layer.begin()
+		if GameRenderer.compositor is None or GameRenderer.compositor.state is not state:
+			GameRenderer.compositor = Compositor(state)
+		GameRenderer.compositor.drawWalls(layer)
+		layer.draw(surface)
 
 		###   PADDLE   ########################################################
-		surface.blit(state.paddle.getImage(frame), (state.paddle.rect.x, state.paddle.rect.y))
+		layer = GameRenderer.paddleLayer
+		layer.add(state.paddle.getImage(frame),
+				  GameRenderer.interpolate(previousPositions, state.paddle, state.paddle.rect.x, state.paddle.rect.y,
+										   alpha))
+		Graphics.addToTrail(layer.commands)
+		layer.draw(surface)
 
 		###   BRICKS   ########################################################
-		for b in state.bricks:
-			surface.blit(b.getImage(frame), (b.rect.x, b.rect.y))
+		layer = GameRenderer.brickLayer
+		layer.begin()
+		GameRenderer.compositor.drawBricks(layer)
+		layer.draw(surface)
 
 		###   BALL   ##########################################################
+		layer = GameRenderer.ballLayer
+		layer.begin()
 		for ball in state.balls:
-			ballPos = ball.circle
-			surface.blit(ball.getImage(frame), (ballPos.x - ballPos.radius, ballPos.y - ballPos.radius))
-
-		###   DISPLAYABLES   ##################################################
-		for d in state.displayables:
-			image: pygame.Surface = d.getImage(frame)
-			surface.blit(image, (d.pos.x - image.get_width() // 2, d.pos.y - image.get_height() // 2))
+			ballX, ballY = GameRenderer.interpolate(previousPositions, ball, ball.circle.x, ball.circle.y, alpha)
+			layer.add(ball.getImage(frame), (ballX - ball.circle.radius, ballY - ball.circle.radius))
+		Graphics.addToTrail(layer.commands)
+		layer.draw(surface)
+
+		###   PARTICLES   #####################################################
+		layer = GameRenderer.particleLayer
+		layer.begin()
+		rotate = Graphics.rotationCache.rotate
+		for image, x, y, angle in state.particles.getSprites(frame, alpha):
+			image = rotate(image, angle)
+			layer.add(image, (x - image.get_width() // 2, y - image.get_height() // 2))
+		Graphics.addToTrail(layer.commands)
+		layer.draw(surface)
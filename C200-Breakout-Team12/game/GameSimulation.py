@@ -0,0 +1,472 @@
+# this module contains the game rules and physics, without any graphics or input
+# GameController used to do all of this while also reading the pygame event queue,
+# kicking the camera and making animations, so a GameState could only be stepped
+# with a display open and at the speed of the main loop.
+# Now, the simulation takes paddle commands as a PaddleAction and records what happened
+# as GameEvents in state.events. The GameController (used by the screens) reads input
+# into a PaddleAction and turns the events into animations and screenshake.
+# Bots and benchmarks can call step() directly, as fast as the CPU allows, without
+# pygame.init(), a display, or the Assets being loaded.
+from functools import lru_cache
+from typing import List
+
+from GameConstants import *
+from game.GameState import GameState
+from game.LevelTools import makeBall
+from game.Sweep import advanceBall, contactPoint, pathBounds, timeToCross, timeToHitRect, timeToReach
+from game.gameClasses.Ball import Ball
+from game.gameClasses.Brick import Brick
+from game.gameClasses.GameEvent import GameEvent
+from game.gameClasses.PaddleAction import PaddleAction
+from game.gameClasses.Paddle import Paddle
+from game.gameClasses.PosCircle import PosCircle
+from game.gameClasses.PosPoint import PosPoint
+from game.gameClasses.PosRect import PosRect
+from game.gameClasses.Velocity import Velocity
+
+# with swept collision, a ball stops being moved after this many impacts in one frame
+# (only reachable if it gets wedged somewhere)
+MAX_IMPACTS_PER_FRAME: int = 8
+
+
+@lru_cache(None)
+def getCornerAngles(width: float, height: float) -> Tuple[float, float, float, float]:
+	# the GC_BRICK_UL/UR/BL/BR_ANGLEs of a brick of this size (smaller in levels too large for the usual size)
+	if width == GC_BRICK_WIDTH and height == GC_BRICK_HEIGHT:
+		return GC_BRICK_UL_ANGLE, GC_BRICK_UR_ANGLE, GC_BRICK_BL_ANGLE, GC_BRICK_BR_ANGLE
+	upperLeft = 360 + math.degrees(math.atan2(-height / 2, -width / 2))
+	upperRight = 360 + math.degrees(math.atan2(-height / 2, width / 2))
+	bottomLeft = math.degrees(math.atan2(height / 2, -width / 2))
+	bottomRight = math.degrees(math.atan2(height / 2, width / 2))
+	return upperLeft, upperRight, bottomLeft, bottomRight
+
+
+class GameSimulation:
+	def __init__(self, state: GameState):
+		self.state: GameState = state
+		self.paddle: Paddle = state.paddle  # shortcut to avoid having to type self.state.paddle
+
+	def step(self, action: PaddleAction, dt: float = 1) -> None:
+		# advance the game by dt frames
+		# dt other than 1 always uses swept collision, so large steps don't tunnel through anything
+		# (at dt 1 a fast ball can still cut through a brick's corner, unless GC_SWEPT_COLLISION is on)
+		self.paddle = self.state.paddle  # update this in case it changed
+		self.state.events.clear()
+
+		if self.state.paused:
+			# let the paddle move even if the game hasn't started
+			self.movePaddle(action, dt)
+			# but don't let it go off the screen
+			self.collidePaddleWall()
+			self.state.collidedLastFrame = False
+			# start the game when started
+			if action.begin:
+				self.state.paused = False
+			return
+
+		self.state.time += GC_FRAME_TIME_SECONDS * dt
+		self.state.collidedLastFrame = False
+		if GC_SWEPT_COLLISION or dt != 1:
+			# the balls are swept against the paddle where it is at the end of the step
+			self.movePaddle(action, dt)
+			self.collidePaddleWall()
+			self.sweepBalls(dt)
+		else:
+			self.updateBall()
+			self.movePaddle(action)
+			self.collidePaddleWall()
+			self.collideBrickBall()
+			self.collidePaddleBall()
+		if self.state.scrollingLevel is not None:
+			self.state.scrollingLevel.update(dt)
+		self.score()
+
+	def fastForward(self, action: PaddleAction, maxFrames: float) -> float:
+		# Event-driven stepping: advance straight to the next time any ball hits something (or
+		# maxFrames), and return how many frames that was, so the cost is per bounce, not per frame.
+		# Between impacts the balls follow their exact paths, and the impacts are found the way
+		# swept collision finds them. Compared to step() in the default frame-based collision
+		# (GC_SWEPT_COLLISION off), which only notices an impact at the end of the frame it happens
+		# in and bounces the ball back from where it is then:
+		# - the ball is up to two frames behind after every impact there, and that adds up, so
+		#   state.time (and the score, which is worked out from it) drift apart as the game goes on
+		# - where the frame-based rules bounce the ball another way (near a brick's corner, or off
+		#   the paddle at an angle: the paddle is hit where the centre of the ball crosses its top),
+		#   the two games go their own ways from there
+		# - a fast ball that step() would let cut through a brick's corner hits it here
+		# Compared to step() with swept collision, it is the same to within:
+		# - about 1e-6 px in ball positions, from floating point rounding
+		# - state.time (and so the score): step() counts the whole frame in which something is
+		#   hit, this counts time up to the impact itself
+		# - the order of impacts: step() moves the balls one after another through each frame, so
+		#   if two balls hit the same brick within a frame, the first ball in the list gets it
+		# The paddle is moved to action.targetX and then holds still (moveDir is ignored), so a
+		# bot can pick a new target after every bounce.
+		if self.state.paused:
+			# waiting for action.begin, one frame at a time
+			self.step(action)
+			return 1
+		self.paddle = self.state.paddle
+		self.state.events.clear()
+		self.state.collidedLastFrame = False
+		self.movePaddle(PaddleAction(0, action.targetX))
+		self.collidePaddleWall()
+
+		impacts = [(ball, self.findImpact(ball, maxFrames)) for ball in self.state.balls]
+		frames = min(impactTime for ball, (impactTime, target) in impacts)
+		self.state.time += GC_FRAME_TIME_SECONDS * frames
+		self.saveLastPositions()
+		for ball, (impactTime, target) in impacts:
+			advanceBall(ball, frames)
+			if impactTime == frames and target is not None:
+				destroyedBricks = []
+				self.applyImpact(ball, target, destroyedBricks)
+				self.scoreBricks(destroyedBricks)
+		if self.state.scrollingLevel is not None:
+			self.state.scrollingLevel.update(frames)
+		self.score()
+		return frames
+
+	def addEvent(self, eventType: str, x: float, y: float, ball: Ball, data=None) -> None:
+		self.state.events.append(
+			GameEvent(eventType, PosPoint(x, y), Velocity(ball.velocity.dx, ball.velocity.dy), data))
+
+	def movePaddle(self, action: PaddleAction, dt: float = 1):
+		if action.targetX is not None:
+			self.paddle.rect.x = action.targetX
+		self.paddle.velocity.dx = action.moveDir * GC_PADDLE_SPEED
+		self.paddle.rect.x += self.paddle.velocity.dx * dt
+
+	def saveLastPositions(self):
+		# store where each ball is before it moves
+		# the points are kept from frame to frame and moved in place, and only added or removed
+		# when the number of balls changes, so this doesn't make any new objects most frames
+		lastPosBalls = self.state.lastPosBalls
+		balls = self.state.balls
+		if len(lastPosBalls) > len(balls):
+			del lastPosBalls[len(balls):]
+		while len(lastPosBalls) < len(balls):
+			lastPosBalls.append(PosPoint(0, 0))
+		for i in range(len(balls)):
+			lastPosBalls[i].set(balls[i].circle.x, balls[i].circle.y)
+
+	def updateBall(self):
+		self.saveLastPositions()
+		for ball in self.state.balls:
+			# move; update velocity before position
+			# (half the acceleration before and half after, so the path is the exact parabola)
+			ball.acceleration.apply(ball.velocity, 0.5)
+			ball.velocity.apply(ball.circle)
+			ball.acceleration.apply(ball.velocity, 0.5)
+
+			# collide with walls and top/bottom of world
+			wallCollided = 0
+			if ball.circle.x - ball.circle.radius < GC_WALL_SIZE:
+				ball.circle.x = GC_WALL_SIZE + ball.circle.radius
+				wallCollided = -1  # left
+			elif ball.circle.x + ball.circle.radius > GC_WORLD_WIDTH - GC_WALL_SIZE:
+				ball.circle.x = GC_WORLD_WIDTH - GC_WALL_SIZE - ball.circle.radius
+				wallCollided = 1  # right
+
+			if wallCollided:
+				self.bounceOffWall(ball, wallCollided)
+
+			# set 'won'
+			if ball.circle.y - ball.circle.radius < 0:
+				if self.isTopOpen():
+					self.state.won = 1
+				else:
+					ball.circle.y = ball.circle.radius
+					self.bounceOffTop(ball)
+			# decrement lives or set 'lost'
+			elif ball.circle.y + ball.circle.radius > GC_WORLD_HEIGHT:
+				self.loseBall(ball)
+
+	def isTopOpen(self) -> bool:
+		# the ball can leave through the top of the world, unless a scrolling level is still coming down
+		return self.state.scrollingLevel is None or self.state.scrollingLevel.isOpen()
+
+	def bounceOffTop(self, ball: Ball):
+		ball.velocity.dy = abs(ball.velocity.dy)
+		self.state.collidedLastFrame = True
+
+	def bounceOffWall(self, ball: Ball, wall: int):
+		# wall is -1 for left, 1 for right
+		ball.velocity.dx *= -1
+		# add screenflash
+		self.state.collidedLastFrame = True
+		collisionX = GC_WALL_SIZE if wall == -1 else GC_WORLD_WIDTH - GC_WALL_SIZE
+		self.addEvent(GameEvent.WALL_BOUNCE, collisionX, ball.circle.y, ball, wall)
+
+	def loseBall(self, ball: Ball):
+		# called when a ball goes out of the bottom of the world
+		# if this is the last ball...
+		# if you had one life left, set won == -1
+		# else, pause, regenerate the initial ball, decrement life
+		if len(self.state.balls) == 1:
+			if self.state.numLives == 1:
+				self.state.won = -1
+			else:
+				self.state.paused = True
+				self.state.balls = [makeBall(self.state.random)]
+				self.state.numLives -= 1
+
+		# the controller adds an explosion animation, even if it wasn't the last ball
+		self.addEvent(GameEvent.BALL_LOST, ball.circle.x, GC_WORLD_HEIGHT, ball)
+		# but if this isn't the last ball, just remove it from the list of balls
+		# but remove it even if it is the last ball
+		self.state.balls = list(
+			filter(lambda b: b is not ball and b.circle.y < GC_WORLD_HEIGHT - b.circle.radius, self.state.balls))
+
+	def collidePaddleWall(self):
+		if self.paddle.rect.x < GC_WALL_SIZE:
+			self.paddle.rect.x = GC_WALL_SIZE
+		elif (self.paddle.rect.x + self.paddle.rect.width) > GC_WORLD_WIDTH - GC_WALL_SIZE:
+			self.paddle.rect.x = GC_WORLD_WIDTH - GC_WALL_SIZE - self.paddle.rect.width
+
+	def collidePaddleBall(self):
+		# The ball's velocity (per frame) is a large percentage of the paddle height.
+		# So find where it actually would have hit the paddle, not where it is
+		# relative to the paddle on this frame.
+
+		for i in range(len(self.state.balls)):
+			ball = self.state.balls[i]
+			if self.paddle.rect.intersectsCircle(ball.circle):
+				largeY = ball.circle.y - self.state.lastPosBalls[i].y
+				largeX = ball.circle.x - self.state.lastPosBalls[i].x
+				smallY = GC_PADDLE_TOP_HEIGHT - self.state.lastPosBalls[i].y
+				scale = smallY / largeY
+				smallX = scale * largeX
+				intersectX = smallX + self.state.lastPosBalls[i].x
+				intersectPoint = PosPoint(intersectX, GC_PADDLE_TOP_HEIGHT)
+				self.bounceOffPaddle(ball, intersectPoint)
+
+	def bounceOffPaddle(self, ball: Ball, intersectPoint: PosPoint):
+		angle = self.paddle.rect.findAngle(intersectPoint)
+
+		if angle < GC_PADDLE_UL_ANGLE or angle > GC_PADDLE_UR_ANGLE:
+			self.state.collidedLastFrame = True
+			# hit side of paddle
+			ball.velocity.dx *= -1
+		else:
+			# hit top of paddle
+			self.state.collidedLastFrame = True
+			velocityMagnitude = (ball.velocity.dx ** 2 + ball.velocity.dy ** 2) ** 0.5
+			xDiff = intersectPoint.x - (self.paddle.rect.x + self.paddle.rect.width // 2)
+			xDiff /= self.paddle.rect.width // 2
+			reflectAngle = 270 + xDiff * GC_MAX_BOUNCE_ANGLE
+			velocityX = math.cos(math.radians(reflectAngle)) * velocityMagnitude
+			velocityY = math.sin(math.radians(reflectAngle)) * velocityMagnitude
+			ball.velocity.dx = velocityX
+			ball.velocity.dy = velocityY
+
+		self.addEvent(GameEvent.PADDLE_HIT, intersectPoint.x, intersectPoint.y, ball, angle)
+
+	def collideBrickBall(self):
+		grid = self.state.brickGrid
+		for ball in self.state.balls:
+			destroyedBricks = []
+			# collision and HP removal; only the bricks near the ball can be hit
+			for brick in grid.query(ball.circle):
+				if brick.rect.intersectsCircle(ball.circle):
+					self.hitBrick(ball, brick, destroyedBricks)
+			self.scoreBricks(destroyedBricks)
+
+	def hitBrick(self, ball: Ball, brick: Brick, destroyedBricks: List[Brick], swept: bool = False):
+		self.state.collidedLastFrame = True
+		brick = self.state.brickGrid.own(brick)  # a clone of the state may share it
+		brick.hp -= 1
+		self.state.brickGrid.markChanged(brick)
+		if brick.hp != 0:  # don't bounce the ball when it destroys a brick
+			self.addEvent(GameEvent.BRICK_HIT, brick.rect.x + brick.rect.width // 2,
+						  brick.rect.y + brick.rect.height // 2, ball, brick)
+			# do the collision and bounce the ball
+			if swept:
+				# swept collision stops the ball where it touches the brick, so it doesn't need
+				# to be moved out of it, just bounced off the side it touched
+				self.bounceOffRect(ball, brick.rect)
+				return
+			angle = brick.rect.findAngle(ball.circle)
+			upperLeft, upperRight, bottomLeft, bottomRight = getCornerAngles(brick.rect.width, brick.rect.height)
+			if angle >= upperRight or angle < bottomRight or bottomLeft <= angle < upperLeft:
+				# hit side of brick
+				ball.velocity.dx *= -1
+				if ball.circle.x > brick.rect.x + .5 * brick.rect.width:
+					ball.circle.x = brick.rect.x + brick.rect.width + ball.circle.radius
+				else:
+					ball.circle.x = brick.rect.x - ball.circle.radius
+			else:
+				# hit top of brick
+				ball.velocity.dy *= -1
+				if ball.circle.y > brick.rect.y + brick.rect.height:
+					ball.circle.y = brick.rect.y + brick.rect.height + ball.circle.radius
+				else:
+					ball.circle.y = brick.rect.y - ball.circle.radius
+		else:  # killed a brick, apply power up effects
+			destroyedBricks.append(brick)
+			self.addEvent(GameEvent.BRICK_DESTROYED, brick.rect.x + brick.rect.width // 2,
+						  brick.rect.y + brick.rect.height // 2, ball, brick)
+			if brick.powerUp == 'extraBall':
+				angle = self.state.random.randint(0, 360)
+				xVelocity = math.cos(math.radians(angle)) * GC_BALL_INITIAL_VELOCITY
+				yVelocity = math.sin(math.radians(angle)) * GC_BALL_INITIAL_VELOCITY
+
+				self.state.balls.append(Ball(
+					PosCircle(brick.rect.x + brick.rect.width / 2, brick.rect.y + brick.rect.height / 2,
+							  GC_BALL_RADIUS),
+					Velocity(xVelocity, yVelocity)))
+			if brick.powerUp == 'clearRow':
+				self.removeBricks(self.state.brickGrid.getRow(brick.rect.y))
+
+	@staticmethod
+	def bounceOffRect(ball: Ball, rect: PosRect):
+		# reflect the ball off the side of the rectangle nearest its centre; at a corner, reflect
+		# whichever velocity components are still heading into the rectangle
+		contactX, contactY, normalX, normalY = contactPoint(ball.circle.x, ball.circle.y, rect)
+		if abs(normalX) >= abs(normalY):
+			ball.velocity.dx *= -1
+		else:
+			ball.velocity.dy *= -1
+		if ball.velocity.dx * normalX < 0:
+			ball.velocity.dx *= -1
+		if ball.velocity.dy * normalY < 0:
+			ball.velocity.dy *= -1
+
+	def scoreBricks(self, destroyedBricks: List[Brick]):
+		# add score for dead bricks, unless a clear row power up already removed them
+		deadBricks = [brick for brick in destroyedBricks if self.state.brickGrid.contains(brick)]
+		for brick in deadBricks:
+			self.state.totalBricksDestroyedScore += brick.score
+
+		# remove dead bricks
+		self.removeBricks(deadBricks)
+
+	def removeBricks(self, bricks: List[Brick]):
+		for brick in bricks:
+			self.state.brickGrid.remove(brick)
+
+	def sweepBalls(self, dt: float):
+		# Swept collision: move each ball along its path for dt frames, stopping at every impact
+		# on the way, instead of moving it a whole frame and then checking what it overlaps.
+		self.saveLastPositions()
+		# frames left for each ball; balls added by extra ball power ups only move for the rest of
+		# the step after the brick that made them was hit
+		remainingTimes = {ball: dt for ball in self.state.balls}
+		while True:
+			# balls are swept in list order; lost balls are removed from the list as it goes
+			ball = next((ball for ball in self.state.balls if ball in remainingTimes), None)
+			if ball is None:
+				break
+			destroyedBricks = []
+			remaining = remainingTimes.pop(ball)
+			for j in range(MAX_IMPACTS_PER_FRAME * max(1, math.ceil(remaining))):
+				impactTime, target = self.findImpact(ball, remaining)
+				advanceBall(ball, impactTime)
+				remaining -= impactTime
+				numBalls = len(self.state.balls)
+				if target is None or not self.applyImpact(ball, target, destroyedBricks):
+					break
+				for newBall in self.state.balls[numBalls:]:
+					remainingTimes[newBall] = remaining
+			self.scoreBricks(destroyedBricks)
+
+	def findImpact(self, ball: Ball, maxT: float):
+		# returns (time, target) for the first thing the ball hits within maxT frames, or (maxT, None)
+		# target is a Brick, the Paddle, or 'leftWall', 'rightWall', 'top' or 'bottom'
+		circle, velocity, acceleration = ball.circle, ball.velocity, ball.acceleration
+		impactTime, target = maxT, None
+
+		# the walls and the top and bottom of the world are cheap, and limit how far to look for the rest
+		for line, direction, name in ((GC_WALL_SIZE + circle.radius, -1, 'leftWall'),
+									  (GC_WORLD_WIDTH - GC_WALL_SIZE - circle.radius, 1, 'rightWall')):
+			t = timeToCross(circle.x, velocity.dx, acceleration.ddx, line, direction, impactTime)
+			if t is not None and (target is None or t < impactTime):
+				impactTime, target = t, name
+
+		for line, direction, name in ((circle.radius, -1, 'top'),
+									  (GC_WORLD_HEIGHT - circle.radius, 1, 'bottom')):
+			t = timeToCross(circle.y, velocity.dy, acceleration.ddy, line, direction, impactTime)
+			if t is not None and (target is None or t < impactTime):
+				impactTime, target = t, name
+
+		# look for bricks along the path, about a cell's length of it at a time, until the part
+		# looked at is past the first impact found so far, so a long step (like fastForward())
+		# only tests the bricks near the part of the path it uses; each brick is tested once,
+		# for all of the time that is left
+		# Only the part of the path between the top and bottom of the rows that have bricks is
+		# looked at, so the way between them and the paddle costs nothing.
+		grid = self.state.brickGrid
+		cellSize = min(grid.firstCell.width, grid.firstCell.height)
+		tested = set()
+		rowsRange = grid.getRowsRange()
+		start = None
+		if rowsRange is not None:
+			rowsTop, rowsBottom = rowsRange
+			start = 0
+			if circle.y - circle.radius > rowsBottom:
+				start = timeToReach(circle.y, velocity.dy, acceleration.ddy, rowsBottom + circle.radius, impactTime, -1)
+			elif circle.y + circle.radius < rowsTop:
+				start = timeToReach(circle.y, velocity.dy, acceleration.ddy, rowsTop - circle.radius, impactTime, 1)
+		while start is not None and start < impactTime:
+			speed = math.hypot(velocity.dx + acceleration.ddx * start, velocity.dy + acceleration.ddy * start)
+			end = min(impactTime, start + max(1, cellSize / speed if speed != 0 else impactTime))
+			for brick in grid.queryBox(*pathBounds(ball, end, start)):
+				if brick not in tested:
+					tested.add(brick)
+					if brick.hp != 0:
+						t = timeToHitRect(ball, brick.rect, impactTime)
+						if t is not None and (target is None or t < impactTime):
+							impactTime, target = t, brick
+			start = end
+			if circle.y + (velocity.dy + acceleration.ddy * start / 2) * start - circle.radius > rowsBottom \
+					and velocity.dy + acceleration.ddy * start > 0 and acceleration.ddy >= 0:
+				break  # below the rows and falling: gravity won't bring it back up
+
+		# the paddle last, as a brick hit usually leaves it out of reach
+		t = timeToHitRect(ball, self.paddle.rect, impactTime)
+		if t is not None and (target is None or t < impactTime):
+			impactTime, target = t, self.paddle
+
+		return impactTime, target
+
+	def applyImpact(self, ball: Ball, target, destroyedBricks: List[Brick]) -> bool:
+		# returns False if the ball is no longer in play
+		if target == 'leftWall':
+			self.bounceOffWall(ball, -1)
+		elif target == 'rightWall':
+			self.bounceOffWall(ball, 1)
+		elif target == 'top':
+			if not self.isTopOpen():
+				self.bounceOffTop(ball)
+				return True
+			self.state.won = 1
+			return False
+		elif target == 'bottom':
+			self.loseBall(ball)
+			return False
+		elif target is self.paddle:
+			# where it touches the paddle, which is on the top for a ball that came down onto it
+			contactX, contactY, normalX, normalY = contactPoint(ball.circle.x, ball.circle.y, self.paddle.rect)
+			self.bounceOffPaddle(ball, PosPoint(contactX, contactY))
+			if ball.circle.y < self.paddle.rect.y and ball.velocity.dy > 0:
+				# a side bounce near a corner of the paddle would leave the ball heading into its top
+				ball.velocity.dy *= -1
+		else:
+			self.hitBrick(ball, target, destroyedBricks, True)
+		return True
+
+	def score(self):  # the name of this method is a verb, not a noun
+		if self.state.level == 99:  # main menu screen embedded level has no par time
+			return 0
+		score = GC_PAR_TIME[self.state.level - 1] / self.state.time
+		percentBricksDestroyed = 0
+		if not self.state.totalBrickScore == 0:  # don't divide by zero in case of 'empty' brick generation
+			percentBricksDestroyed = self.state.totalBricksDestroyedScore / self.state.totalBrickScore
+		score *= (1 - percentBricksDestroyed) + 100
+		self.state.score = int(score)
+
+
+def step(state: GameState, action: PaddleAction) -> GameState:
+	# advance a game state by one frame, for bots and headless runs
+	GameSimulation(state).step(action)
+	return state
@@ -1,21 +1,44 @@
 # class that holds the game state
-
-from typing import List
+# Each game state has its own random number generators, seeded when it is made (see
+# LevelTools.makeState()): random for everything the simulation does at random (the angles
+# of new balls), and effectsRandom for the GameController's particles, so a level played
+# with the same seed and the same paddle commands always plays out the same way, whether
+# or not it is drawn (see Replay).
+import random
+from typing import KeysView, List
 
 from GameConstants import GC_PAR_TIME
+from game.BrickGrid import BrickGrid
+from game.ParticleSystem import ParticleSystem
 from game.gameClasses.Ball import Ball
 from game.gameClasses.Brick import Brick
-from game.gameClasses.Displayable import Displayable
+from game.gameClasses.GameEvent import GameEvent
 from game.gameClasses.Paddle import Paddle
 from game.gameClasses.PosPoint import PosPoint
+from game.gameClasses.PosRect import PosRect
+
+# seeds are 32 bits, so effectsRandom's seed is never another state's seed
+EFFECTS_SEED_OFFSET: int = 1 << 32
+
+
+def copyRandom(rng: random.Random) -> random.Random:
+	# made without seeding it (which is slow), since setstate() replaces all of its state
+	copied = random.Random.__new__(random.Random)
+	copied.setstate(rng.getstate())
+	return copied
 
 
 class GameState:
-	bricks: List[Brick]
+	brickGrid: BrickGrid  # the live bricks, indexed by position; kept up to date by GameSimulation
 	paddle: Paddle
 	balls: List[Ball]
 	lastPosBalls: List[PosPoint]
-	displayables: List[Displayable]
+	particles: ParticleSystem  # graphics effects, added and moved by GameController
+	events: List[GameEvent]  # what happened in the last frame, see GameSimulation
+	scrollingLevel: 'ScrollingLevel'  # None unless the level is too tall for the world, see LevelTools
+	seed: int
+	random: random.Random
+	effectsRandom: random.Random
 
 	level: int
 	oldScore: int
@@ -25,8 +48,15 @@ class GameState:
 	time: float
 	parTime: float
 
-	def __init__(self, bricks: List[Brick], ball: Ball, level: int, oldScore: int = 0, numLives: int = 3):
-		self.bricks = bricks
+	def __init__(self, bricks: List[Brick], ball: Ball, level: int, oldScore: int = 0, numLives: int = 3,
+				 firstCell: PosRect = None, seed: int = 0, rng: random.Random = None):
+		# firstCell is the top left cell of the level's brick grid, see LevelTools.getFirstCell()
+		# rng is the generator seeded with seed that the bricks and ball were made with, if they were
+		self.brickGrid = BrickGrid(bricks, firstCell)
+		self.scrollingLevel = None
+		self.seed = seed
+		self.random = rng if rng is not None else random.Random(seed)
+		self.effectsRandom = random.Random(seed + EFFECTS_SEED_OFFSET)
 		self.balls = []
 		self.balls.append(ball)
 		self.lastPosBalls = []
@@ -34,7 +64,8 @@ class GameState:
 		self.oldScore = oldScore
 		self.score = 0
 
-		self.displayables = []
+		self.particles = ParticleSystem()
+		self.events = []
 		self.won = 0
 
 		self.paddle = Paddle()
@@ -48,3 +79,26 @@ class GameState:
 		self.totalBricksDestroyedScore = 0
 
 		self.collidedLastFrame = False
+
+	def clone(self) -> 'GameState':
+		# a copy that can be stepped without changing this one (for lookahead and checkpoints)
+		# Copied field by field, which is much faster than copy.deepcopy(), and without copying
+		# what the simulation never changes: the images and animation frames, the compiled level
+		# of a scrolling level, and the particles and effectsRandom (graphics only, so the copy
+		# shares them). The bricks are shared too, until either state hits one (see BrickGrid.copy()).
+		state = GameState.__new__(GameState)
+		state.__dict__.update(self.__dict__)
+		state.brickGrid = self.brickGrid.copy()
+		if self.scrollingLevel is not None:
+			state.scrollingLevel = self.scrollingLevel.copy(state.brickGrid)
+		state.paddle = self.paddle.copy()
+		state.balls = [ball.copy() for ball in self.balls]
+		state.lastPosBalls = [PosPoint(point.x, point.y) for point in self.lastPosBalls]
+		state.events = []
+		state.random = copyRandom(self.random)
+		return state
+
+	@property
+	def bricks(self) -> KeysView[Brick]:
+		# bricks that haven't been removed, in the order they were made
+		return self.brickGrid.bricks
@@ -1,54 +1,159 @@
 # this class is static, to avoid having to pass around an instance of it everywhere
-
-from shutil import copyfile
+# Every run (a score, with the player's name, the level it was for and the mode it was played
+# in) is kept in an SQLite database, HIGHSCORES_PATH, indexed by mode, level and score, so the
+# top scores of a table are read straight from the index, however many runs the bots have
+# added to the history.
+# Only the top TABLE_SIZE scores of each table are kept in memory, sorted, so isHighScore()
+# and add() are a bisect. add() changes the table right away and queues the run; a writer
+# thread writes whatever is queued in one transaction, so the screens never wait for the disk,
+# and a crash loses at most the runs that weren't written yet (the database is never left
+# half written). flush() waits for the writer, and is called at exit.
+# Other processes (bots) may be writing to the same database: a write waits up to
+# DATABASE_TIMEOUT for them, and is tried WRITE_ATTEMPTS times before its runs are given up on
+# (with a message), so a locked or full database never stops the writer, or flush(), for good.
+# scores and names are the game's own table (whole games, MODE_PLAYER), shown by the highscore
+# screens. The first time, it is filled from highscores.txt, which is what was used before.
+import atexit
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+HIGHSCORES_PATH: str = "highscores.db"
+LEGACY_PATH: str = "highscores.txt"  # the game's table, from before there was a database
+DEFAULT_PATH: str = "highscores_default.txt"  # the same, with no scores, for reset()
+TABLE_SIZE: int = 10
+DATABASE_TIMEOUT: float = 5  # seconds to wait for another connection's write to finish
+WRITE_ATTEMPTS: int = 3
+ALL_LEVELS: int = 0  # level of the score of a whole game
+MODE_PLAYER: str = "player"
+
+
+class HighscoreTable:
+	# the top TABLE_SIZE scores of one level and mode, highest first (equal scores in the order they were made)
+
+	def __init__(self, rows: List[Tuple[int, str]]):
+		self.scores: List[int] = [score for score, name in rows]
+		self.names: List[str] = [name for score, name in rows]
+		self.negatedScores: List[int] = [-score for score in self.scores]  # in increasing order, for bisect
+
+	def isHighScore(self, score: int) -> bool:
+		# where add() would put it: a score equal to the lowest on a full table doesn't get in
+		return bisect_right(self.negatedScores, -score) < TABLE_SIZE
+
+	def add(self, score: int, name: str) -> None:
+		# after the scores equal to it
+		i = bisect_right(self.negatedScores, -score)
+		if i >= TABLE_SIZE:
+			return
+		# changed in place, so Highscores.scores and names stay the game table's lists
+		self.scores.insert(i, score)
+		self.names.insert(i, name)
+		self.negatedScores.insert(i, -score)
+		del self.scores[TABLE_SIZE:], self.names[TABLE_SIZE:], self.negatedScores[TABLE_SIZE:]
 
 
 class Highscores:
-	scores = []
-	names = []
-
-	@staticmethod
-	def load():
-		f = open("highscores.txt", "r")
-		for i in range(10):
-			Highscores.scores.append(int(f.readline().rstrip()))
-		for i in range(10):
-			Highscores.names.append(f.readline().rstrip())
-		f.close()
+	# the database is only opened when the scores are first needed (see load())
+	path: str = HIGHSCORES_PATH
+	scores: List[int] = []
+	names: List[str] = []
+	tables: Dict[Tuple[int, str], HighscoreTable] = {}  # (level, mode) -> table, for the tables used so far
+	connection: sqlite3.Connection = None  # for reading tables, on the main thread
+	pending: queue.Queue = queue.Queue()  # runs waiting to be written, as (time, name, score, level, mode)
+	writer: threading.Thread = None
 
 	@staticmethod
-	def isHighScore(score: int):
-		# will this score appear on the highscores list?
-		return score > Highscores.scores[9]
+	def connect() -> sqlite3.Connection:
+		connection = sqlite3.connect(Highscores.path, timeout=DATABASE_TIMEOUT)
+		# write-ahead log: the table can be read while runs are being written, and a write is
+		# never half done
+		connection.execute("PRAGMA journal_mode = WAL")
+		connection.execute("PRAGMA synchronous = NORMAL")
+		return connection
 
 	@staticmethod
-	def add(score: int, name: str):
-		###   SCORE   #########################################################
-		if score < Highscores.scores[9]:
-			# not a highscore
+	def load():
+		# call before using scores or names; opens the database the first time it is called
+		if Highscores.connection is not None:
 			return
+		connection = Highscores.connection = Highscores.connect()
+		if connection.execute("PRAGMA user_version").fetchone()[0] == 0:
+			with connection:
+				connection.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, time REAL, name TEXT, "
+								   "score INTEGER, level INTEGER, mode TEXT)")
+				connection.execute("CREATE INDEX IF NOT EXISTS runsByScore ON runs (mode, level, score DESC, id)")
+				Highscores.importTable(LEGACY_PATH)
+				connection.execute("PRAGMA user_version = 1")
+		table = Highscores.getTable()
+		Highscores.scores = table.scores
+		Highscores.names = table.names
 
-		# highscore goes into the list, but not at the beginning
-		firstIndexGreaterThan = None
-		for i in range(10):
-			if score > Highscores.scores[i]:
-				firstIndexGreaterThan = i
-				break
-
-		beginningPortion = Highscores.scores[0:firstIndexGreaterThan]
-		endPortion = Highscores.scores[firstIndexGreaterThan:-1]
-
-		newList = beginningPortion + [score] + endPortion
+	@staticmethod
+	def importTable(path: str):
+		# adds the game's table from a file in the old format: TABLE_SIZE scores, then their names
+		with open(path, "r") as f:
+			lines = [line.rstrip() for line in f]
+		rows = [(0, lines[TABLE_SIZE + i], int(lines[i]), ALL_LEVELS, MODE_PLAYER) for i in range(TABLE_SIZE)]
+		Highscores.connection.executemany("INSERT INTO runs (time, name, score, level, mode) VALUES (?, ?, ?, ?, ?)",
+										  rows)
 
-		Highscores.scores = newList
+	@staticmethod
+	def getTable(level: int = ALL_LEVELS, mode: str = MODE_PLAYER) -> HighscoreTable:
+		table = Highscores.tables.get((level, mode))
+		if table is None:
+			Highscores.load()  # which reads the game's table, if the database wasn't open yet
+			table = Highscores.tables.get((level, mode))
+		if table is None:
+			rows = Highscores.connection.execute(
+				"SELECT score, name FROM runs WHERE mode = ? AND level = ? ORDER BY score DESC, id LIMIT ?",
+				(mode, level, TABLE_SIZE)).fetchall()
+			table = Highscores.tables[(level, mode)] = HighscoreTable(rows)
+		return table
 
-		###   NAME   ##########################################################
-		beginningPortion = Highscores.names[0:firstIndexGreaterThan]
-		endPortion = Highscores.names[firstIndexGreaterThan:-1]
+	@staticmethod
+	def isHighScore(score: int, level: int = ALL_LEVELS, mode: str = MODE_PLAYER):
+		# will this score appear on the highscores list?
+		return Highscores.getTable(level, mode).isHighScore(score)
 
-		newList = beginningPortion + [name] + endPortion
+	@staticmethod
+	def add(score: int, name: str, level: int = ALL_LEVELS, mode: str = MODE_PLAYER):
+		# adds a run to the history, and to its table if it is a highscore
+		Highscores.getTable(level, mode).add(score, name)
+		if Highscores.writer is None:
+			Highscores.writer = threading.Thread(target=Highscores.write, name="highscores", daemon=True)
+			Highscores.writer.start()
+			atexit.register(Highscores.flush)
+		Highscores.pending.put((time.time(), name, score, level, mode))
 
-		Highscores.names = newList
+	@staticmethod
+	def write():
+		# the writer thread: writes everything that is queued, in one transaction, whenever there is something
+		connection = Highscores.connect()
+		while True:
+			runs = [Highscores.pending.get()]
+			try:
+				while True:
+					runs.append(Highscores.pending.get_nowait())
+			except queue.Empty:
+				pass
+			try:
+				for attempt in range(WRITE_ATTEMPTS):
+					try:
+						with connection:
+							connection.executemany(
+								"INSERT INTO runs (time, name, score, level, mode) VALUES (?, ?, ?, ?, ?)", runs)
+						break
+					except sqlite3.Error as error:
+						if attempt == WRITE_ATTEMPTS - 1:
+							print("highscores: couldn't save {0} runs: {1}".format(len(runs), error), file=sys.stderr)
+			finally:
+				# even if they weren't written, so flush() doesn't wait for them forever
+				for i in range(len(runs)):
+					Highscores.pending.task_done()
 
 	@staticmethod
 	def printScores():
@@ -58,15 +163,18 @@ class Highscores:
 
 	@staticmethod
 	def flush():
-		# commits changes to highscore list into the highscores file
-		open("highscores.txt", "w").close()  # clears the existing highscores file
-		f = open("highscores.txt", "w")
-		for i in Highscores.scores:
-			f.write(str(i) + '\n')
-		for i in Highscores.names:
-			f.write(i + '\n')
-		f.close()
+		# waits until every run added so far is in the database (or was given up on, see write())
+		Highscores.pending.join()
 
 	@staticmethod
 	def reset():
-		copyfile("highscores_default.txt", "highscores.txt")
+		# forgets every run, and sets the game's table back to the default one
+		Highscores.load()
+		Highscores.flush()
+		with Highscores.connection:
+			Highscores.connection.execute("DELETE FROM runs")
+			Highscores.importTable(DEFAULT_PATH)
+		Highscores.tables.clear()
+		table = Highscores.getTable()
+		Highscores.scores = table.scores
+		Highscores.names = table.names
@@ -1,10 +1,28 @@
+# makes the game state for a level
+# Level files (assets/levels/levelN.txt) are a grid of characters, one per brick: 0 for no
+# brick, 1-3 for a brick with that much HP, 4 for a boss brick, or a letter for a power up
+# brick (see LEVEL_CHARACTERS). The grid ends at the first blank line (anything after it is
+# a comment), and can be any size, as long as every line is as long as the first. The usual
+# levels are GC_BRICK_LAYERS x GC_BRICK_COLUMNS; larger grids are shrunk to fit the same
+# area (see getFirstCell()), except that levels taller than that scroll (see ScrollingLevel).
+# Each file is compiled the first time its level is made, into a CompiledLevel, which is
+# kept in levels, so a level file is only read and checked once. Large levels are mostly
+# empty, so a CompiledLevel only has the cells with a brick in them.
+# The next level's GameState is made in the background while the current one is played
+# (see preloadState()), so makeState() usually only has to take it.
+# Everything a level is made with at random comes from its GameState's own generator, seeded
+# with the state's seed, so making a level again with the same seed makes the same state.
 import math
 import random
-from typing import List
+import re
+from array import array
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
 from GameConstants import GC_BALL_INITIAL_ANGLE_VARIATION, GC_BALL_INITIAL_VELOCITY, GC_BALL_RADIUS, \
 	GC_BRICK_BOTTOM_HEIGHT, GC_BRICK_COLUMNS, GC_BRICK_GEN_MODE, GC_BRICK_HEIGHT, GC_BRICK_LAYERS, GC_BRICK_TOP_HEIGHT, \
-	GC_BRICK_WIDTH, GC_PADDLE_TOP_HEIGHT, GC_WALL_SIZE, GC_WORLD_WIDTH
+	GC_BRICK_WIDTH, GC_PADDLE_TOP_HEIGHT, GC_PRELOAD_LEVELS, GC_SCROLLING_LEVELS, GC_WALL_SIZE, GC_WORLD_WIDTH
 from game.GameState import GameState
 from game.gameClasses.Ball import Ball
 from game.gameClasses.Brick import Brick
@@ -12,15 +30,114 @@ from game.gameClasses.PosCircle import PosCircle
 from game.gameClasses.PosRect import PosRect
 from game.gameClasses.Velocity import Velocity
 
+# power ups, by their code in CompiledLevel.powerUps
+POWERUPS: List[str] = ['', 'extraBall', 'clearRow']
+# level file character -> (HP, power up code); HP is as in the file, 4 is a boss brick
+LEVEL_CHARACTERS: Dict[str, Tuple[int, int]] = {'1': (1, 0), '2': (2, 0), '3': (3, 0), '4': (4, 0),
+												'A': (2, 1), 'C': (2, 2)}
+BRICK_CHARACTER: re.Pattern = re.compile("[^0]")
 
-def makeBricks(level: int) -> List[Brick]:
+
+class CompiledLevel:
+	def __init__(self, rows: int, columns: int, cells: array, hp: bytes, powerUps: bytes):
+		self.rows: int = rows
+		self.columns: int = columns
+		# the bricks, row by row: cell (row * columns + column), HP and power up code of each
+		self.cells: array = cells
+		self.hp: bytes = hp
+		self.powerUps: bytes = powerUps
+
+
+levels: Dict[int, CompiledLevel] = {}  # level -> its compiled level file
+preloaded: Dict[int, Future] = {}  # level -> GameState being made by preloadState()
+preloadPool: ThreadPoolExecutor = None
+
+
+def compileLevel(level: int) -> CompiledLevel:
+	path = "assets/levels/level" + str(level) + ".txt"
+	with open(path) as f:
+		lines = f.read().splitlines()
+	if "" in lines:
+		lines = lines[:lines.index("")]
+	if not lines:
+		raise ValueError(path + ": no bricks")
+	columns = len(lines[0])
+	cells = array('L')
+	hp = bytearray()
+	powerUps = bytearray()
+	for i, line in enumerate(lines):
+		if len(line) != columns:
+			raise ValueError("{0}, line {1}: {2} bricks, should be {3}".format(path, i + 1, len(line), columns))
+		for match in BRICK_CHARACTER.finditer(line):
+			brick = LEVEL_CHARACTERS.get(match.group())
+			if brick is None:
+				raise ValueError("{0}, line {1}: unknown brick {2!r}".format(path, i + 1, match.group()))
+			cells.append(i * columns + match.start())
+			hp.append(brick[0])
+			powerUps.append(brick[1])
+	return CompiledLevel(len(lines), columns, cells, bytes(hp), bytes(powerUps))
+
+
+def getLevel(level: int) -> CompiledLevel:
+	compiled = levels.get(level)
+	if compiled is None:
+		compiled = levels[level] = compileLevel(level)
+	return compiled
+
+
+def isScrolling(level: int) -> bool:
+	# whether the level is taller than the usual area (once its bricks are narrow enough for its columns)
+	if not GC_SCROLLING_LEVELS or GC_BRICK_GEN_MODE != "manual":
+		return False
+	compiled = getLevel(level)
+	height = max(1, int(GC_BRICK_HEIGHT * min(1, GC_BRICK_COLUMNS / compiled.columns)))
+	return compiled.rows * height > GC_BRICK_BOTTOM_HEIGHT - GC_BRICK_TOP_HEIGHT
+
+
+def getFirstCell(level: int) -> PosRect:
+	# the top left cell of the level's brick grid (the other cells are next to it)
+	# A grid that doesn't fit in the usual area (GC_BRICK_LAYERS x GC_BRICK_COLUMNS bricks) has
+	# its bricks shrunk until it does, keeping their shape, and is centered if that leaves room.
+	# A scrolling level's bricks are only shrunk to fit its columns, and it starts with its last
+	# row at the bottom of the usual area (the rest is above the world, and scrolls down into it).
+	if GC_BRICK_GEN_MODE != "manual":
+		return PosRect(GC_WALL_SIZE, GC_BRICK_TOP_HEIGHT, GC_BRICK_WIDTH, GC_BRICK_HEIGHT)
+	compiled = getLevel(level)
+	scrolling = isScrolling(level)
+	scale = min(1, GC_BRICK_COLUMNS / compiled.columns)
+	if not scrolling:
+		scale = min(scale, GC_BRICK_LAYERS / compiled.rows)
+	width = max(1, int(GC_BRICK_WIDTH * scale))
+	height = max(1, int(GC_BRICK_HEIGHT * scale))
+	x = GC_WALL_SIZE + max(0, GC_BRICK_COLUMNS * GC_BRICK_WIDTH - compiled.columns * width) // 2
+	y = GC_BRICK_BOTTOM_HEIGHT - compiled.rows * height if scrolling else GC_BRICK_TOP_HEIGHT
+	return PosRect(x, y, width, height)
+
+
+def makeBricksInRows(compiled: CompiledLevel, firstCell: PosRect, firstRow: int, endRow: int) -> List[Brick]:
+	# the bricks in rows firstRow to endRow - 1 of a compiled level, on the lattice starting at firstCell
+	bricks = []
+	begin = bisect_left(compiled.cells, firstRow * compiled.columns)
+	end = bisect_left(compiled.cells, endRow * compiled.columns)
+	for index in range(begin, end):
+		i, j = divmod(compiled.cells[index], compiled.columns)
+		brickX = j * firstCell.width + firstCell.x
+		brickY = i * firstCell.height + firstCell.y
+		hp = compiled.hp[index]
+		if hp == 4: hp = -1  # convert invincible brick from 4 (in file) to -1 (in code)
+		bricks.append(Brick(PosRect(brickX, brickY, firstCell.width, firstCell.height), hp,
+							POWERUPS[compiled.powerUps[index]]))
+	return bricks
+
+
+def makeBricks(level: int, rng: random.Random) -> List[Brick]:
 	bricks = []
 
 	if GC_BRICK_GEN_MODE == "random":
 		maxHP = 1
 		for i in range(33):
-			brickX = random.randint(GC_WALL_SIZE, GC_WORLD_WIDTH - GC_WALL_SIZE - GC_BRICK_WIDTH)
-			brickY = random.randint(GC_BRICK_TOP_HEIGHT,
+			brickX = rng.randint(GC_WALL_SIZE, GC_WORLD_WIDTH - GC_WALL_SIZE - GC_BRICK_WIDTH)
+			brickY = rng.randint(GC_BRICK_TOP_HEIGHT,
 									GC_BRICK_BOTTOM_HEIGHT - GC_BRICK_HEIGHT)  # top-down coordinates
 			bricks.append(Brick(PosRect(brickX, brickY, GC_BRICK_WIDTH, GC_BRICK_HEIGHT), maxHP, ''))
 			maxHP += 1
@@ -34,40 +151,25 @@ def makeBricks(level: int) -> List[Brick]:
 			for j in range(GC_BRICK_LAYERS):
 				brickX = i * GC_BRICK_WIDTH + GC_WALL_SIZE
 				brickY = j * GC_BRICK_HEIGHT + GC_BRICK_TOP_HEIGHT
-				brickHP = random.randint(1, 4)
+				brickHP = rng.randint(1, 4)
 				if brickHP == 4:
 					brickHP = -1
 				bricks.append(Brick(PosRect(brickX, brickY, GC_BRICK_WIDTH, GC_BRICK_HEIGHT), brickHP, ''))
 
 	if GC_BRICK_GEN_MODE == "manual":
-		f = open("assets/levels/level" + str(level) + ".txt")
-		for i in range(GC_BRICK_LAYERS):
-			line = f.readline()
-			for j in range(GC_BRICK_COLUMNS):
-				character = line[j:j + 1]
-				brickX = j * GC_BRICK_WIDTH + GC_WALL_SIZE
-				brickY = i * GC_BRICK_HEIGHT + GC_BRICK_TOP_HEIGHT
-				if character.isupper():
-					if character == 'A':
-						bricks.append(Brick(PosRect(brickX, brickY, GC_BRICK_WIDTH, GC_BRICK_HEIGHT), 2, 'extraBall'))
-					if character == 'C':
-						bricks.append(Brick(PosRect(brickX, brickY, GC_BRICK_WIDTH, GC_BRICK_HEIGHT), 2, 'clearRow'))
-				else:
-					brickHP = int(character)
-					if brickHP != 0:  # if shouldn't be empty, add a brick
-						if brickHP == 4: brickHP = -1  # convert invincible brick from 4 (in file) to -1 (in code)
-						bricks.append(Brick(PosRect(brickX, brickY, GC_BRICK_WIDTH, GC_BRICK_HEIGHT), brickHP, ''))
+		compiled = getLevel(level)
+		bricks = makeBricksInRows(compiled, getFirstCell(level), 0, compiled.rows)
 
 	return bricks
 
 
-def makeBall() -> Ball:
+def makeBall(rng: random.Random) -> Ball:
 	# posY = random.randint(GC_BRICK_BOTTOM_HEIGHT + 50, GC_PADDLE_TOP_HEIGHT - 50)
 	ballCircle = PosCircle(GC_WORLD_WIDTH / 2, GC_PADDLE_TOP_HEIGHT - 150, GC_BALL_RADIUS)
 	# generate its velocity (magnitude and angle) randomly
 	initialVelocityMagnitude = GC_BALL_INITIAL_VELOCITY
-	initialVelocityAngle = random.randint(90 - GC_BALL_INITIAL_ANGLE_VARIATION,
-										  90 + GC_BALL_INITIAL_ANGLE_VARIATION)
+	initialVelocityAngle = rng.randint(90 - GC_BALL_INITIAL_ANGLE_VARIATION,
+									   90 + GC_BALL_INITIAL_ANGLE_VARIATION)
 	dx = math.cos(math.radians(initialVelocityAngle)) * initialVelocityMagnitude
 	dy = math.sin(math.radians(initialVelocityAngle)) * initialVelocityMagnitude
 	ballVelocity = Velocity(dx, dy)
@@ -76,5 +178,42 @@ def makeBall() -> Ball:
 	return ball
 
 
-def makeState(level: int, oldScore: int, numLives: int) -> GameState:
-	return GameState(makeBricks(level), makeBall(), level, oldScore, numLives)
+def newSeed() -> int:
+	# a seed for a new game state (from the random module, so seeding it still makes games repeat)
+	return random.getrandbits(32)
+
+
+def newState(level: int, seed: int, oldScore: int = 0, numLives: int = 3) -> GameState:
+	rng = random.Random(seed)
+	if isScrolling(level):
+		# only the rows in the world are made into bricks, by the ScrollingLevel
+		from game.ScrollingLevel import ScrollingLevel
+		state = GameState([], makeBall(rng), level, oldScore, numLives, getFirstCell(level), seed, rng)
+		state.scrollingLevel = ScrollingLevel.start(getLevel(level), state)
+		return state
+	bricks = makeBricks(level, rng)
+	return GameState(bricks, makeBall(rng), level, oldScore, numLives, getFirstCell(level), seed, rng)
+
+
+def makeState(level: int, oldScore: int, numLives: int, seed: int = None) -> GameState:
+	# seed is for making a level again (see Replay); a new game gets a new one
+	future = preloaded.pop(level, None)
+	if future is not None:
+		state = future.result()
+		if seed is None or seed == state.seed:
+			state.oldScore = oldScore
+			state.numLives = numLives
+			return state
+	return newState(level, newSeed() if seed is None else seed, oldScore, numLives)
+
+
+def preloadState(level: int) -> None:
+	# start making a GameState for this level, for the next makeState(level, ...) to take
+	# The seed is picked now, so the other thread never uses random (which would make the seeds
+	# the game gets depend on when that thread runs).
+	global preloadPool
+	if not GC_PRELOAD_LEVELS or GC_BRICK_GEN_MODE != "manual" or level in preloaded:
+		return
+	if preloadPool is None:
+		preloadPool = ThreadPoolExecutor(1)
+	preloaded[level] = preloadPool.submit(newState, level, newSeed())
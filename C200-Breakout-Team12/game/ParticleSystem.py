@@ -0,0 +1,103 @@
+# particles: the short-lived animations that have no effect on the game (brick dust and
+# fragments, wall bounces, lost ball explosions)
+# These used to be Displayable objects, each with its own PosPoint, Velocity, Acceleration and
+# Rotator, that were moved one at a time and filtered out of a list every frame. A brick
+# breaking can add up to GC_NUM_BRICK_FRAGMENTS[1] of them at once, so now all particles are
+# stored in NumPy arrays (one slot per particle) and moved in one pass. Slots of particles
+# that have expired are reused by new ones, and the arrays only grow if more particles are
+# alive at once than ever before.
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from pygame import Surface
+
+from GameConstants import GC_FRAME_TIME_SECONDS
+from game.gameClasses.Animation import Animation
+
+INITIAL_CAPACITY: int = 64
+
+
+class ParticleSystem:
+	def __init__(self, capacity: int = INITIAL_CAPACITY):
+		self.capacity: int = 0
+		# position, velocity and acceleration
+		self.x = self.y = self.dx = self.dy = self.ddx = self.ddy = np.zeros(0)
+		# rotation: angle = a + da * t + dda * t^2, where t is the time (in seconds) of the frame drawn
+		self.a = self.da = self.dda = np.zeros(0)
+		self.beginFrame = self.endFrame = np.zeros(0, dtype=np.int64)
+		self.alive = np.zeros(0, dtype=bool)
+		self.expired = np.zeros(0, dtype=bool)  # scratch space for update(), so it doesn't allocate
+		self.animations: List[Animation] = []
+		self.freeSlots: List[int] = []
+		self.grow(capacity)
+
+	def grow(self, capacity: int) -> None:
+		def resize(array: np.ndarray) -> np.ndarray:
+			resized = np.zeros(capacity, dtype=array.dtype)
+			resized[:self.capacity] = array
+			return resized
+
+		self.x, self.y = resize(self.x), resize(self.y)
+		self.dx, self.dy = resize(self.dx), resize(self.dy)
+		self.ddx, self.ddy = resize(self.ddx), resize(self.ddy)
+		self.a, self.da, self.dda = resize(self.a), resize(self.da), resize(self.dda)
+		self.beginFrame, self.endFrame = resize(self.beginFrame), resize(self.endFrame)
+		self.alive = resize(self.alive)
+		self.expired = resize(self.expired)
+		self.animations += [None] * (capacity - self.capacity)
+		# hand out low slots first
+		self.freeSlots = list(range(capacity - 1, self.capacity - 1, -1)) + self.freeSlots
+		self.capacity = capacity
+
+	def __len__(self) -> int:
+		return self.capacity - len(self.freeSlots)
+
+	def spawn(self, x: float, y: float, dx: float, dy: float, ddx: float, ddy: float, anim: Animation,
+			  beginFrame: int, a: float = 0, da: float = 0, dda: float = 0, lifespan: int = -1) -> None:
+		# lifespan is in frames; by default, the particle lasts until its animation has played once
+		if not self.freeSlots:
+			self.grow(self.capacity * 2)
+		slot = self.freeSlots.pop()
+		self.x[slot], self.y[slot] = x, y
+		self.dx[slot], self.dy[slot] = dx, dy
+		self.ddx[slot], self.ddy[slot] = ddx, ddy
+		self.a[slot], self.da[slot], self.dda[slot] = a, da, dda
+		self.beginFrame[slot] = beginFrame
+		self.endFrame[slot] = beginFrame + (lifespan if lifespan != -1 else anim.frameTime * len(anim.images))
+		self.alive[slot] = True
+		self.animations[slot] = anim
+
+	def update(self, frame: int) -> None:
+		# move every particle one frame (velocity before position, like the old Displayables),
+		# then free the slots of the ones that are past their lifespan
+		if len(self) == 0:
+			return
+		self.dx += self.ddx
+		self.dy += self.ddy
+		self.x += self.dx
+		self.y += self.dy
+		np.greater_equal(frame, self.endFrame, out=self.expired)
+		self.expired &= self.alive
+		if self.expired.any():
+			expired = np.flatnonzero(self.expired)
+			self.alive[expired] = False
+			for slot in expired.tolist():
+				self.animations[slot] = None
+			self.freeSlots += expired.tolist()
+
+	def getSprites(self, frame: int, alpha: float = 1) -> Iterator[Tuple[Surface, float, float, float]]:
+		# (image, x, y, angle) of each live particle, for the renderer
+		# positions are interpolated alpha of the way from the last update: particles moved by
+		# their velocity in it, so they were at (x - dx, y - dy) before it
+		slots = np.flatnonzero(self.alive)
+		if len(slots) == 0:
+			return
+		xs = (self.x[slots] - self.dx[slots] * (1 - alpha)).tolist()
+		ys = (self.y[slots] - self.dy[slots] * (1 - alpha)).tolist()
+		time = GC_FRAME_TIME_SECONDS * frame
+		angles = (self.a[slots] + self.da[slots] * time + self.dda[slots] * time * time).tolist()
+		ages = (frame - self.beginFrame[slots]).tolist()
+		for i, slot in enumerate(slots.tolist()):
+			anim = self.animations[slot]
+			image = anim.images[(ages[i] % (len(anim.images) * anim.frameTime)) // anim.frameTime]
+			yield image, xs[i], ys[i], angles[i]
@@ -0,0 +1,201 @@
+# a recording of one level's game, that can be played back exactly
+# A level's GameState is made from its level, seed, oldScore and numLives (see
+# LevelTools.newState()), and after that the simulation only changes it with the paddle commands
+# it is given each frame (its random numbers come from the state's own generator), so those are
+# all that is recorded. Playing the commands back into a state made the same way plays the same
+# game, frame for frame, so a replay can be used to check a score, or to time the simulation on
+# real games (see Benchmarks).
+# Each frame's PaddleAction is stored as one byte (moveDir, begin, and whether it has a targetX),
+# followed by targetX as a double if it has one (the mouse moved). While recording, a snapshot of
+# the state (see Snapshot) is also kept every GC_REPLAY_KEYFRAME_INTERVAL frames, as a keyframe.
+# The file is HEADER, then the commands, zlib compressed, which makes the long runs of identical
+# frames almost free, then the keyframes, each a KEYFRAME and the snapshot, zlib compressed too.
+# ReplayPlayer plays a replay back without graphics, as fast as the CPU allows, and seeks to any
+# frame by restoring the keyframe before it and playing forward from there. It adds a keyframe
+# every GC_REPLAY_KEYFRAME_INTERVAL frames it plays, for replays saved without them.
+# To play back replays and check their scores:
+#   python -m game.Replay replays/*.replay
+import os
+import struct
+import sys
+import time
+import zlib
+from bisect import bisect_right, insort
+from typing import Dict, List
+
+from GameConstants import *
+from game.GameSimulation import GameSimulation
+from game.GameState import GameState
+from game.LevelTools import newState
+from game.Snapshot import restoreSnapshot, takeSnapshot
+from game.gameClasses.PaddleAction import PaddleAction
+
+REPLAY_MAGIC: bytes = b"BRKR"
+REPLAY_VERSION: int = 2  # version 1 had no keyframes, and can still be loaded
+# magic, version, level, seed, oldScore, numLives, number of frames, and the recorded score and won
+HEADER: struct.Struct = struct.Struct("<4sHiIiiIib")
+TARGET: struct.Struct = struct.Struct("<d")
+# frame and size of a keyframe's snapshot
+KEYFRAME: struct.Struct = struct.Struct("<II")
+# a command's byte: moveDir + 1 in the low two bits, then these
+BEGIN_FLAG: int = 4
+TARGET_FLAG: int = 8
+
+
+class Replay:
+
+	def __init__(self, level: int, seed: int, oldScore: int, numLives: int):
+		self.level: int = level
+		self.seed: int = seed
+		self.oldScore: int = oldScore
+		self.numLives: int = numLives
+		self.commands: bytearray = bytearray()
+		self.numFrames: int = 0
+		self.keyframes: Dict[int, bytes] = {}  # frame -> snapshot of the state at that frame
+		# how the game ended, set by finish()
+		self.score: int = 0
+		self.won: int = 0
+
+	@staticmethod
+	def forState(state: GameState) -> 'Replay':
+		# an empty replay, for recording a state that hasn't been stepped yet
+		return Replay(state.level, state.seed, state.oldScore, state.numLives)
+
+	def record(self, action: PaddleAction, state: GameState = None) -> None:
+		# add the next frame's command; state is the state it is about to be given to, for the keyframes
+		if state is not None and self.numFrames % GC_REPLAY_KEYFRAME_INTERVAL == 0 and self.numFrames > 0:
+			self.keyframes[self.numFrames] = takeSnapshot(state)
+		flags = (action.moveDir + 1) | (BEGIN_FLAG if action.begin else 0)
+		if action.targetX is None:
+			self.commands.append(flags)
+		else:
+			self.commands.append(flags | TARGET_FLAG)
+			self.commands += TARGET.pack(action.targetX)
+		self.numFrames += 1
+
+	def finish(self, state: GameState) -> None:
+		self.score = state.score
+		self.won = state.won
+
+	def getActions(self) -> List[PaddleAction]:
+		# the commands, one PaddleAction per frame (commands without a targetX share theirs)
+		shared = [PaddleAction((flags & 3) - 1, None, bool(flags & BEGIN_FLAG)) for flags in range(8)]
+		actions = []
+		commands = self.commands
+		i = 0
+		while i < len(commands):
+			flags = commands[i]
+			i += 1
+			if flags & TARGET_FLAG:
+				actions.append(PaddleAction((flags & 3) - 1, TARGET.unpack_from(commands, i)[0], bool(flags & BEGIN_FLAG)))
+				i += TARGET.size
+			else:
+				actions.append(shared[flags])
+		return actions
+
+	def makeState(self) -> GameState:
+		# the state the replay was recorded from, before its first frame
+		return newState(self.level, self.seed, self.oldScore, self.numLives)
+
+	def save(self, path: str) -> None:
+		# written to a temporary file first, so a replay is never half written
+		with open(path + ".tmp", "wb") as f:
+			f.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.level, self.seed, self.oldScore, self.numLives,
+								self.numFrames, self.score, self.won))
+			f.write(zlib.compress(self.commands))
+			f.write(zlib.compress(b"".join(KEYFRAME.pack(frame, len(snapshot)) + snapshot
+										   for frame, snapshot in sorted(self.keyframes.items()))))
+		os.replace(path + ".tmp", path)
+
+	def saveToDirectory(self, directory: str = GC_REPLAY_DIRECTORY, maxReplays: int = GC_MAX_REPLAYS) -> str:
+		# saves the replay with a name from the time and level, and deletes the oldest replays
+		# if there are more than maxReplays; returns its path
+		os.makedirs(directory, exist_ok=True)
+		path = os.path.join(directory, "{0}-level{1}.replay".format(time.strftime("%Y%m%d-%H%M%S"), self.level))
+		self.save(path)
+		# the names sort in the order the replays were saved
+		replayNames = sorted(name for name in os.listdir(directory) if name.endswith(".replay"))
+		for name in replayNames[:max(0, len(replayNames) - maxReplays)]:
+			os.remove(os.path.join(directory, name))
+		return path
+
+	@staticmethod
+	def load(path: str) -> 'Replay':
+		with open(path, "rb") as f:
+			data = f.read()
+		magic, version, level, seed, oldScore, numLives, numFrames, score, won = HEADER.unpack_from(data)
+		if magic != REPLAY_MAGIC or version not in (1, REPLAY_VERSION):
+			raise ValueError(path + ": not a replay, or from another version of the game")
+		replay = Replay(level, seed, oldScore, numLives)
+		decompressor = zlib.decompressobj()
+		replay.commands = bytearray(decompressor.decompress(data[HEADER.size:]))
+		if version >= 2:
+			keyframes = zlib.decompress(decompressor.unused_data)
+			i = 0
+			while i < len(keyframes):
+				frame, size = KEYFRAME.unpack_from(keyframes, i)
+				i += KEYFRAME.size
+				replay.keyframes[frame] = keyframes[i:i + size]
+				i += size
+		replay.numFrames = numFrames
+		replay.score = score
+		replay.won = won
+		return replay
+
+
+class ReplayPlayer:
+
+	def __init__(self, replay: Replay, keyframeInterval: int = GC_REPLAY_KEYFRAME_INTERVAL):
+		self.replay: Replay = replay
+		self.actions: List[PaddleAction] = replay.getActions()
+		self.keyframeInterval: int = keyframeInterval
+		self.state: GameState = replay.makeState()
+		self.simulation: GameSimulation = GameSimulation(self.state)
+		self.frame: int = 0  # frames played since the beginning
+		# frame -> snapshot of the state at that frame: the replay's, and the ones made while playing
+		self.keyframes: Dict[int, bytes] = {0: takeSnapshot(self.state)}
+		self.keyframes.update(replay.keyframes)
+		self.keyframeFrames: List[int] = sorted(self.keyframes)  # for finding the one before a frame
+
+	def play(self, endFrame: int = None) -> GameState:
+		# play up to endFrame (or to the end of the replay)
+		endFrame = len(self.actions) if endFrame is None else min(endFrame, len(self.actions))
+		step = self.simulation.step
+		while self.frame < endFrame:
+			nextKeyframe = (self.frame // self.keyframeInterval + 1) * self.keyframeInterval
+			for action in self.actions[self.frame:min(endFrame, nextKeyframe)]:
+				step(action)
+			self.frame = min(endFrame, nextKeyframe)
+			if self.frame == nextKeyframe and self.frame not in self.keyframes:
+				self.keyframes[self.frame] = takeSnapshot(self.state)
+				insort(self.keyframeFrames, self.frame)
+		return self.state
+
+	def seek(self, frame: int) -> GameState:
+		# the state at this frame, from the keyframe before it if it is behind the current frame
+		# (or far enough ahead that the keyframe is nearer)
+		frame = max(0, min(frame, len(self.actions)))
+		keyframe = self.keyframeFrames[bisect_right(self.keyframeFrames, frame) - 1]
+		if not keyframe <= self.frame <= frame:
+			self.state = restoreSnapshot(self.keyframes[keyframe])
+			self.simulation = GameSimulation(self.state)
+			self.frame = keyframe
+		return self.play(frame)
+
+	def verify(self) -> bool:
+		# play to the end, and check that the game ended the way it did when it was recorded
+		state = self.play()
+		return state.score == self.replay.score and state.won == self.replay.won
+
+
+if __name__ == "__main__":
+	# play back the replays given, as fast as possible, and check their scores
+	for replayPath in sys.argv[1:]:
+		loadedReplay = Replay.load(replayPath)
+		player = ReplayPlayer(loadedReplay)
+		beginTime = time.perf_counter()
+		verified = player.verify()
+		seconds = time.perf_counter() - beginTime
+		print("{0}: level {1}, {2} frames in {3:.3f} s ({4:.0f} frames/s), score {5}, {6}".format(
+			replayPath, loadedReplay.level, loadedReplay.numFrames, seconds, loadedReplay.numFrames / seconds,
+			player.state.score, "same as recorded" if verified else "recorded {0}".format(loadedReplay.score)))
@@ -0,0 +1,83 @@
+# a level too tall for the world, that scrolls down as it is cleared
+# The level starts with its last row at the bottom of the usual brick area (GC_BRICK_BOTTOM_HEIGHT)
+# and the rest of it above the world. Whenever the lowest row that still has a brick that can be
+# broken is above the bottom of the area, the whole brick grid moves down (GC_SCROLL_SPEED pixels
+# per frame) until it is there again, so the bricks that are left follow the play down.
+# Only the rows that are in the world, above the bottom of the area, are bricks: rows are made
+# from the CompiledLevel as they scroll in at the top, and released as they scroll out at the
+# bottom (only boss bricks are ever left there), so the number of Bricks, BrickGrid cells and
+# Compositor bands, and the time they take per frame, is the same however tall the level is.
+# Until the first row has scrolled in, the top of the world is a wall, instead of the way out.
+import math
+
+from GameConstants import *
+from game.BrickGrid import BrickGrid
+from game.GameState import GameState
+from game.LevelTools import CompiledLevel, makeBricksInRows
+
+
+class ScrollingLevel:
+	def __init__(self, compiled: CompiledLevel, grid: BrickGrid, firstRow: int, endRow: int, scrollLeft: float = 0):
+		self.compiled: CompiledLevel = compiled
+		self.grid: BrickGrid = grid
+		# the rows that are bricks now; rows are only added above and released below
+		self.firstRow: int = firstRow
+		self.endRow: int = endRow
+		self.scrollLeft: float = scrollLeft  # part of a pixel left to scroll, from steps of part of a frame
+
+	@staticmethod
+	def start(compiled: CompiledLevel, state: GameState) -> 'ScrollingLevel':
+		# the level at its beginning, in a state with no bricks yet
+		level = ScrollingLevel(compiled, state.brickGrid, compiled.rows, compiled.rows)
+		level.loadRows()
+		# the score of every brick in the level, not just the ones made so far
+		state.totalBrickScore = sum(compiled.hp.count(hp) * GC_BRICK_SCORES[hp - 1] for hp in range(1, 5))
+		return level
+
+	def copy(self, grid: BrickGrid) -> 'ScrollingLevel':
+		# the same level, scrolling a copy of its grid (the compiled level is shared)
+		return ScrollingLevel(self.compiled, grid, self.firstRow, self.endRow, self.scrollLeft)
+
+	def isOpen(self) -> bool:
+		# whether the whole level has scrolled in, so the ball can leave through the top of the world
+		return self.grid.firstCell.y >= GC_BRICK_TOP_HEIGHT
+
+	def getRowTop(self, row: int) -> int:
+		return self.grid.firstCell.y + row * self.grid.firstCell.height
+
+	def loadRows(self) -> None:
+		# make the rows that have scrolled into the world, and release the ones that have left it
+		cell = self.grid.firstCell
+		firstRow = max(0, math.floor(-cell.y / cell.height))
+		endRow = max(firstRow, min(self.compiled.rows, math.ceil((GC_BRICK_BOTTOM_HEIGHT - cell.y) / cell.height)))
+		if firstRow < self.firstRow:
+			for brick in makeBricksInRows(self.compiled, cell, firstRow, min(self.firstRow, endRow)):
+				self.grid.add(brick)
+				self.grid.markChanged(brick)
+			self.firstRow = firstRow
+		while self.endRow > max(endRow, self.firstRow):
+			self.endRow -= 1
+			for brick in self.grid.getRow(self.getRowTop(self.endRow)):
+				self.grid.remove(brick)
+
+	def getTargetY(self) -> int:
+		# where the first cell should be: the lowest row with a brick that can be broken at the
+		# bottom of the area, or all the way down if there is none (yet)
+		for row in range(self.endRow - 1, self.firstRow - 1, -1):
+			for brick in self.grid.getRow(self.getRowTop(row)):
+				if brick.maxHP != -1:
+					return min(GC_BRICK_TOP_HEIGHT, GC_BRICK_BOTTOM_HEIGHT - (row + 1) * self.grid.firstCell.height)
+		return GC_BRICK_TOP_HEIGHT
+
+	def update(self, dt: float = 1) -> None:
+		# scroll for dt frames
+		distance = self.getTargetY() - self.grid.firstCell.y
+		if distance <= 0:
+			self.scrollLeft = 0
+			return
+		self.scrollLeft += GC_SCROLL_SPEED * dt
+		dy = min(distance, int(self.scrollLeft))
+		self.scrollLeft -= dy
+		if dy:
+			self.grid.move(dy)
+			self.loadRows()
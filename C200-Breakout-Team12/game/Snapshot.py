@@ -0,0 +1,149 @@
+# saves the simulation's part of a GameState as bytes, and makes a GameState from them again
+# A snapshot has what the simulation needs to carry on exactly where the state was (see
+# GameSimulation): the scores, lives and time, the paddle, the balls, the bricks that are left,
+# the position of the brick grid and of a scrolling level, and the state of the state's random
+# number generator. It leaves out the graphics (images, animations and particles, which a
+# restored state starts without) and the events of the last frame.
+# The format is STATE, then the generator's state as 32 bit words, then the balls (and the
+# points they were at before the last frame) as arrays of doubles, then the bricks as an array
+# of ints (bricks are always on whole pixels, see LevelTools and BrickGrid.move()), so taking
+# and restoring a snapshot is a few struct and array calls plus making the objects, with no
+# pickling. A compiled level is only referred to by the level's number.
+# Making the objects is most of the cost, though: for level 1 part way through (134 bricks, see
+# the "snapshot" benchmark), taking a snapshot takes about 150 us and restoring one about 500 us,
+# mostly making each Brick and adding it to the BrickGrid, even copying the bricks and indexing
+# them in bulk as restoreSnapshot() and BrickGrid.addAll() do (copy.deepcopy() takes about 5.5 ms).
+# That is as fast as it gets while every brick is an object.
+# For a copy that doesn't have to be bytes, GameState.clone() is much faster (about 60 us): the
+# copy shares the bricks with the state until one of them is hit (see BrickGrid.own()), so it
+# only copies the grid's cells and rows, and then the bricks each frame hits.
+import random
+import struct
+from array import array
+
+from game.GameState import GameState
+from game.LevelTools import POWERUPS, getLevel
+from game.gameClasses.Ball import Ball
+from game.gameClasses.Brick import Brick
+from game.gameClasses.PosCircle import PosCircle
+from game.gameClasses.PosPoint import PosPoint
+from game.gameClasses.PosRect import PosRect
+from game.gameClasses.Velocity import Velocity
+
+SNAPSHOT_MAGIC: bytes = b"BRKS"
+SNAPSHOT_VERSION: int = 1
+# magic, version,
+# level, seed, oldScore, score, numLives, won, paused, collidedLastFrame,
+# time, totalBrickScore, totalBricksDestroyedScore,
+# paddle x and dx,
+# brick grid's first cell (x, y, width, height),
+# scrolling level's firstRow (-1 if it isn't one), endRow and scrollLeft,
+# number of balls, of last positions and of bricks,
+# the generator's gauss_next and whether it has one
+STATE: struct.Struct = struct.Struct("<4sH" "iIiiib??" "dii" "dd" "iiii" "iid" "HHI" "d?")
+RANDOM_WORDS: int = 625  # the Mersenne Twister's 624 words and its position in them
+BALL_SIZE: int = 7  # x, y, radius, dx, dy, ddx, ddy
+BRICK_SIZE: int = 7  # x, y, width, height, maxHP, hp, power up (its code in LevelTools.POWERUPS)
+POWERUP_CODES = {powerUp: code for code, powerUp in enumerate(POWERUPS)}
+
+
+def readArray(typecode: str, data: memoryview, offset: int, count: int) -> array:
+	values = array(typecode)
+	values.frombytes(data[offset:offset + count * values.itemsize])
+	return values
+
+
+def takeSnapshot(state: GameState) -> bytes:
+	rngVersion, words, gaussNext = state.random.getstate()
+	balls = array('d')
+	for ball in state.balls:
+		balls.extend((ball.circle.x, ball.circle.y, ball.circle.radius, ball.velocity.dx, ball.velocity.dy,
+					  ball.acceleration.ddx, ball.acceleration.ddy))
+	lastPositions = array('d')
+	for point in state.lastPosBalls:
+		lastPositions.extend((point.x, point.y))
+	bricks = array('i')
+	for brick in state.bricks:
+		rect = brick.rect
+		bricks.extend((rect.x, rect.y, rect.width, rect.height, brick.maxHP, brick.hp, POWERUP_CODES[brick.powerUp]))
+	cell = state.brickGrid.firstCell
+	scrolling = state.scrollingLevel
+	header = STATE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+						state.level, state.seed, state.oldScore, state.score, state.numLives, state.won, state.paused,
+						state.collidedLastFrame,
+						state.time, state.totalBrickScore, state.totalBricksDestroyedScore,
+						state.paddle.rect.x, state.paddle.velocity.dx,
+						cell.x, cell.y, cell.width, cell.height,
+						-1 if scrolling is None else scrolling.firstRow, 0 if scrolling is None else scrolling.endRow,
+						0 if scrolling is None else scrolling.scrollLeft,
+						len(state.balls), len(state.lastPosBalls), len(state.bricks),
+						gaussNext or 0, gaussNext is not None)
+	return b"".join((header, array('I', words).tobytes(), balls.tobytes(), lastPositions.tobytes(), bricks.tobytes()))
+
+
+def restoreSnapshot(data: bytes) -> GameState:
+	# a new GameState, as it was when the snapshot was taken
+	(magic, version,
+	 level, seed, oldScore, score, numLives, won, paused, collidedLastFrame,
+	 time, totalBrickScore, totalBricksDestroyedScore,
+	 paddleX, paddleDx,
+	 cellX, cellY, cellWidth, cellHeight,
+	 firstRow, endRow, scrollLeft,
+	 numBalls, numLastPositions, numBricks,
+	 gaussNext, hasGaussNext) = STATE.unpack_from(data)
+	if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+		raise ValueError("not a snapshot, or from another version of the game")
+	data = memoryview(data)
+	offset = STATE.size
+
+	words = readArray('I', data, offset, RANDOM_WORDS)
+	offset += RANDOM_WORDS * words.itemsize
+	rng = random.Random.__new__(random.Random)  # see copyRandom()
+	rng.setstate((3, tuple(words), gaussNext if hasGaussNext else None))
+
+	values = readArray('d', data, offset, numBalls * BALL_SIZE)
+	offset += len(values) * values.itemsize
+	balls = []
+	for i in range(0, len(values), BALL_SIZE):
+		x, y, radius, dx, dy, ddx, ddy = values[i:i + BALL_SIZE]
+		ball = Ball(PosCircle(x, y, radius), Velocity(dx, dy))
+		ball.acceleration.ddx = ddx
+		ball.acceleration.ddy = ddy
+		balls.append(ball)
+
+	values = readArray('d', data, offset, numLastPositions * 2)
+	offset += len(values) * values.itemsize
+	lastPositions = [PosPoint(values[i], values[i + 1]) for i in range(0, len(values), 2)]
+
+	values = readArray('i', data, offset, numBricks * BRICK_SIZE)
+	bricks = []
+	# each kind of brick is made once, and the rest are copies of it (see Brick.copy()), moved into place
+	prototypes = {}  # (width, height, maxHP, power up code) -> brick
+	# the fields of every brick, one column at a time, which is quicker than slicing out each brick
+	for x, y, width, height, maxHP, hp, powerUp in zip(*(values[i::BRICK_SIZE] for i in range(BRICK_SIZE))):
+		prototype = prototypes.get((width, height, maxHP, powerUp))
+		if prototype is None:
+			prototype = prototypes[(width, height, maxHP, powerUp)] = Brick(PosRect(0, 0, width, height), maxHP,
+																			 POWERUPS[powerUp])
+		brick = prototype.copy()
+		brick.rect.x = x
+		brick.rect.y = y
+		brick.hp = hp
+		bricks.append(brick)
+
+	state = GameState(bricks, None, level, oldScore, numLives, PosRect(cellX, cellY, cellWidth, cellHeight), seed, rng)
+	state.balls = balls
+	state.lastPosBalls = lastPositions
+	if firstRow >= 0:
+		from game.ScrollingLevel import ScrollingLevel
+		state.scrollingLevel = ScrollingLevel(getLevel(level), state.brickGrid, firstRow, endRow, scrollLeft)
+	state.score = score
+	state.won = won
+	state.paused = paused
+	state.collidedLastFrame = collidedLastFrame
+	state.time = time
+	state.totalBrickScore = totalBrickScore
+	state.totalBricksDestroyedScore = totalBricksDestroyedScore
+	state.paddle.rect.x = paddleX
+	state.paddle.velocity.dx = paddleDx
+	return state
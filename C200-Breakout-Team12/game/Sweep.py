@@ -0,0 +1,238 @@
+# time of impact calculations for a ball moving under constant acceleration
+# Between collisions, a ball's position after t frames is exactly
+#   p(t) = p0 + v0 * t + a * t^2 / 2
+# (the half-acceleration update in GameSimulation.updateBall() is the same thing for t = 1).
+# These functions find the first time that path touches a line or a rectangle, so the
+# simulation can move the ball straight to the point of impact instead of moving it a whole
+# frame and checking for overlap afterwards. This works for any timestep, so nothing is
+# tunneled through no matter how fast the ball is or how large a step is taken.
+# Times are in frames, like velocities and accelerations in the rest of the game.
+import math
+from typing import Callable, Optional, Tuple
+
+from game.gameClasses.Ball import Ball
+from game.gameClasses.PosRect import PosRect
+
+# Ball-rectangle impacts on the sides are found exactly, but impacts on the corners have no
+# simple closed form with gravity. Over a stretch of h frames, though, the path stays within
+# |a| h^2 / 2 of the straight line along the ball's velocity at the start of the stretch, so the
+# ball can only touch a corner while that line passes within the radius plus that of it, which
+# is a quadratic. The path is split into stretches short enough for that to be half the radius,
+# and only the part of each that is near the corner is searched: the ball is advanced in steps
+# no longer than its distance to the corner (it can't close that distance any faster), but at
+# least SAMPLE_SPACING radii, and the first step that touches is refined by false position
+# (the Illinois method) to within GAP_TOLERANCE pixels. Only grazing hits that overlap a corner
+# by less than SAMPLE_SPACING radii would be missed.
+SAMPLE_SPACING: float = 0.25
+GAP_TOLERANCE: float = 1e-9
+MAX_REFINE_STEPS: int = 60
+
+
+def positionAt(p: float, v: float, a: float, t: float) -> float:
+	return p + v * t + a * t * t / 2
+
+
+def ballPositionAt(ball: Ball, t: float) -> Tuple[float, float]:
+	return (positionAt(ball.circle.x, ball.velocity.dx, ball.acceleration.ddx, t),
+			positionAt(ball.circle.y, ball.velocity.dy, ball.acceleration.ddy, t))
+
+
+def advanceBall(ball: Ball, t: float) -> None:
+	# move the ball along its path for t frames, and update its velocity
+	ball.circle.x, ball.circle.y = ballPositionAt(ball, t)
+	ball.velocity.dx += ball.acceleration.ddx * t
+	ball.velocity.dy += ball.acceleration.ddy * t
+
+
+def timeToReach(p: float, v: float, a: float, target: float, maxT: float, direction: int = 0) -> Optional[float]:
+	# first time in [0, maxT] that p + v t + a t^2 / 2 reaches target while moving in direction
+	# (-1 or 1; by default, towards the target from p). Returns None if it doesn't get there in time.
+	c = p - target
+	if direction == 0:
+		direction = 1 if target > p else -1
+	if a == 0:
+		roots = [] if v == 0 else [-c / v]
+	else:
+		discriminant = v * v - 2 * a * c
+		if discriminant < 0:
+			return None
+		# numerically stable form of the quadratic formula
+		q = -(v + math.copysign(math.sqrt(discriminant), v)) / 2
+		roots = [q / (a / 2)]
+		if q != 0:
+			roots.append(c / q)
+		roots.sort()
+	for t in roots:
+		if 0 <= t <= maxT and (v + a * t) * direction > 0:
+			return t
+	return None
+
+
+def timeToCross(p: float, v: float, a: float, line: float, direction: int, maxT: float) -> Optional[float]:
+	# first time in [0, maxT] that the position crosses the line, going in direction (-1 or 1)
+	# returns 0 if it is already past the line and still going further
+	if (p - line) * direction > 0:
+		return 0 if v * direction > 0 else None
+	return timeToReach(p, v, a, line, maxT, direction)
+
+
+def pathBounds(ball: Ball, maxT: float, minT: float = 0) -> Tuple[float, float, float, float]:
+	# bounding box (x, y, width, height) of the ball's circle from minT to maxT frames from now
+	circle, velocity, acceleration = ball.circle, ball.velocity, ball.acceleration
+	x, y, dx, dy, ddx, ddy = circle.x, circle.y, velocity.dx, velocity.dy, acceleration.ddx, acceleration.ddy
+	left, right = x + (dx + ddx * minT / 2) * minT, x + (dx + ddx * maxT / 2) * maxT
+	if right < left:
+		left, right = right, left
+	top, bottom = y + (dy + ddy * minT / 2) * minT, y + (dy + ddy * maxT / 2) * maxT
+	if bottom < top:
+		top, bottom = bottom, top
+	# include the top of the parabola if it is reached in between
+	if ddx != 0 and minT < -dx / ddx < maxT:
+		turn = x - dx * dx / ddx / 2
+		left, right = min(left, turn), max(right, turn)
+	if ddy != 0 and minT < -dy / ddy < maxT:
+		turn = y - dy * dy / ddy / 2
+		top, bottom = min(top, turn), max(bottom, turn)
+	radius = circle.radius
+	return left - radius, top - radius, right - left + 2 * radius, bottom - top + 2 * radius
+
+
+def contactPoint(x: float, y: float, rect: PosRect) -> Tuple[float, float, float, float]:
+	# the point on the rectangle's edge nearest (x, y), and the direction out of the rectangle there:
+	# towards (x, y), or if (x, y) is inside, out through the nearest side
+	nearestX = max(rect.x, min(x, rect.x + rect.width))
+	nearestY = max(rect.y, min(y, rect.y + rect.height))
+	if nearestX != x or nearestY != y:
+		return nearestX, nearestY, x - nearestX, y - nearestY
+	right, bottom = rect.x + rect.width, rect.y + rect.height
+	distance, edgeX, edgeY, normalX, normalY = min((y - rect.y, x, rect.y, 0, -1), (bottom - y, x, bottom, 0, 1),
+												   (x - rect.x, rect.x, y, -1, 0), (right - x, right, y, 1, 0))
+	return edgeX, edgeY, normalX, normalY
+
+
+def refineImpact(gap: Callable[[float], float], low: float, lowGap: float, high: float, highGap: float) -> float:
+	# the time gap() reaches 0 between low (gap >= 0) and high (gap < 0), from the low side, by
+	# false position, halving the weight of an end that is kept twice in a row (the Illinois method)
+	weightLow, weightHigh = lowGap, highGap
+	kept = 0
+	for j in range(MAX_REFINE_STEPS):
+		if lowGap < GAP_TOLERANCE:
+			break
+		middle = (low * weightHigh - high * weightLow) / (weightHigh - weightLow)
+		if not low < middle < high:
+			middle = (low + high) / 2
+		middleGap = gap(middle)
+		if middleGap < 0:
+			high, highGap, weightHigh = middle, middleGap, middleGap
+			weightLow = weightLow / 2 if kept == -1 else lowGap
+			kept = -1
+		else:
+			low, lowGap, weightLow = middle, middleGap, middleGap
+			weightHigh = weightHigh / 2 if kept == 1 else highGap
+			kept = 1
+	return low
+
+
+def timeToHitCorner(ball: Ball, x: float, y: float, maxT: float) -> Optional[float]:
+	# first time in [0, maxT] that the ball touches the point (x, y) while moving towards it
+	# (the ball's position and velocity are taken relative to the point)
+	circle, velocity, acceleration = ball.circle, ball.velocity, ball.acceleration
+	radius = circle.radius
+	px, py, vx, vy, ax, ay = circle.x - x, circle.y - y, velocity.dx, velocity.dy, acceleration.ddx, acceleration.ddy
+	accelerationMagnitude = math.hypot(ax, ay)
+
+	def gap(t: float) -> float:
+		# distance between the ball's edge and the point, < 0 when overlapping
+		return math.hypot(px + (vx + ax * t / 2) * t, py + (vy + ay * t / 2) * t) - radius
+
+	lastGap = math.hypot(px, py) - radius
+	if lastGap < 0:
+		# only a hit if it is moving further in
+		return 0 if gap(min(maxT, 1e-6)) < lastGap else None
+	stretch = maxT if accelerationMagnitude == 0 else math.sqrt(radius / accelerationMagnitude)
+	start = 0
+	while start < maxT:
+		end = min(maxT, start + stretch)
+		# when the line along the velocity at start, q + w s, is within reach of the point:
+		# |q + w s|^2 <= reach^2, a quadratic in s
+		qx, qy = px + (vx + ax * start / 2) * start, py + (vy + ay * start / 2) * start
+		wx, wy = vx + ax * start, vy + ay * start
+		reach = radius + accelerationMagnitude * (end - start) ** 2 / 2
+		a, b, c = wx * wx + wy * wy, qx * wx + qy * wy, qx * qx + qy * qy - reach * reach
+		if a == 0:
+			nearStart, nearEnd = (start, end) if c <= 0 else (end, start)
+		else:
+			discriminant = b * b - a * c
+			if discriminant < 0:
+				nearStart, nearEnd = end, start
+			else:
+				root = math.sqrt(discriminant)
+				nearStart, nearEnd = max(start, start + (-b - root) / a), min(end, start + (-b + root) / a)
+		if nearStart <= nearEnd:
+			# advance in steps no longer than the ball can travel without reaching the point: with
+			# speed s at t, it travels at most s h + |a| h^2 / 2 in the next h frames
+			t = nearStart
+			lastGap = gap(t)
+			if lastGap < 0:
+				return t
+			while t < nearEnd:
+				distance = max(lastGap, radius * SAMPLE_SPACING)
+				speed = math.hypot(vx + ax * t, vy + ay * t)
+				if accelerationMagnitude != 0:
+					h = 2 * distance / (speed + math.sqrt(speed * speed + 2 * accelerationMagnitude * distance))
+				else:
+					h = distance / speed if speed != 0 else maxT
+				nextT = min(nearEnd, t + h)
+				nextGap = gap(nextT)
+				if nextGap < 0:
+					return refineImpact(gap, t, lastGap, nextT, nextGap)
+				t, lastGap = nextT, nextGap
+		start = end
+	return None
+
+
+def timeToHitRect(ball: Ball, rect: PosRect, maxT: float) -> Optional[float]:
+	# first time in [0, maxT] that the ball touches the rectangle while moving into it
+	# a ball that starts out overlapping the rectangle only hits it at time 0 if it is moving
+	# further in; otherwise (e.g. it just bounced off) it is ignored until it leaves
+	left, right, top, bottom = rect.x, rect.x + rect.width, rect.y, rect.y + rect.height
+	x, y, width, height = pathBounds(ball, maxT)
+	if x > right or x + width < left or y > bottom or y + height < top:
+		return None
+
+	circle, velocity, acceleration = ball.circle, ball.velocity, ball.acceleration
+	radius = circle.radius
+
+	# already overlapping (e.g. the paddle moved onto it): the sides and corners below are only
+	# found as the ball reaches them
+	if left - radius < circle.x < right + radius and top - radius < circle.y < bottom + radius:
+		contactX, contactY, normalX, normalY = contactPoint(circle.x, circle.y, rect)
+		overlapping = (circle.x - contactX) ** 2 + (circle.y - contactY) ** 2 < radius * radius
+		if overlapping or rect.intersectsPoint(circle.x, circle.y):
+			return 0 if normalX * velocity.dx + normalY * velocity.dy < 0 else None
+
+	hitTime = None
+
+	# sides: the centre crosses a side moved out by the radius, between the side's ends
+	for line, direction in ((left - radius, 1), (right + radius, -1)):
+		t = timeToReach(circle.x, velocity.dx, acceleration.ddx, line, maxT, direction)
+		if t is not None and top <= positionAt(circle.y, velocity.dy, acceleration.ddy, t) <= bottom:
+			hitTime = t if hitTime is None else min(hitTime, t)
+	for line, direction in ((top - radius, 1), (bottom + radius, -1)):
+		t = timeToReach(circle.y, velocity.dy, acceleration.ddy, line, maxT, direction)
+		if t is not None and left <= positionAt(circle.x, velocity.dx, acceleration.ddx, t) <= right:
+			hitTime = t if hitTime is None else min(hitTime, t)
+
+	# corners, if the ball's path passes near them before it hits a side
+	searchT = maxT
+	if hitTime is not None:
+		searchT = hitTime
+		x, y, width, height = pathBounds(ball, searchT)
+	for cornerX in (left, right):
+		if x <= cornerX <= x + width:
+			for cornerY in (top, bottom):
+				if y <= cornerY <= y + height:
+					t = timeToHitCorner(ball, cornerX, cornerY, searchT)
+					if t is not None and (hitTime is None or t < hitTime):
+						hitTime = searchT = t
+	return hitTime
@@ -2,11 +2,13 @@ from game.gameClasses.Velocity import Velocity
 
 
 class Acceleration:
+	__slots__ = 'ddx', 'ddy'
+
 	def __init__(self, ddx: float, ddy: float):
 		self.ddx: float = ddx
 		self.ddy: float = ddy
 
-	# apply this acceleration to a velocity
-	def apply(self, velocity: Velocity):
-		velocity.dx += self.ddx
-		velocity.dy += self.ddy
+	# apply this acceleration to a velocity, for scale frames
+	def apply(self, velocity: Velocity, scale: float = 1):
+		velocity.dx += self.ddx * scale
+		velocity.dy += self.ddy * scale
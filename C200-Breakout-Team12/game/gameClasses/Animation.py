@@ -21,9 +21,9 @@ class Animation:
 		# An animation can switch to another animation, specified in the 'next' parameter of the constructor.
 		# Each animation will be drawn every frame, so if this is the frame after its last frame, switch to
 		# the new animation.
-		# This doesn't work with Displayables, since they are deleted by GameController at this frame, before
-		# this method is called by GameRenderer. But there's no case in this project where a Displayable needs
-		# to chain into another displayable, so it doesn't matter. This is only used for permanent objects, for
+		# This doesn't work with particles, since ParticleSystem picks their frames itself and removes them when
+		# their animation is over. But there's no case in this project where a particle needs to chain into
+		# another animation, so it doesn't matter. This is only used for permanent objects, for
 		# example, the paddle electric animation transitioning back into the normal paddle image (just a
 		# 1-frame animation) after it's over.
 		if framesElapsed == 0 and frame > self.beginFrame and self.next != '':  # means animation is complete, just finished last frame
@@ -1,4 +1,3 @@
-from Assets import Assets
 from GameConstants import *
 from game.gameClasses.Acceleration import Acceleration
 from game.gameClasses.Blittable import Blittable
@@ -8,8 +7,16 @@ from game.gameClasses.Velocity import Velocity
 
 class Ball(Blittable):
 	def __init__(self, circle: PosCircle, velocity: Velocity):
-		super().__init__(Assets.A_BALL)
+		super().__init__('A_BALL')
 		self.circle: PosCircle = circle
 		self.velocity: Velocity = velocity
 
 		self.acceleration: Acceleration = Acceleration(0, GC_GRAVITY_ACCEL)
+
+	def copy(self) -> 'Ball':
+		ball = Ball(PosCircle(self.circle.x, self.circle.y, self.circle.radius),
+					Velocity(self.velocity.dx, self.velocity.dy))
+		ball.acceleration.ddx = self.acceleration.ddx
+		ball.acceleration.ddy = self.acceleration.ddy
+		ball.image = self.copyImage()
+		return ball
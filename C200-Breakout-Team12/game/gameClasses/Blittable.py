@@ -1,5 +1,9 @@
+import sys
+
 from pygame import Surface
 
+from game.gameClasses.Animation import Animation
+
 
 # This class represents an object that can be blitted.
 # Normally a position would also be required, but this
@@ -10,11 +14,39 @@ from pygame import Surface
 # return the current frame based upon the game tick
 # number.
 
+# The image can also be given as the name of an asset (e.g. 'A_BALL').
+# Importing Assets loads every image, which needs a display, so game
+# objects that the headless simulation creates (balls, paddle, bricks)
+# only store the name, and it is looked up the first time it is drawn.
+
+
+def getAssetsClass():
+	# same trick as in Graphics' blur(): get the Assets class without importing it
+	return getattr(sys.modules['Assets'], 'Assets')
+
+
 class Blittable:
 	def __init__(self, image):
 		self.image = image
 
+	def getAnimation(self):
+		if isinstance(self.image, str):
+			asset = getattr(getAssetsClass(), self.image)
+			if isinstance(asset, Animation):
+				# each object gets its own copy so switchTo() doesn't change the shared asset
+				asset = Animation(asset.images, asset.frameTime, asset.beginFrame, asset.next)
+			self.image = asset
+		return self.image
+
+	def copyImage(self):
+		# the image for a copy of this object: the same one, unless it is this object's own
+		# Animation (the images it shows are still shared)
+		if isinstance(self.image, Animation):
+			return Animation(self.image.images, self.image.frameTime, self.image.beginFrame, self.image.next)
+		return self.image
+
 	def getImage(self, frame: int):
-		if isinstance(self.image, Surface):
-			return self.image
-		return self.image.getFrame(frame)
+		image = self.getAnimation()
+		if isinstance(image, Surface):
+			return image
+		return image.getFrame(frame)
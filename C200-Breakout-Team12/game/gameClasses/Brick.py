@@ -1,15 +1,19 @@
+from typing import Dict
+
 from pygame import Surface
 
-from Assets import Assets
 from GameConstants import *
-from game.gameClasses.Blittable import Blittable
+from game.gameClasses.Blittable import Blittable, getAssetsClass
 from game.gameClasses.PosRect import PosRect
 
+scaledImages: Dict[Tuple[Surface, Tuple[int, int]], Surface] = {}  # (brick image, size) -> image scaled to that size
+
 
 class Brick(Blittable):
 	# get the brick image from its max HP and current HP
 	@staticmethod
 	def getImageFromHP(maxHP: int, currentHP: int, powerUP) -> Surface:
+		Assets = getAssetsClass()  # looked up when drawn so bricks can be made without loading assets
 		if powerUP == 'extraBall':
 			if currentHP == 1:
 				return Assets.I_BRICK_EXTRABALL_1
@@ -34,11 +38,19 @@ class Brick(Blittable):
 			return Assets.I_BRICK_LEVEL3_3
 
 	def getImage(self, frame: int) -> Surface:
-		return self.getImageFromHP(self.maxHP, self.hp, self.powerUp)
+		image = self.getImageFromHP(self.maxHP, self.hp, self.powerUp)
+		if self.rect.width != GC_BRICK_WIDTH or self.rect.height != GC_BRICK_HEIGHT:
+			# a brick in a level too large for the usual brick size
+			size = (int(self.rect.width), int(self.rect.height))
+			scaled = scaledImages.get((image, size))
+			if scaled is None:
+				scaled = scaledImages[(image, size)] = pygame.transform.smoothscale(image, size)
+			image = scaled
+		return image
 
 	def __init__(self, pos: PosRect, maxHP: int, powerUP):
-		self.rect: PosRect = PosRect(pos.x, pos.y, GC_BRICK_WIDTH, GC_BRICK_HEIGHT)
-		super().__init__(self.getImageFromHP(maxHP, maxHP, powerUP))
+		self.rect: PosRect = PosRect(pos.x, pos.y, pos.width, pos.height)
+		super().__init__(None)  # image depends on the current HP, see getImage()
 		self.maxHP: int = maxHP
 		self.hp: int = maxHP
 		self.powerUp = powerUP
@@ -49,6 +61,14 @@ class Brick(Blittable):
 		else:
 			self.score: int = GC_BRICK_SCORES[maxHP - 1]
 
+	def copy(self) -> 'Brick':
+		# made without __init__(), which would work out the same score again
+		brick = Brick.__new__(Brick)
+		fields = self.__dict__.copy()
+		fields['rect'] = self.rect.copy()
+		brick.__dict__ = fields
+		return brick
+
 	# returns the one-character string of this brick's type as used in level files (0-4, or letter for powerup)
 	def __str__(self):
 		if self.powerUp == 'extraBall':
@@ -0,0 +1,20 @@
+from game.gameClasses.PosPoint import PosPoint
+from game.gameClasses.Velocity import Velocity
+
+
+# Something that happened in the simulation that the GameController may want to show
+# (animations, screenshake). The simulation doesn't know about graphics, so it stores
+# these in GameState.events each frame instead of making particles itself.
+class GameEvent:
+	WALL_BOUNCE = 'wallBounce'  # data: -1 for left wall, 1 for right wall
+	BRICK_HIT = 'brickHit'  # data: the brick that was hit
+	BRICK_DESTROYED = 'brickDestroyed'  # data: the brick that was destroyed
+	BALL_LOST = 'ballLost'  # data: None
+	PADDLE_HIT = 'paddleHit'  # data: angle of the hit point relative to the paddle center
+
+	# noinspection PyShadowingBuiltins
+	def __init__(self, type: str, pos: PosPoint, velocity: Velocity, data=None):
+		self.type: str = type
+		self.pos: PosPoint = pos  # where it happened
+		self.velocity: Velocity = velocity  # velocity of the ball involved, after the collision
+		self.data = data
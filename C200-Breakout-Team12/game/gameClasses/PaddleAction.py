@@ -0,0 +1,8 @@
+# Paddle commands for one frame of the simulation, as plain data.
+# The GameController fills one of these from the pygame event queue, while
+# bots and headless runs can make them directly.
+class PaddleAction:
+	def __init__(self, moveDir: int = 0, targetX: float = None, begin: bool = False):
+		self.moveDir: int = moveDir  # -1 = left, 0 = stay, 1 = right (moves at GC_PADDLE_SPEED)
+		self.targetX: float = targetX  # if not None, put the paddle's left edge here first (mouse control)
+		self.begin: bool = begin  # start the ball if the game is paused
@@ -2,6 +2,8 @@ from game.gameClasses.PosPoint import PosPoint
 
 
 class PosCircle(PosPoint):
+	__slots__ = 'radius',
+
 	def __init__(self, x: float, y: float, radius: int):
 		super().__init__(x, y)
 		self.radius: int = radius
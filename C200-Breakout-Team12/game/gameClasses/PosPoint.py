@@ -1,4 +1,14 @@
+# The geometry classes (PosPoint, PosCircle, PosRect, Velocity, Acceleration) use __slots__:
+# every ball, brick and paddle has a few of them and the physics reads and writes their
+# fields many times a frame, so they are kept as small as possible, without a __dict__.
 class PosPoint:
+	__slots__ = 'x', 'y'
+
 	def __init__(self, x: float, y: float):
 		self.x: float = x
 		self.y: float = y
+
+	# move this point in place, instead of making a new one
+	def set(self, x: float, y: float) -> None:
+		self.x = x
+		self.y = y
@@ -5,6 +5,8 @@ from game.gameClasses.PosPoint import PosPoint
 
 
 class PosRect(PosPoint):
+	__slots__ = 'width', 'height'
+
 	def __init__(self, x: float, y: float, width: int, height: int):
 		super().__init__(x, y)
 		self.width: int = width
@@ -48,3 +50,12 @@ class PosRect(PosPoint):
 
 	def intersectsPoint(self, x, y):
 		return self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
+
+	def copy(self) -> 'PosRect':
+		# made without __init__(), which is two calls, for copying every brick of a state
+		rect = PosRect.__new__(PosRect)
+		rect.x = self.x
+		rect.y = self.y
+		rect.width = self.width
+		rect.height = self.height
+		return rect
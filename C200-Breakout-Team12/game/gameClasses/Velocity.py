@@ -2,6 +2,8 @@ from game.gameClasses.PosPoint import PosPoint
 
 
 class Velocity:
+	__slots__ = 'dx', 'dy'
+
 	def __init__(self, dx: float, dy: float):
 		self.dx: float = dx
 		self.dy: float = dy
@@ -35,6 +35,7 @@ class BetweenLevelsScreen(Screen):
 			if e.type == pygame.MOUSEBUTTONDOWN:
 				self.clickButtons(e.pos)
 
+	def draw(self, alpha: float):
 		Graphics.clear()
 		Graphics.surface.blit(Assets.I_BETWEENLEVELS_BACKGROUND, (0, 0))
 		self.drawScore()
@@ -42,11 +43,8 @@ class BetweenLevelsScreen(Screen):
 		Graphics.flip()
 
 	def drawScore(self):
-		scoreLen = len(str(self.state.oldScore)) * GC_IMGFONT_SIZE
-		x = GC_WORLD_WIDTH // 2 - scoreLen // 2
-		for i in str(self.state.oldScore):
-			Graphics.surface.blit(getattr(Assets, "I_TXT_" + i), (x, 30))
-			x += GC_IMGFONT_SIZE
+		score = Graphics.text.render(str(self.state.oldScore))
+		Graphics.surface.blit(score, (GC_WORLD_WIDTH // 2 - score.get_width() // 2, 30))
 
 	def buttonClicked(self, buttonName):
 		if buttonName == "continue":
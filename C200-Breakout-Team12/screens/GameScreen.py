@@ -5,10 +5,8 @@ from game.GameController import GameController
 from game.GameRenderer import GameRenderer
 from game.GameState import GameState
 from game.Highscores import Highscores
-from screens.BetweenLevelsScreen import BetweenLevelsScreen
-from screens.HighscoreDisplayScreen import HighscoreDisplayScreen
-from screens.HighscoreEntryScreen import HighscoreEntryScreen
-from screens.PauseScreen import PauseScreen
+from game.LevelTools import preloadState
+from game.Replay import Replay
 from screens.Screen import Screen
 
 
@@ -20,35 +18,41 @@ class GameScreen(Screen):
 		super().__init__()
 		self.state = state
 		self.controller = GameController(self.state)
+		if GC_RECORD_REPLAYS:
+			self.controller.replay = Replay.forState(self.state)
+		if self.state.level < GC_NUM_LEVELS:
+			preloadState(self.state.level + 1)
 
 	def update(self):
 		super().update()
 
 		###   UPDATE GAME STATE   #############################################
 		self.controller.update(self.frame)
-
-		###   DRAW GAME STATE   ###############################################
-		Graphics.clear()
-		GameRenderer.render(self.state, self.frame)
-		Graphics.flip()
+		if self.state.won != 0 and self.controller.replay is not None:
+			self.saveReplay()
 
 		###   GO TO WIN/LOSS SCREENS   ########################################
 		if self.state.won == 1:
 			Graphics.camera.reset()
 			if self.state.level == GC_NUM_LEVELS:
 				if Highscores.isHighScore(self.state.oldScore + self.state.score):
+					from screens.HighscoreEntryScreen import HighscoreEntryScreen
 					ScreenManager.setScreen(HighscoreEntryScreen(self.state.oldScore + self.state.score))
 				else:
+					from screens.HighscoreDisplayScreen import HighscoreDisplayScreen
 					ScreenManager.setScreen(HighscoreDisplayScreen())
 			else:
+				from screens.BetweenLevelsScreen import BetweenLevelsScreen
 				ScreenManager.setScreen(
 					BetweenLevelsScreen(self.state.level, self.state.oldScore, self.state.score, self.state.numLives))
 
 		elif self.state.won == -1:
 			Graphics.camera.reset()
 			if Highscores.isHighScore(self.state.oldScore):
+				from screens.HighscoreEntryScreen import HighscoreEntryScreen
 				ScreenManager.setScreen(HighscoreEntryScreen(self.state.oldScore))
 			else:
+				from screens.HighscoreDisplayScreen import HighscoreDisplayScreen
 				ScreenManager.setScreen(HighscoreDisplayScreen())
 
 		###   GO TO PAUSE SCREEN   ############################################
@@ -64,12 +68,28 @@ class GameScreen(Screen):
 		if IS_MAC:
 			if pygame.key.get_pressed()[pygame.K_ESCAPE]:
 				Graphics.camera.reset()
+				from screens.PauseScreen import PauseScreen
 				ScreenManager.setScreen(PauseScreen(self))
 		else:
 			for e in pygame.event.get():
 				if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
 					Graphics.camera.reset()
+					from screens.PauseScreen import PauseScreen
 					ScreenManager.setScreen(PauseScreen(self))
 				else:
 					# this will gobble up some left/right key events if they aren't posted back
 					pygame.event.post(e)
+
+	def saveReplay(self):
+		self.controller.replay.finish(self.state)
+		try:
+			self.controller.replay.saveToDirectory()
+		except OSError:
+			pass  # not being able to save a replay isn't worth stopping the game for
+		self.controller.replay = None
+
+	def draw(self, alpha: float):
+		###   DRAW GAME STATE   ###############################################
+		Graphics.clear()
+		GameRenderer.render(self.state, self.frame, alpha, self.controller.previousPositions)
+		Graphics.flip()
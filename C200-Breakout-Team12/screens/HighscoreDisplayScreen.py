@@ -13,6 +13,7 @@ class HighscoreDisplayScreen(Screen):
 
 	def __init__(self):
 		super().__init__()
+		Highscores.load()
 		if GC_GRAB_MOUSE:
 			pygame.event.set_grab(False)
 		self.buttons.append(
@@ -26,6 +27,7 @@ class HighscoreDisplayScreen(Screen):
 			if e.type == pygame.MOUSEBUTTONDOWN:
 				self.clickButtons(e.pos)
 
+	def draw(self, alpha: float):
 		Graphics.clear()
 		Graphics.surface.blit(Assets.I_HIGHSCORE_DISPLAY_BACKGROUND, (0, 0))
 
@@ -33,35 +35,22 @@ class HighscoreDisplayScreen(Screen):
 		height = (GC_WORLD_HEIGHT - 10 * (GC_IMGFONT_SIZE + HighscoreDisplayScreen.VERTICAL_SPACING)) // 2 + 5
 
 		# draw highscores
-		for i in range(10):
+		for i in range(len(Highscores.scores)):
 			x = 375
 
-			# draw highscore number (1-10)
-			if i == 9:
-				Graphics.surface.blit(Assets.I_TXT_1, (x, height))
-				x += GC_IMGFONT_SIZE
-				Graphics.surface.blit(Assets.I_TXT_0, (x, height))
-				x += GC_IMGFONT_SIZE
-			else:
-				Graphics.surface.blit(Assets.I_TXT_0, (x, height))
-				x += GC_IMGFONT_SIZE
-				image: pygame.Surface = getattr(Assets, "I_TXT_" + str(i + 1))
-				Graphics.surface.blit(image, (x, height))
-				x += GC_IMGFONT_SIZE
+			# draw highscore number (01-10)
+			Graphics.text.draw(Graphics.surface, str(i + 1), (x, height), padding=2)
+			x += 2 * GC_IMGFONT_SIZE
 
 			x += GC_HIGHSCORE_SPACING
 
 			# draw name
-			for j in Highscores.names[i]:
-				image: pygame.Surface = getattr(Assets, "I_TXT_" + j.upper())
-				Graphics.surface.blit(image, (x, height))
-				x += GC_IMGFONT_SIZE
+			name = Graphics.text.render(Highscores.names[i])
+			Graphics.surface.blit(name, (x, height))
+			x += name.get_width()
 
 			x += GC_HIGHSCORE_SPACING
-			for j in str(Highscores.scores[i]):
-				image: pygame.Surface = getattr(Assets, "I_TXT_" + str(j))
-				Graphics.surface.blit(image, (x, height))
-				x += GC_IMGFONT_SIZE
+			Graphics.text.draw(Graphics.surface, str(Highscores.scores[i]), (x, height))
 
 			height += GC_IMGFONT_SIZE + HighscoreDisplayScreen.VERTICAL_SPACING
 
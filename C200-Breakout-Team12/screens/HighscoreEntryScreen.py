@@ -42,20 +42,18 @@ class HighscoreEntryScreen(Screen):
 				if e.key == pygame.K_RETURN:
 					self.submit()
 
+	def draw(self, alpha: float):
 		Graphics.hardClear()
 		Graphics.surface.blit(Assets.I_HIGHSCORE_ENTRY_BACKGROUND, (0, 0))
-		x = int(GC_WORLD_WIDTH // 2 - 1.5 * GC_IMGFONT_SIZE)
-		for s in self.inputStr:
-			Graphics.surface.blit(getattr(Assets, "I_TXT_" + s.upper()), (x, 460))
-			x += GC_IMGFONT_SIZE
+		Graphics.text.draw(Graphics.surface, self.inputStr, (int(GC_WORLD_WIDTH // 2 - 1.5 * GC_IMGFONT_SIZE), 460))
 		self.drawButtons()
 		Graphics.flip()
 
 	def submit(self):
 		if len(self.inputStr) != 3:
 			return
+		# written by Highscores' writer thread
 		Highscores.add(self.score, self.inputStr)
-		Highscores.flush()
 		ScreenManager.setScreen(HighscoreDisplayScreen())
 
 	def buttonClicked(self, buttonName):
@@ -4,7 +4,6 @@ from Assets import Assets
 from GameConstants import *
 from game.gameClasses.PosRect import PosRect
 from screens.Button import Button
-from screens.NewGameLoaderScreen import NewGameLoaderScreen
 from screens.Screen import Screen
 
 
@@ -23,8 +22,10 @@ class InstructionsScreen(Screen):
 			if e.type == pygame.MOUSEBUTTONDOWN:
 				self.clickButtons(e.pos)
 			if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
+				from screens.NewGameLoaderScreen import NewGameLoaderScreen
 				ScreenManager.setScreen(NewGameLoaderScreen())
 
+	def draw(self, alpha: float):
 		Graphics.clear()
 		Graphics.surface.blit(Assets.I_INSTRUCTIONS_BACKGROUND, (0, 0))
 		self.drawButtons()
@@ -1,14 +1,21 @@
 # Loading Screen
 # loads all game assets into Assets module, then switches to MainMenuScreen
-# having a progress bar would be nice, but would require asynchronous loading of assets
-#  or some nifty tricks to allow for that while fitting neatly into the StateManager framework
+# the assets are loaded by an AssetLoader, a bit each update, so the screen can show a progress bar
+from functools import partial
+
 import pygame
 
+import AssetBundle
+import AssetLoader
 import Graphics
 import ScreenManager
-from game.Highscores import Highscores
+from GameConstants import GC_ASSET_BUNDLE, GC_ROTATION_CACHE_PREWARM
 from screens.Screen import Screen
 
+# the progress bar, under the "LOADING" text of the background
+PROGRESS_BAR_RECT: pygame.Rect = pygame.Rect(268, 760, 1400, 40)
+PROGRESS_BAR_BORDER: int = 6
+
 
 # Abbreviation for pygame.image.load() that also assets/ and .png onto the path and
 # also does convert_alpha(). Moved outside of class so 'self.' doesn't have to be typed.
@@ -21,14 +28,34 @@ class LoadingScreen(Screen):
 		super().__init__()
 		# noinspection PyUnresolvedReferences
 		self.background = pygame.image.load("assets/loading/background.png")
+		self.drawn: bool = False
+		self.loader: AssetLoader.AssetLoader = None
 
-	def update(self):
-		super().update()
-
+	def draw(self, alpha: float):
 		Graphics.hardClear()
 		Graphics.surface.blit(self.background, (0, 0))
+		progress = self.loader.getProgress() if self.loader is not None else 0
+		Graphics.surface.fill((255, 255, 255), PROGRESS_BAR_RECT)
+		inside = PROGRESS_BAR_RECT.inflate(-2 * PROGRESS_BAR_BORDER, -2 * PROGRESS_BAR_BORDER)
+		Graphics.surface.fill((0, 0, 0), inside)
+		inside.width = int(inside.width * progress)
+		Graphics.surface.fill((255, 255, 255), inside)
 		Graphics.flip()
+		self.drawn = True
 
+	def update(self):
+		super().update()
+		# don't start loading until the loading screen is on the screen
+		if not self.drawn:
+			return
+
+		if self.loader is None:
+			self.startLoading()
+		if self.loader.step():
+			from screens.MainMenuScreen import MainMenuScreen
+			ScreenManager.setScreen(MainMenuScreen())
+
+	def startLoading(self):
 		# so this is some dirty and hackish trick
 		# All the assets are static variables of the class Assets, and
 		# they are loaded in their definition. Example
@@ -42,15 +69,27 @@ class LoadingScreen(Screen):
 		# hard to remember names.
 		# The assets will be loaded whenever the Assets class is first
 		# imported, so ensure that this doesn't happen until the loading
-		# screen has been drawn. Then, you can import MainMenuScreen
-		# (which imports Assets). But put a 'from Assets import Assets'
-		# just in case MainMenu no longer relies on importing Assets in
-		# the future.
-
+		# screen has been drawn, and the loader is set: then importing
+		# Assets only makes the loader's manifest, and the loading is
+		# done by the loader, in update().
+		# images in an up to date AssetBundle are taken from it straight away, without the loader
+		if GC_ASSET_BUNDLE:
+			AssetBundle.bundle = AssetBundle.openBundle()
+		self.loader = AssetLoader.loader = AssetLoader.AssetLoader()
 		# noinspection PyUnresolvedReferences
-		from Assets import Assets  # importing will load assets
+		from Assets import Assets
 		# noinspection PyUnresolvedReferences
 		from Assets import AssetLoaderHelper  # loads more assets into the Assets class
-		from screens.MainMenuScreen import MainMenuScreen
-		Highscores.load()
-		ScreenManager.setScreen(MainMenuScreen())
+		AssetLoader.loader = None
+		if GC_ROTATION_CACHE_PREWARM:
+			# the brick fragments are the only particles that rotate
+			for fragType in range(1, Assets.NUM_BRICK_FRAG_TYPES + 1):
+				for brickType in "1234AC":
+					self.loader.tasks.append(partial(self.prewarmFragments, fragType, brickType))
+		if GC_ASSET_BUNDLE and AssetBundle.bundle is None:
+			self.loader.tasks.append(AssetBundle.saveBundle)
+
+	@staticmethod
+	def prewarmFragments(fragType: int, brickType: str):
+		from Assets import Assets
+		Graphics.rotationCache.prewarm(getattr(Assets, "A_BRICK_FRAG_" + str(fragType) + brickType).images)
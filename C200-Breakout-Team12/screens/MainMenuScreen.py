@@ -8,10 +8,9 @@ from GameConstants import *
 from game.GameController import GameController
 from game.GameRenderer import GameRenderer
 from game.GameState import GameState
-from game.LevelTools import makeState
+from game.LevelTools import makeState, preloadState
 from game.gameClasses.PosRect import PosRect
 from screens.Button import Button
-from screens.NewGameLoaderScreen import NewGameLoaderScreen
 from screens.Screen import Screen
 
 
@@ -23,7 +22,9 @@ class MainMenuScreen(Screen):
 		# embedded game
 		self.gameState: GameState = makeState(99, 0, 2)
 		self.gameState.paused = False
-		self.gameController: GameController = GameController(self.gameState)
+		self.gameController: GameController = GameController(self.gameState, False)
+		preloadState(99)  # for when the embedded game is reset
+		preloadState(1)  # for the begin button
 		self.paddleTarget: int = random.randint(GC_WALL_SIZE, GC_WORLD_WIDTH - GC_WALL_SIZE)
 
 		# enable screenshake
@@ -89,15 +90,17 @@ class MainMenuScreen(Screen):
 		if self.gameState.won:  # also covers lost
 			self.gameState = makeState(99, 0, 2)
 			self.gameState.paused = False
-			self.gameController = GameController(self.gameState)
+			self.gameController = GameController(self.gameState, False)
+			preloadState(99)
 		pygame.event.clear()
 		if not GC_STOP_MAINMENU_GAME:
 			self.gameController.update(self.frame)
 
+	def draw(self, alpha: float):
 		Graphics.clear()
 		# draw the embedded game
 		if not GC_STOP_MAINMENU_GAME:
-			GameRenderer.render(self.gameState, self.frame)
+			GameRenderer.render(self.gameState, self.frame, alpha, self.gameController.previousPositions)
 
 		Graphics.surface.blit(Assets.I_MAINMENU_BACKGROUND, (0, 0))
 		self.drawButtons()
@@ -108,6 +111,7 @@ class MainMenuScreen(Screen):
 			ScreenManager.exit()
 		if buttonName == "begin":
 			Graphics.camera.reset()
+			from screens.NewGameLoaderScreen import NewGameLoaderScreen
 			ScreenManager.setScreen(NewGameLoaderScreen())
 		if buttonName == "highscores":
 			Graphics.camera.disable()
@@ -37,6 +37,7 @@ class PauseScreen(Screen):
 				if e.key == pygame.K_ESCAPE:
 					self.buttonClicked("resume")  # pressing escape is same as pressing resume button...
 
+	def draw(self, alpha: float):
 		Graphics.clear()
 		GameRenderer.render(self.gameScreen.state, self.gameScreen.frame)
 		Graphics.surface.blit(Assets.I_PAUSE_BACKGROUND, (0, 0))
@@ -2,6 +2,7 @@
 
 import Graphics
 import ScreenManager
+from DrawList import DrawList
 from GameConstants import *
 from game.gameClasses.PosRect import PosRect
 from screens.Button import Button
@@ -9,6 +10,7 @@ from screens.Button import Button
 
 class Screen:
 	frame: int = 0
+	buttonLayer: DrawList = DrawList("buttons")
 
 	def __init__(self):
 		self.buttons: List[Button] = []
@@ -40,7 +42,7 @@ class Screen:
 		# noinspection PyArgumentList
 		for e in pygame.event.get(pygame.KEYDOWN):
 			if e.key == pygame.K_s:
-				pygame.image.save(Graphics.surface, "screenshot.png")
+				pygame.image.save(Graphics.frameSurface, "screenshot.png")
 			if e.key == pygame.K_f:
 				Graphics.swapWindowMode()
 			else:
@@ -48,6 +50,13 @@ class Screen:
 
 		self.frame += 1  # advance frame number, for animations
 
+	def draw(self, alpha: float):
+		# Called after update() (maybe after several updates, or several times for one update) to
+		# draw the screen. alpha is how far it is from the last update to the next one (0 to 1),
+		# for interpolating positions when the screen is drawn more often than it is updated.
+		# to be implemented in subclasses
+		pass
+
 	def clickButtons(self, pos: Tuple[int]):
 		pos = Graphics.unproject(pos)
 		for b in self.buttons:
@@ -56,11 +65,14 @@ class Screen:
 
 	def drawButtons(self):
 		pos = Graphics.unproject(pygame.mouse.get_pos())
+		layer = Screen.buttonLayer
+		layer.begin()
 		for b in self.buttons:
 			image = b.image
 			if b.hovered(pos[0], pos[1]):
 				image = b.hoverImage
-			Graphics.surface.blit(image, (b.rect.x, b.rect.y))
+			layer.add(image, (b.rect.x, b.rect.y))
+		layer.draw(Graphics.surface)
 
 	def buttonClicked(self, buttonName):
 		# to be implemented in subclasses
@@ -0,0 +1,172 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import random
+import unittest
+
+from GameConstants import *
+from game.BrickGrid import BrickGrid
+from game.gameClasses.Brick import Brick
+from game.gameClasses.PosRect import PosRect
+
+
+def latticeBrick(row: int, column: int, maxHP: int = 1) -> Brick:
+	return Brick(PosRect(GC_WALL_SIZE + column * GC_BRICK_WIDTH, GC_BRICK_TOP_HEIGHT + row * GC_BRICK_HEIGHT,
+						 GC_BRICK_WIDTH, GC_BRICK_HEIGHT), maxHP, '')
+
+
+def randomBricks(rng: random.Random, count: int):
+	# like GC_BRICK_GEN_MODE "random": anywhere, so most of them span two rows and two columns
+	return [Brick(PosRect(rng.randint(GC_WALL_SIZE, GC_WORLD_WIDTH - GC_WALL_SIZE - GC_BRICK_WIDTH),
+						  rng.randint(GC_BRICK_TOP_HEIGHT, GC_BRICK_BOTTOM_HEIGHT - GC_BRICK_HEIGHT),
+						  GC_BRICK_WIDTH, GC_BRICK_HEIGHT), 1, '') for i in range(count)]
+
+
+def overlaps(rect: PosRect, x: float, y: float, width: float, height: float) -> bool:
+	return rect.x < x + width and x < rect.x + rect.width and rect.y < y + height and y < rect.y + rect.height
+
+
+def describe(bricks):
+	# what a brick list looks like, without the bricks' identities
+	return [(brick.rect.x, brick.rect.y, brick.rect.width, brick.rect.height, brick.hp) for brick in bricks]
+
+
+class BrickGridTest(unittest.TestCase):
+
+	def checkQueries(self, grid: BrickGrid, bricks, rng: random.Random):
+		# every brick overlapping a box is found, once, in the order the bricks were added
+		for i in range(300):
+			x = rng.uniform(0, GC_WORLD_WIDTH)
+			y = rng.uniform(0, GC_BRICK_BOTTOM_HEIGHT + GC_BRICK_HEIGHT)
+			width, height = rng.uniform(1, 3 * GC_BRICK_WIDTH), rng.uniform(1, 3 * GC_BRICK_HEIGHT)
+			found = grid.queryBox(x, y, width, height)
+			self.assertEqual(len(found), len(set(found)))
+			self.assertEqual(found, [brick for brick in bricks if brick in found])
+			for brick in bricks:
+				if overlaps(brick.rect, x, y, width, height):
+					self.assertIn(brick, found)
+
+	def testOffLattice(self):
+		rng = random.Random(3)
+		bricks = randomBricks(rng, 40)
+		grid = BrickGrid(bricks)
+		self.assertEqual(list(grid.bricks), bricks)
+		self.checkQueries(grid, bricks, rng)
+		# a brick across four cells is in each of them
+		brick = Brick(PosRect(GC_WALL_SIZE + GC_BRICK_WIDTH / 2, GC_BRICK_TOP_HEIGHT + GC_BRICK_HEIGHT / 2,
+							  GC_BRICK_WIDTH, GC_BRICK_HEIGHT), 1, '')
+		grid = BrickGrid([brick])
+		self.assertEqual(sorted(grid.cells), [(0, 0), (0, 1), (1, 0), (1, 1)])
+		self.assertEqual(grid.numInRow, {0: 1, 1: 1})
+
+	def testMixed(self):
+		rng = random.Random(4)
+		bricks = [latticeBrick(row, column) for row in range(5) for column in range(0, GC_BRICK_COLUMNS, 2)]
+		bricks += randomBricks(rng, 20)
+		rng.shuffle(bricks)
+		self.checkQueries(BrickGrid(bricks), bricks, rng)
+
+	def testRemove(self):
+		rng = random.Random(5)
+		bricks = [latticeBrick(row, column) for row in range(4) for column in range(GC_BRICK_COLUMNS)]
+		bricks += randomBricks(rng, 20)
+		grid = BrickGrid(bricks)
+		rng.shuffle(bricks)
+		while bricks:
+			brick = bricks.pop()
+			grid.remove(brick)
+			grid.remove(brick)  # already gone: does nothing
+			self.assertFalse(grid.contains(brick))
+			if len(bricks) % 10 == 0:
+				self.checkQueries(grid, [brick for brick in grid.bricks], rng)
+		# no empty cells or rows are left behind
+		self.assertEqual(grid.cells, {})
+		self.assertEqual(grid.rows, {})
+		self.assertEqual(grid.numInRow, {})
+		self.assertEqual(grid.queryBox(0, 0, GC_WORLD_WIDTH, GC_WORLD_HEIGHT), [])
+
+	def testRemoveRow(self):
+		bricks = [latticeBrick(row, column) for row in range(3) for column in range(GC_BRICK_COLUMNS)]
+		grid = BrickGrid(bricks)
+		y = GC_BRICK_TOP_HEIGHT + GC_BRICK_HEIGHT
+		row = grid.getRow(y)
+		self.assertEqual(row, bricks[GC_BRICK_COLUMNS:2 * GC_BRICK_COLUMNS])
+		for brick in row:
+			grid.remove(brick)
+		self.assertEqual(grid.getRow(y), [])
+		self.assertNotIn(1, grid.numInRow)
+		self.assertFalse(any(key[0] == 1 for key in grid.cells))
+		self.assertEqual(list(grid.bricks), bricks[:GC_BRICK_COLUMNS] + bricks[2 * GC_BRICK_COLUMNS:])
+
+	def testMove(self):
+		# a scrolling level moves the grid down: rows are found at their new height
+		bricks = [latticeBrick(row, column) for row in range(3) for column in range(GC_BRICK_COLUMNS)]
+		grid = BrickGrid(bricks, PosRect(GC_WALL_SIZE, GC_BRICK_TOP_HEIGHT, GC_BRICK_WIDTH, GC_BRICK_HEIGHT))
+		grid.move(7)
+		grid.move(GC_BRICK_HEIGHT)
+		y = GC_BRICK_TOP_HEIGHT + GC_BRICK_HEIGHT * 2 + 7
+		self.assertEqual(describe(grid.getRow(y)), describe(bricks[GC_BRICK_COLUMNS:2 * GC_BRICK_COLUMNS]))
+		self.assertEqual(grid.getRow(GC_BRICK_TOP_HEIGHT + GC_BRICK_HEIGHT), [])
+		self.assertEqual(grid.getRow(y)[0].rect.y, y)
+		found = grid.queryBox(GC_WALL_SIZE + 1, y + 1, 1, 1)
+		self.assertEqual(describe(found), describe([bricks[GC_BRICK_COLUMNS]]))
+		self.assertEqual(grid.queryBox(GC_WALL_SIZE + 1, GC_BRICK_TOP_HEIGHT + 1, 1, 1), [])
+
+	def testCopy(self):
+		rng = random.Random(6)
+		bricks = [latticeBrick(row, column, row % 3 + 1) for row in range(4) for column in range(GC_BRICK_COLUMNS)]
+		bricks += randomBricks(rng, 10)
+		rng.shuffle(bricks)
+		grid = BrickGrid(bricks)
+		for brick in bricks[::7]:
+			grid.remove(brick)
+		grid.add(latticeBrick(6, 3))
+		copy = grid.copy()
+		self.assertEqual(describe(copy.bricks), describe(grid.bricks))
+		self.assertEqual(copy.numAdded, grid.numAdded)
+		# the copy finds the same bricks, in the same order
+		for i in range(200):
+			box = (rng.uniform(0, GC_WORLD_WIDTH), rng.uniform(0, GC_BRICK_BOTTOM_HEIGHT), rng.uniform(1, 200),
+				   rng.uniform(1, 200))
+			self.assertEqual(describe(copy.queryBox(*box)), describe(grid.queryBox(*box)))
+		y = GC_BRICK_TOP_HEIGHT + GC_BRICK_HEIGHT * 2
+		self.assertEqual(describe(copy.getRow(y)), describe(grid.getRow(y)))
+		# and changing one doesn't change the other
+		before = describe(grid.bricks)
+		copy.move(GC_BRICK_HEIGHT)
+		for brick in copy.getRow(y + GC_BRICK_HEIGHT):
+			copy.remove(brick)
+		self.assertEqual(describe(grid.bricks), before)
+		self.assertEqual(len(grid.getRow(y)), GC_BRICK_COLUMNS - sum(1 for brick in bricks[::7] if brick.rect.y == y))
+
+	def testOwn(self):
+		# a copy shares the bricks, and a brick is copied in place the first time either grid owns it
+		rng = random.Random(7)
+		bricks = [latticeBrick(row, column, 3) for row in range(4) for column in range(GC_BRICK_COLUMNS)]
+		bricks += randomBricks(rng, 10)
+		rng.shuffle(bricks)
+		grid = BrickGrid(bricks)
+		self.assertIs(grid.own(bricks[0]), bricks[0])
+		copy = grid.copy()
+		self.assertEqual(list(copy.bricks), bricks)
+		before = describe(grid.bricks)
+		owned = []
+		for brick in bricks[::3]:
+			mine = copy.own(brick)
+			self.assertIsNot(mine, brick)
+			self.assertIs(copy.own(mine), mine)
+			mine.hp -= 1
+			owned.append(mine)
+		self.assertEqual(describe(grid.bricks), before)
+		self.assertEqual(list(grid.bricks), bricks)
+		# the copies took the places of the bricks they replaced
+		expected = [owned[i // 3] if i % 3 == 0 else brick for i, brick in enumerate(bricks)]
+		self.assertEqual(list(copy.bricks), expected)
+		self.checkQueries(copy, expected, rng)
+		for brick in owned:
+			self.assertIn(brick, copy.getRow(brick.rect.y))
+		self.checkQueries(grid, bricks, rng)
+		# the grid it was copied from owns its bricks again the same way
+		self.assertIsNot(grid.own(bricks[0]), bricks[0])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,130 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import unittest
+from unittest import mock
+
+from GameConstants import *
+from game.GameSimulation import GameSimulation
+from game.LevelTools import newState
+from game.gameClasses.Brick import Brick
+from game.gameClasses.GameEvent import GameEvent
+from game.gameClasses.PaddleAction import PaddleAction
+from game.gameClasses.PosRect import PosRect
+
+
+class PaddleTest(unittest.TestCase):
+
+	def moveOntoBall(self, depth: float):
+		# the paddle jumps (to the mouse) under a falling ball that is then depth px below its top
+		state = newState(1, 1)
+		state.paused = False
+		ball = state.balls[0]
+		ball.circle.x, ball.circle.y = 300, GC_PADDLE_TOP_HEIGHT - GC_BALL_RADIUS + depth
+		ball.velocity.dx, ball.velocity.dy = 2, 10
+		state.paddle.rect.x = 900
+		GameSimulation(state).step(PaddleAction(0, 300 - GC_PADDLE_WIDTH / 2))
+		self.assertIn(GameEvent.PADDLE_HIT, [event.type for event in state.events])
+		self.assertLess(ball.velocity.dy, 0)
+
+	def testMoveOntoBall(self):
+		for depth in (0, 4, 8, 15, 20):
+			with self.subTest(depth=depth):
+				self.moveOntoBall(depth)
+
+	def testMoveOntoBallSwept(self):
+		with mock.patch("game.GameSimulation.GC_SWEPT_COLLISION", True):
+			self.testMoveOntoBall()
+
+
+class CornerTest(unittest.TestCase):
+
+	def crossCorner(self) -> Brick:
+		# a fast ball (30 px a frame each way) cuts across a brick's bottom right corner, passing
+		# 8 px from it, halfway between two frames: the ball overlaps the brick between them, but
+		# is more than a radius from it at both
+		state = newState(1, 1)
+		state.paused = False
+		grid = state.brickGrid
+		for brick in list(grid.bricks):
+			grid.remove(brick)
+		brick = Brick(PosRect(GC_WALL_SIZE + 5 * GC_BRICK_WIDTH, GC_BRICK_TOP_HEIGHT + 5 * GC_BRICK_HEIGHT,
+							  GC_BRICK_WIDTH, GC_BRICK_HEIGHT), 3, '')
+		grid.add(brick)
+		cornerX, cornerY = brick.rect.x + brick.rect.width, brick.rect.y + brick.rect.height
+		offset = 8 / math.sqrt(2)  # along the corner's diagonal, away from the brick
+		ball = state.balls[0]
+		ball.circle.x, ball.circle.y = cornerX + offset - 15, cornerY + offset + 15
+		ball.velocity.dx, ball.velocity.dy = 30, -30
+		GameSimulation(state).step(PaddleAction(0, None))
+		return brick
+
+	def testSwept(self):
+		with mock.patch("game.GameSimulation.GC_SWEPT_COLLISION", True):
+			self.assertEqual(self.crossCorner().hp, 2)
+
+	def testFrameBased(self):
+		# the default: the ball is only checked where it is at the end of each frame, so it goes
+		# through the corner (see GC_SWEPT_COLLISION)
+		self.assertEqual(self.crossCorner().hp, 3)
+
+
+class FastForwardTest(unittest.TestCase):
+	# fastForward() against step(), on a ball bouncing straight up and down between the paddle
+	# and a column of bricks, which both kinds of collision bounce the same way
+
+	def makeState(self):
+		state = newState(1, 7)
+		state.paused = False
+		grid = state.brickGrid
+		for brick in list(grid.bricks):
+			grid.remove(brick)
+		for row in range(GC_BRICK_LAYERS):
+			grid.add(Brick(PosRect(GC_WALL_SIZE + 5 * GC_BRICK_WIDTH, GC_BRICK_TOP_HEIGHT + row * GC_BRICK_HEIGHT,
+								   GC_BRICK_WIDTH, GC_BRICK_HEIGHT), row % 3 + 1, ''))
+		ball = state.balls[0]
+		ball.circle.x, ball.circle.y = GC_WALL_SIZE + 5.5 * GC_BRICK_WIDTH, GC_PADDLE_TOP_HEIGHT - 150
+		ball.velocity.dx, ball.velocity.dy = 0, -GC_BALL_INITIAL_VELOCITY
+		# the paddle's middle (as bounceOffPaddle() works it out) right under the ball
+		return state, PaddleAction(0, ball.circle.x - GC_PADDLE_WIDTH // 2)
+
+	def play(self, fastForward: bool, frames: int = 2000):
+		# (frames, score, HP of every brick) whenever a brick was hit, until the ball leaves through the top
+		state, action = self.makeState()
+		simulation = GameSimulation(state)
+		hits = []
+		elapsed = 0
+		while not state.won:
+			self.assertLess(elapsed, frames)
+			hp = [brick.hp for brick in state.bricks]
+			if fastForward:
+				elapsed += simulation.fastForward(action, frames - elapsed)
+			else:
+				simulation.step(action)
+				elapsed += 1
+			if [brick.hp for brick in state.bricks] != hp:
+				hits.append((state.time / GC_FRAME_TIME_SECONDS, state.score, [brick.hp for brick in state.bricks]))
+		self.assertEqual(state.numLives, 3)
+		return hits
+
+	def compare(self, stepped, fastForwarded, framesPerImpact: float, impactsPerHit: int):
+		# each impact can be found up to framesPerImpact later by step(); there is a bounce off the
+		# paddle between brick hits, and the score is worked out from the time
+		self.assertGreater(len(stepped), 10)
+		self.assertEqual([hp for frames, score, hp in stepped], [hp for frames, score, hp in fastForwarded])
+		for i, ((steppedFrames, steppedScore, hp), (frames, score, hp)) in enumerate(zip(stepped, fastForwarded)):
+			bound = framesPerImpact * (1 + i * impactsPerHit)
+			self.assertLessEqual(abs(steppedFrames - frames), bound)
+			self.assertLessEqual(abs(steppedScore - score), score * bound / (frames - bound) + 1)
+
+	def testFrameBased(self):
+		# the default: step() finds each impact at the end of the frame it happens in, and bounces the
+		# ball back from where it is then, so it can be up to two frames behind after each impact
+		self.compare(self.play(False), self.play(True), 2, 2)
+
+	def testSwept(self):
+		# only the time of the last hit is counted to the end of its frame
+		with mock.patch("game.GameSimulation.GC_SWEPT_COLLISION", True):
+			self.compare(self.play(False), self.play(True), 1, 0)
+
+
+if __name__ == "__main__":
+	unittest.main()
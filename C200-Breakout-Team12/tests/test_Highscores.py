@@ -0,0 +1,65 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import io
+import os
+import queue
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from game.Highscores import TABLE_SIZE, HighscoreTable, Highscores
+
+
+def makeTable(scores) -> HighscoreTable:
+	return HighscoreTable([(score, "player{0}".format(i)) for i, score in enumerate(scores)])
+
+
+class HighscoreTableTest(unittest.TestCase):
+
+	def testNotFull(self):
+		table = makeTable([50, 40])
+		self.assertTrue(table.isHighScore(0))
+		table.add(0, "last")
+		self.assertEqual(table.scores, [50, 40, 0])
+
+	def testTieWithLowestOfFullTable(self):
+		# a tie goes after the scores equal to it, so a tie with the last one is off the table
+		table = makeTable(range(TABLE_SIZE * 10, 0, -10))
+		self.assertFalse(table.isHighScore(10))
+		table.add(10, "tie")
+		self.assertNotIn("tie", table.names)
+
+	def testTieAboveLowest(self):
+		table = makeTable(range(TABLE_SIZE * 10, 0, -10))
+		self.assertTrue(table.isHighScore(20))
+		table.add(20, "tie")
+		self.assertEqual(table.names.index("tie"), TABLE_SIZE - 1)
+		self.assertEqual(len(table.scores), TABLE_SIZE)
+
+	def testHigherThanLowest(self):
+		table = makeTable(range(TABLE_SIZE * 10, 0, -10))
+		self.assertTrue(table.isHighScore(11))
+		table.add(11, "new")
+		self.assertEqual(table.scores[-1], 11)
+
+
+class WriterTest(unittest.TestCase):
+
+	def testFailedWriteDoesNotBlockFlush(self):
+		# a database with no runs table: every write fails
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		with mock.patch.object(Highscores, "path", os.path.join(directory.name, "broken.db")), \
+				mock.patch.object(Highscores, "pending", queue.Queue()), \
+				mock.patch("sys.stderr", io.StringIO()) as errors:
+			threading.Thread(target=Highscores.write, daemon=True).start()
+			Highscores.pending.put((0, "name", 10, 1, "test"))
+			flusher = threading.Thread(target=Highscores.flush, daemon=True)
+			flusher.start()
+			flusher.join(timeout=30)
+			self.assertFalse(flusher.is_alive())
+			self.assertIn("couldn't save 1 runs", errors.getvalue())
+
+
+if __name__ == "__main__":
+	unittest.main()
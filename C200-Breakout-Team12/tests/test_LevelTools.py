@@ -0,0 +1,101 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import random
+import unittest
+from unittest import mock
+
+from GameConstants import *
+from game import LevelTools
+
+LEVEL: int = 1000  # not a real level: its file is given to compileLevel() by each test
+
+
+class LevelFileTest(unittest.TestCase):
+
+	def setUp(self):
+		# levels compiled by a test are forgotten after it
+		patcher = mock.patch.dict(LevelTools.levels)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def compile(self, text: str) -> LevelTools.CompiledLevel:
+		with mock.patch("game.LevelTools.open", mock.mock_open(read_data=text), create=True):
+			return LevelTools.getLevel(LEVEL)
+
+	def testMalformed(self):
+		for text in ("", "\n1111\n", "1111\n111\n1111\n", "1111\n11111\n", "1111\n1x11\n", "1111\n11 1\n"):
+			with self.subTest(text=text):
+				with self.assertRaises(ValueError):
+					self.compile(text)
+				self.assertNotIn(LEVEL, LevelTools.levels)
+
+	def testCompile(self):
+		compiled = self.compile("1020\n0A4C\n\nanything after a blank line is a comment\n")
+		self.assertEqual((compiled.rows, compiled.columns), (2, 4))
+		self.assertEqual(list(compiled.cells), [0, 2, 5, 6, 7])
+		self.assertEqual(list(compiled.hp), [1, 2, 2, 4, 2])
+		self.assertEqual([LevelTools.POWERUPS[code] for code in compiled.powerUps],
+						 ['', '', 'extraBall', '', 'clearRow'])
+
+	def testLargeSparse(self):
+		# a 100 x 400 grid with a brick in one cell in 97: only those are stored, and made into bricks
+		rows, columns = 100, 400
+		rng = random.Random(2)
+		lines = []
+		numBricks = 0
+		for i in range(rows):
+			line = ["0"] * columns
+			for j in range(i % 97, columns, 97):
+				line[j] = rng.choice("123")
+				numBricks += 1
+			lines.append("".join(line))
+		compiled = self.compile("\n".join(lines) + "\n")
+		self.assertEqual((compiled.rows, compiled.columns), (rows, columns))
+		self.assertEqual(len(compiled.cells), numBricks)
+		self.assertEqual(list(compiled.cells), sorted(compiled.cells))
+		# shrunk to fit the columns, which makes it short enough not to scroll
+		self.assertFalse(LevelTools.isScrolling(LEVEL))
+		bricks = LevelTools.makeBricks(LEVEL, random.Random(1))
+		self.assertEqual(len(bricks), numBricks)
+		self.checkFits(bricks, LevelTools.getFirstCell(LEVEL))
+
+	def checkFits(self, bricks, cell):
+		# the bricks are the cell's size, and inside the usual area
+		for brick in bricks:
+			self.assertEqual((brick.rect.width, brick.rect.height), (cell.width, cell.height))
+			self.assertGreaterEqual(brick.rect.x, GC_WALL_SIZE)
+			self.assertLessEqual(brick.rect.x + brick.rect.width, GC_WALL_SIZE + GC_BRICK_COLUMNS * GC_BRICK_WIDTH)
+			self.assertGreaterEqual(brick.rect.y, GC_BRICK_TOP_HEIGHT)
+			self.assertLessEqual(brick.rect.y + brick.rect.height, GC_BRICK_BOTTOM_HEIGHT)
+
+	def testShrunkToFit(self):
+		# twice as many rows and columns as usual, and filled: half size bricks, if it doesn't scroll
+		rows, columns = GC_BRICK_LAYERS * 2, GC_BRICK_COLUMNS * 2
+		self.compile(("1" * columns + "\n") * rows)
+		with mock.patch("game.LevelTools.GC_SCROLLING_LEVELS", False):
+			self.assertFalse(LevelTools.isScrolling(LEVEL))
+			cell = LevelTools.getFirstCell(LEVEL)
+			self.assertEqual((cell.width, cell.height), (GC_BRICK_WIDTH // 2, GC_BRICK_HEIGHT // 2))
+			bricks = LevelTools.makeBricks(LEVEL, random.Random(1))
+			self.assertEqual(len(bricks), rows * columns)
+			self.checkFits(bricks, cell)
+
+	def testShrunkToFitColumns(self):
+		# wide, and with few rows: shrunk to fit the columns, and centered in the rows left over
+		rows, columns = 3, GC_BRICK_COLUMNS * 3
+		self.compile(("2" * columns + "\n") * rows)
+		self.assertFalse(LevelTools.isScrolling(LEVEL))
+		cell = LevelTools.getFirstCell(LEVEL)
+		self.assertEqual((cell.width, cell.height), (GC_BRICK_WIDTH // 3, GC_BRICK_HEIGHT // 3))
+		bricks = LevelTools.makeBricks(LEVEL, random.Random(1))
+		self.assertEqual(len(bricks), rows * columns)
+		self.checkFits(bricks, cell)
+
+	def testUsualSize(self):
+		self.compile(("3" * GC_BRICK_COLUMNS + "\n") * GC_BRICK_LAYERS)
+		cell = LevelTools.getFirstCell(LEVEL)
+		self.assertEqual((cell.x, cell.y, cell.width, cell.height),
+						 (GC_WALL_SIZE, GC_BRICK_TOP_HEIGHT, GC_BRICK_WIDTH, GC_BRICK_HEIGHT))
+
+
+if __name__ == "__main__":
+	unittest.main()
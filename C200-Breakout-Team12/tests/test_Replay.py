@@ -0,0 +1,84 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from GameConstants import *
+from game.GameSimulation import GameSimulation
+from game.LevelTools import newState
+from game.Replay import Replay, ReplayPlayer
+from game.Snapshot import takeSnapshot
+from game.gameClasses.PaddleAction import PaddleAction
+
+KEYFRAME_INTERVAL: int = 200
+FRAMES: int = 1500
+
+
+def record(level: int, seed: int):
+	# a seeded bot's game, recorded with keyframes; returns the replay and a snapshot after every frame
+	state = newState(level, seed, 0, 3)
+	simulation = GameSimulation(state)
+	replay = Replay.forState(state)
+	rng = random.Random(seed)
+	snapshots = [takeSnapshot(state)]
+	with mock.patch("game.Replay.GC_REPLAY_KEYFRAME_INTERVAL", KEYFRAME_INTERVAL):
+		for frame in range(FRAMES):
+			if rng.random() < 0.3:
+				action = PaddleAction(rng.randint(-1, 1), None, True)
+			else:
+				action = PaddleAction(0, state.balls[0].circle.x - GC_PADDLE_WIDTH / 2 + rng.randint(-60, 60), True)
+			replay.record(action, state)
+			simulation.step(action)
+			snapshots.append(takeSnapshot(state))
+	replay.finish(state)
+	return replay, snapshots
+
+
+class ReplayTest(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		cls.replay, cls.snapshots = record(1, 1234)
+
+	def load(self) -> Replay:
+		directory = tempfile.TemporaryDirectory()
+		self.addCleanup(directory.cleanup)
+		path = os.path.join(directory.name, "test.replay")
+		self.replay.save(path)
+		return Replay.load(path)
+
+	def testSaveAndLoad(self):
+		loaded = self.load()
+		self.assertEqual(loaded.commands, self.replay.commands)
+		self.assertEqual(loaded.numFrames, FRAMES)
+		self.assertEqual(loaded.keyframes, self.replay.keyframes)
+		self.assertEqual(sorted(loaded.keyframes), list(range(KEYFRAME_INTERVAL, FRAMES, KEYFRAME_INTERVAL)))
+
+	def testVerify(self):
+		self.assertTrue(ReplayPlayer(self.load(), KEYFRAME_INTERVAL).verify())
+		self.assertEqual(takeSnapshot(ReplayPlayer(self.load(), KEYFRAME_INTERVAL).play()), self.snapshots[-1])
+
+	def testKeyframesMatchRecording(self):
+		for frame, snapshot in self.replay.keyframes.items():
+			self.assertEqual(snapshot, self.snapshots[frame], frame)
+
+	def testSeek(self):
+		# from the file's keyframes, backwards and forwards, and from ones made while playing
+		player = ReplayPlayer(self.load(), KEYFRAME_INTERVAL)
+		for frame in (1300, 150, 401, 400, 1499, 1, 0, 999, FRAMES):
+			with self.subTest(frame=frame):
+				self.assertEqual(takeSnapshot(player.seek(frame)), self.snapshots[frame])
+		# a version 1 replay, with no keyframes in it
+		replay = self.load()
+		replay.keyframes.clear()
+		player = ReplayPlayer(replay, KEYFRAME_INTERVAL)
+		player.play()
+		for frame in (650, 210, 1001):
+			with self.subTest(frame=frame, keyframes="made while playing"):
+				self.assertEqual(takeSnapshot(player.seek(frame)), self.snapshots[frame])
+
+
+if __name__ == "__main__":
+	unittest.main()
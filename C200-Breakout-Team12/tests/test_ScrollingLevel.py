@@ -0,0 +1,76 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import math
+import random
+import unittest
+from array import array
+from unittest import mock
+
+from GameConstants import *
+from game import LevelTools
+from game.GameSimulation import GameSimulation
+from game.gameClasses.PaddleAction import PaddleAction
+
+LEVEL: int = GC_NUM_LEVELS  # made up here instead of read from its file, like Benchmarks does
+ROWS: int = 300
+BRICK_SPACING: int = 4  # a brick in every fourth cell
+
+
+def makeTallLevel() -> LevelTools.CompiledLevel:
+	generator = random.Random(1)
+	cells = array('L', range(0, ROWS * GC_BRICK_COLUMNS, BRICK_SPACING))
+	return LevelTools.CompiledLevel(ROWS, GC_BRICK_COLUMNS, cells, bytes(generator.randint(1, 3) for cell in cells),
+									bytes(len(cells)))
+
+
+class ScrollingLevelTest(unittest.TestCase):
+
+	def setUp(self):
+		patcher = mock.patch.dict(LevelTools.levels, {LEVEL: makeTallLevel()})
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def testStart(self):
+		state = LevelTools.newState(LEVEL, 1, 0, 3)
+		scrolling = state.scrollingLevel
+		self.assertIsNotNone(scrolling)
+		self.assertFalse(scrolling.isOpen())
+		# only the rows in the world are bricks, with the last row at the bottom of the area
+		self.assertEqual(scrolling.endRow, ROWS)
+		self.assertEqual(scrolling.getRowTop(ROWS), GC_BRICK_BOTTOM_HEIGHT)
+		self.assertGreaterEqual(scrolling.getRowTop(scrolling.firstRow + 1), 0)
+		self.assertEqual(len(state.bricks), (ROWS - scrolling.firstRow) * GC_BRICK_COLUMNS // BRICK_SPACING)
+
+	def testPlayThrough(self):
+		# like Benchmarks.benchmarkScrolling: the lowest row left is cleared whenever the level
+		# has stopped scrolling, until all of it has scrolled into the world
+		state = LevelTools.newState(LEVEL, 1, 0, 1000000)
+		simulation = GameSimulation(state)
+		scrolling = state.scrollingLevel
+		grid = state.brickGrid
+		# the rows that fit in the world, and a part of one at each end
+		rowsInWorld = math.ceil(GC_BRICK_BOTTOM_HEIGHT / grid.firstCell.height) + 1
+		mostBricks = rowsInWorld * GC_BRICK_COLUMNS // BRICK_SPACING
+		i = 0
+		while not scrolling.isOpen():
+			self.assertFalse(state.won)
+			offset = (i // 10 % 7 - 3) * GC_PADDLE_WIDTH / 8
+			simulation.step(PaddleAction(0, state.balls[0].circle.x - GC_PADDLE_WIDTH / 2 + offset, True), 4)
+			if scrolling.getTargetY() == grid.firstCell.y:
+				for row in range(scrolling.endRow - 1, scrolling.firstRow - 1, -1):
+					bricks = grid.getRow(scrolling.getRowTop(row))
+					if bricks:
+						simulation.scoreBricks(bricks)
+						break
+			self.assertLessEqual(len(state.bricks), mostBricks)
+			self.assertLessEqual(len(grid.cells), mostBricks)
+			self.assertTrue(all(brick.rect.y + brick.rect.height > 0 for brick in state.bricks))
+			i += 1
+			self.assertLess(i, 100000)
+		self.assertTrue(scrolling.isOpen())
+		self.assertEqual(scrolling.firstRow, 0)
+		self.assertEqual(grid.firstCell.y, GC_BRICK_TOP_HEIGHT)
+		self.assertLessEqual(scrolling.endRow, GC_BRICK_LAYERS)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,63 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import random
+import unittest
+
+from GameConstants import *
+from game.GameSimulation import GameSimulation
+from game.LevelTools import newState
+from game.Snapshot import restoreSnapshot, takeSnapshot
+from game.gameClasses.PaddleAction import PaddleAction
+
+FRAMES: int = 600
+
+
+def play(state, seed: int, frames: int, dt: float = 1) -> None:
+	# a seeded bot that follows the ball, hitting it with different parts of the paddle
+	simulation = GameSimulation(state)
+	rng = random.Random(seed)
+	for frame in range(frames):
+		if state.won or not state.balls:
+			return
+		offset = rng.randint(-60, 60)
+		simulation.step(PaddleAction(0, state.balls[0].circle.x - GC_PADDLE_WIDTH / 2 + offset, True), dt)
+
+
+class SnapshotTest(unittest.TestCase):
+
+	def testRestoreThenStep(self):
+		# a restored state carries on exactly like the state it was taken from
+		for level, dt in ((1, 1), (3, 1), (5, 1.5)):
+			with self.subTest(level=level, dt=dt):
+				state = newState(level, 7, 0, 3)
+				play(state, 1, FRAMES, dt)
+				restored = restoreSnapshot(takeSnapshot(state))
+				self.assertEqual(takeSnapshot(restored), takeSnapshot(state))
+				play(state, 2, FRAMES, dt)
+				play(restored, 2, FRAMES, dt)
+				self.assertEqual(takeSnapshot(restored), takeSnapshot(state))
+
+	def testCloneThenStep(self):
+		# a clone shares the bricks until they are hit, which mustn't change the other state
+		for level, dt in ((1, 1), (3, 1), (5, 1.5)):
+			with self.subTest(level=level, dt=dt):
+				state = newState(level, 7, 0, 3)
+				play(state, 1, FRAMES, dt)
+				before = takeSnapshot(state)
+				clone = state.clone()
+				play(clone, 2, FRAMES, dt)
+				self.assertEqual(takeSnapshot(state), before)
+				self.assertNotEqual(takeSnapshot(clone), before)
+				play(state, 2, FRAMES, dt)
+				self.assertEqual(takeSnapshot(state), takeSnapshot(clone))
+				# and the other way round, with a clone of a state that shares its bricks already
+				clone = state.clone()
+				again = clone.clone()
+				play(state, 3, FRAMES, dt)
+				play(again, 3, FRAMES, dt)
+				self.assertEqual(takeSnapshot(state), takeSnapshot(again))
+				self.assertEqual(len(clone.bricks), len(set(clone.bricks)))
+				self.assertNotEqual(takeSnapshot(clone), takeSnapshot(state))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,46 @@
+# run from C200-Breakout-Team12 with: python -m pytest tests (or python -m unittest discover tests)
+import unittest
+
+from game.Sweep import timeToHitRect
+from game.gameClasses.Ball import Ball
+from game.gameClasses.PosCircle import PosCircle
+from game.gameClasses.PosRect import PosRect
+from game.gameClasses.Velocity import Velocity
+
+BRICK: PosRect = PosRect(100, 100, 60, 20)
+
+
+def makeBall(x: float, y: float, dx: float, dy: float) -> Ball:
+	return Ball(PosCircle(x, y, 10), Velocity(dx, dy))
+
+
+class TimeToHitRectTest(unittest.TestCase):
+
+	def testHitsSide(self):
+		# centre reaches the left side moved out by the radius, 80 px away at 10 px a frame
+		self.assertAlmostEqual(timeToHitRect(makeBall(10, 110, 10, 0), BRICK, 20), 8)
+
+	def testMisses(self):
+		self.assertIsNone(timeToHitRect(makeBall(10, 110, 0, 10), BRICK, 20))
+
+	def testOverlappingMovingIn(self):
+		# 5 px into the top of the brick and still going down: hit straight away
+		self.assertEqual(timeToHitRect(makeBall(130, 95, 3, 4), BRICK, 1), 0)
+
+	def testOverlappingCornerMovingIn(self):
+		self.assertEqual(timeToHitRect(makeBall(95, 95, 1, 1), BRICK, 1), 0)
+
+	def testOverlappingMovingOut(self):
+		# it just bounced off the top, and is ignored until it has left
+		self.assertIsNone(timeToHitRect(makeBall(130, 95, 3, -4), BRICK, 1))
+
+	def testCentreInsideMovingIn(self):
+		# the paddle moved onto the ball: it goes in through the top, which is the nearest side
+		self.assertEqual(timeToHitRect(makeBall(130, 105, 3, 4), BRICK, 1), 0)
+
+	def testCentreInsideMovingOut(self):
+		self.assertIsNone(timeToHitRect(makeBall(130, 105, 3, -4), BRICK, 1))
+
+
+if __name__ == "__main__":
+	unittest.main()